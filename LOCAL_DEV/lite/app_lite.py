@@ -14,17 +14,20 @@ import urllib.parse
 import pandas as pd
 pd.set_option('future.no_silent_downcasting', True)
 import io
-import tempfile
 import os
 import re
 from pathlib import Path
 import subprocess
+import tempfile
+import weakref
 import datetime
+import time
 import html
 import json
 import math
 import unicodedata
 from contextlib import nullcontext
+from functools import lru_cache
 
 # Μεγέθη κειμένου σε HTML modals (components.html → parent document)
 _ATLAS_MODAL_BODY_FS = "17px"
@@ -48,18 +51,41 @@ for _p_rm in (str(_APP_DIR), str(REPO_ROOT)):
 for _p_ins in (str(REPO_ROOT), str(_APP_DIR)):
     sys.path.insert(0, _p_ins)
 
-# Προσπάθεια εισαγωγής διαφορετικών PDF readers
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
-
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
+# PDF readers (pdfplumber / PyMuPDF) και εξαγωγή ανά σελίδα — κοινά modules χωρίς Streamlit
+from extract_cache import get_extract_cache, pdf_cache_key
+from report_cache import get_report_cache, report_cache_key
+from pdf_extraction import (
+    extract_frames,
+    find_column_by_pattern,
+    normalize_column_name,
+    normalize_column_names,
+    parse_text_for_tables,
+    resolve_pdf_backend,
+)
+# Typed στήλες ingest (ημερομηνίες/αριθμοί μία φορά) και καθαρισμός αριθμητικών τιμών
+from typed_schema import (
+    add_typed_columns,
+    clean_numeric_series,
+    clean_numeric_value,
+    content_fingerprint,
+    drop_typed_columns,
+    get_negative_amount_sign,
+    interval_dates,
+    is_typed_column,
+    typed_dates,
+    typed_numeric,
+)
+# Ανάπτυξη διαστημάτων Από–Έως σε μηνιαίες γραμμές (NumPy, χωρίς βρόχο ανά μήνα)
+from month_engine import (
+    MonthLedger,
+    build_month_ledger,
+    distribute_days_parts,
+    explode_months,
+    explode_year_months,
+    explode_years,
+    month_category_sums,
+    window_month_bounds,
+)
 
 def get_last_update_date():
     """Παίρνει την ημερομηνία του τελευταίου git commit."""
@@ -107,15 +133,38 @@ def _atlas_render_full_html_report_open_tab(df: pd.DataFrame) -> None:
         generate_full_html_report = _hvb_mod.generate_full_html_report
 
     client_name = st.session_state.get("client_name", "")
-    _app_title = "ATLAS Lite"
+    _app_title = "ATLAS Pro" if edition == "pro" else "ATLAS"
+    # Συντελεστές ημερών του χρήστη: ρητά στην αναφορά και στο κλειδί της κοινής cache
+    basis_label = _atlas_ins_days_basis()
     _report_kwargs = {
         "client_name": client_name,
         "app_title": _app_title,
-        "app_subtitle": "",
-        "full_save_suffix": "ATLAS_Lite.html",
+        "app_subtitle": "Ασφαλιστικό Βιογραφικό",
     }
-    _report_kwargs["edition"] = "lite"
-    viewer_html, _ = generate_full_html_report(df, **_report_kwargs)
+    # Κοινή cache διεργασίας: ίδιο αρχείο/έκδοση/πελάτης (και από άλλον χρήστη) → χωρίς νέα παραγωγή
+    report_cache = get_report_cache()
+    cache_key = None
+    cached = None
+    if report_cache is not None:
+        cache_key = report_cache_key(
+            _atlas_data_fingerprint(df), edition, client_name, _app_title, _report_kwargs["app_subtitle"],
+            basis_label, getattr(_hvb_mod, "REPORT_BUILDER_VERSION", ""), datetime.date.today().isoformat(),
+        )
+        cached = report_cache.get(cache_key)
+    if cached is not None:
+        viewer_html = cached[0]
+    else:
+        _report_params = inspect.signature(generate_full_html_report).parameters
+        if "edition" in _report_params:
+            _report_kwargs["edition"] = edition
+        if "case" in _report_params:
+            # Ίδια ανάλυση με τη σελίδα αποτελεσμάτων (audit, κενά, παράλληλη, καταμέτρηση)
+            _report_kwargs["case"] = get_atlas_case(df)
+        if "basis_label" in _report_params:
+            _report_kwargs["basis_label"] = basis_label
+        viewer_html, print_html = generate_full_html_report(df, **_report_kwargs)
+        if report_cache is not None:
+            report_cache.put(cache_key, (viewer_html, print_html))
     js_content = json.dumps(viewer_html).replace("</script>", "<\\/script>")
     components.html(
         f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>
@@ -1507,39 +1556,43 @@ def render_yearly_table_html(df: pd.DataFrame) -> None:
     table_html = f"<table class=\"table-yearly\"><thead><tr>{headers}</tr></thead><tbody>{''.join(rows_html)}</tbody></table>"
     st.markdown(table_html, unsafe_allow_html=True)
 
-def extract_header_info(page):
-    """
-    Εξάγει Ταμείο και Τύπος Ασφάλισης από τον πρώτο πίνακα (2x2 grid)
-    """
-    try:
-        tables = page.extract_tables()
-        
-        for table in tables:
-            if not table or len(table) < 2:
-                continue
-                
-            # Ελέγχουμε αν είναι ο πρώτος πίνακας (2x2 grid)
-            if (len(table) == 2 and 
-                len(table[0]) >= 2 and 
-                len(table[1]) >= 2 and
-                "Φορέας Κοινωνικής Ασφάλισης" in str(table[0][0])):
-                
-                # Εξάγουμε Ταμείο και Τύπος από τη δεύτερη γραμμή
-                taimeio = str(table[1][0]).strip() if table[1][0] else ""
-                typos = str(table[1][1]).strip() if table[1][1] else ""
-                
-                return taimeio, typos
-                
-    except Exception as e:
-        st.warning(f"Σφάλμα εξαγωγής header info: {str(e)}")
-    
-    return None, None
+def _atlas_extraction_status_md(progress) -> str:
+    """Κείμενο μετρητών για την ενιαία ένδειξη προόδου της εξαγωγής."""
+    lines = [
+        f"**Σελίδες:** {progress.pages_done} / {progress.data_pages} · "
+        f"**Γραμμές:** {progress.rows} · **Πίνακες:** {progress.tables}"
+        + (f" · **Διεργασίες:** {progress.workers}" if progress.workers > 1 else "")
+    ]
+    if progress.strategies:
+        hist = " · ".join(f"{k}: {v}" for k, v in sorted(progress.strategies.items()))
+        lines.append(f"**Στρατηγικές:** {hist}")
+    if progress.headers:
+        lines.append(
+            "**Ταμεία:** "
+            + " · ".join(f"σελ. {p}: {t} / {ty}" for p, t, ty in progress.headers)
+        )
+    if progress.failed_pages:
+        lines.append(
+            "**Σελίδες χωρίς πίνακα:** " + ", ".join(str(p) for p in progress.failed_pages)
+        )
+    if progress.header_errors:
+        lines.append(
+            "**Σφάλματα header:** "
+            + " · ".join(f"σελ. {p}: {html.escape(err)}" for p, err in progress.header_errors)
+        )
+    return "  \n".join(lines)
+
 
-def extract_tables_adaptive(pdf_path):
+def extract_tables_adaptive(pdf_source, workers: int | None = None, backend: str | None = None):
     """
-    Προσαρμοστική εξαγωγή πινάκων με πολλές στρατηγικές
+    Προσαρμοστική εξαγωγή πινάκων (UI adapter πάνω στο pdf_extraction.extract_frames).
+    pdf_source: διαδρομή ή PDF στη μνήμη (bytes / bytearray / memoryview / BytesIO).
+    backend: "auto" | "pdfplumber" | "pymupdf" (προεπιλογή: env ATLAS_PDF_BACKEND, αλλιώς "auto").
+    workers: διεργασίες για μεγάλα αρχεία (προεπιλογή: env ATLAS_EXTRACT_WORKERS).
+    Μία ενιαία ένδειξη προόδου με μετρητές αντί για μήνυμα ανά σελίδα· οι πίνακες
+    κανονικοποιούνται (normalize_column_names) καθώς έρχονται.
     """
-    if not PDFPLUMBER_AVAILABLE:
+    if resolve_pdf_backend(backend) is None:
         st.error(
             "Λείπει το πακέτο **pdfplumber**. Τοπικά: `pip install pdfplumber`. "
             "Στο Streamlit Cloud: στη ρίζα του repo πρέπει να υπάρχει `requirements.txt` με `pdfplumber`· "
@@ -1547,217 +1600,37 @@ def extract_tables_adaptive(pdf_path):
         )
         return []
 
-    all_tables = []
-    current_taimeio = ""
-    current_typos = ""
-    
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
-        st.info(f"Σύνολο σελίδων: {total_pages}")
-        
-        # Δημιουργία progress bar
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for page_num, page in enumerate(pdf.pages):
-            if page_num < 1:  # Παρακάμπτουμε την πρώτη σελίδα
-                continue
-                
-            # Ενημέρωση progress
-            progress = (page_num - 1) / (total_pages - 2) if total_pages > 2 else 0
-            progress_bar.progress(progress)
-            status_text.text(f"Επεξεργασία σελίδας {page_num + 1} από {total_pages - 1}...")
-            
-            # Εξαγωγή header info (Ταμείο & Τύπος)
-            taimeio, typos = extract_header_info(page)
-            if taimeio and typos:
-                current_taimeio = taimeio
-                current_typos = typos
-                st.info(f"Σελίδα {page_num + 1}: Ταμείο='{taimeio}', Τύπος='{typos}'")
-            
-            # Στρατηγική 1: Κανονική εξαγωγή πινάκων
-            tables = page.extract_tables()
-            
-            if len(tables) >= 2:
-                second_table = tables[1]
-                if second_table and len(second_table) > 1:
-                    df = pd.DataFrame(second_table[1:], columns=second_table[0])
-                    df['Σελίδα'] = page_num + 1
-                    
-                    # Προσθήκη Ταμείου και Τύπου ως πρώτες στήλες
-                    df.insert(0, 'Ταμείο', current_taimeio)
-                    df.insert(1, 'Τύπος Ασφάλισης', current_typos)
-                    
-                    all_tables.append(df)
-                    st.success(f"Σελίδα {page_num + 1}: Εξήχθησαν {len(df)} γραμμές")
-                    continue
-            
-            # Στρατηγική 2: Εξαγωγή με διαφορετικές παραμέτρους
-            try:
-                tables_alt = page.extract_tables(table_settings={
-                    "vertical_strategy": "lines_strict",
-                    "horizontal_strategy": "lines_strict"
-                })
-                
-                if len(tables_alt) >= 2:
-                    second_table = tables_alt[1]
-                    if second_table and len(second_table) > 1:
-                        df = pd.DataFrame(second_table[1:], columns=second_table[0])
-                        df['Σελίδα'] = page_num + 1
-                        
-                        # Προσθήκη Ταμείου και Τύπου ως πρώτες στήλες
-                        df.insert(0, 'Ταμείο', current_taimeio)
-                        df.insert(1, 'Τύπος Ασφάλισης', current_typos)
-                        
-                        all_tables.append(df)
-                        st.success(f"Σελίδα {page_num + 1}: Εξήχθησαν {len(df)} γραμμές")
-                        continue
-            except Exception:
-                pass
-            
-            # Στρατηγική 3: Εξαγωγή όλων των πινάκων
-            try:
-                all_tables_page = page.extract_tables()
-                if all_tables_page:
-                    largest_table = max(all_tables_page, key=len)
-                    if largest_table and len(largest_table) > 1:
-                        df = pd.DataFrame(largest_table[1:], columns=largest_table[0])
-                        df['Σελίδα'] = page_num + 1
-                        
-                        # Προσθήκη Ταμείου και Τύπου ως πρώτες στήλες
-                        df.insert(0, 'Ταμείο', current_taimeio)
-                        df.insert(1, 'Τύπος Ασφάλισης', current_typos)
-                        
-                        all_tables.append(df)
-                        st.success(f"Σελίδα {page_num + 1}: Εξήχθησαν {len(df)} γραμμές")
-                        continue
-            except Exception:
-                pass
-            
-            # Στρατηγική 4: Text-based parsing
-            try:
-                text = page.extract_text()
-                if text and len(text) > 100:
-                    table_data = parse_text_for_tables(text, page_num + 1)
-                    if table_data and len(table_data) > 1:
-                        df = pd.DataFrame(table_data[1:], columns=table_data[0])
-                        df['Σελίδα'] = page_num + 1
-                        
-                        # Προσθήκη Ταμείου και Τύπου ως πρώτες στήλες
-                        df.insert(0, 'Ταμείο', current_taimeio)
-                        df.insert(1, 'Τύπος Ασφάλισης', current_typos)
-                        
-                        all_tables.append(df)
-                        st.success(f"Σελίδα {page_num + 1}: Εξήχθησαν {len(df)} γραμμές")
-                        continue
-            except Exception:
-                pass
-            
-            # Στρατηγική 5: Εξαγωγή όλων των πινάκων (fallback)
-            try:
-                all_tables_page = page.extract_tables()
-                if all_tables_page:
-                    for table_idx, table in enumerate(all_tables_page):
-                        if table and len(table) > 1:
-                            df = pd.DataFrame(table[1:], columns=table[0])
-                            df['Σελίδα'] = page_num + 1
-                            df['Πίνακας'] = table_idx + 1
-                            
-                            # Προσθήκη Ταμείου και Τύπου ως πρώτες στήλες
-                            df.insert(0, 'Ταμείο', current_taimeio)
-                            df.insert(1, 'Τύπος Ασφάλισης', current_typos)
-                            
-                            all_tables.append(df)
-                            st.success(f"Σελίδα {page_num + 1}: Εξήχθησαν {len(df)} γραμμές (πίνακας {table_idx + 1})")
-                            break
-            except Exception:
-                pass
-            
-            # Στρατηγική 6: PyMuPDF fallback
-            if PYMUPDF_AVAILABLE:
-                try:
-                    import fitz
-                    doc = fitz.open(pdf_path)
-                    page_pymupdf = doc[page_num]
-                    tables_pymupdf = page_pymupdf.find_tables()
-                    
-                    if len(tables_pymupdf) >= 2:
-                        second_table = tables_pymupdf[1]
-                        table_data = second_table.extract()
-                        if table_data and len(table_data) > 1:
-                            df = pd.DataFrame(table_data[1:], columns=table_data[0])
-                            df['Σελίδα'] = page_num + 1
-                            
-                            # Προσθήκη Ταμείου και Τύπου ως πρώτες στήλες
-                            df.insert(0, 'Ταμείο', current_taimeio)
-                            df.insert(1, 'Τύπος Ασφάλισης', current_typos)
-                            
-                            all_tables.append(df)
-                            st.success(f"Σελίδα {page_num + 1}: Εξήχθησαν {len(df)} γραμμές")
-                            doc.close()
-                            continue
-                    doc.close()
-                except Exception:
-                    pass
-            
-            st.warning(f"Σελίδα {page_num + 1}: Δεν βρέθηκε πίνακας")
-        
-        # Τελικό progress
-        progress_bar.progress(1.0)
-        status_text.text("Επεξεργασία ολοκληρώθηκε!")
+    ui = {"status": None, "bar": None, "counters": None, "last": 0.0}
+
+    def _render(result, progress):
+        if ui["status"] is None:
+            ui["status"] = st.status(f"Ανάλυση PDF — {progress.total_pages} σελίδες…", expanded=False)
+            with ui["status"]:
+                ui["bar"] = st.progress(0)
+                ui["counters"] = st.empty()
+        # Περιορισμός ενημερώσεων προς τον browser (όχι ένα widget ανά σελίδα)
+        now = time.monotonic()
+        if result is None or now - ui["last"] >= 0.25:
+            ui["bar"].progress(progress.fraction)
+            ui["counters"].markdown(_atlas_extraction_status_md(progress))
+            ui["last"] = now
+
+    all_tables, progress = extract_frames(pdf_source, workers=workers, backend=backend, on_progress=_render)
+
+    if ui["status"] is not None:
+        ui["bar"].progress(1.0)
+        ui["counters"].markdown(_atlas_extraction_status_md(progress))
+        ui["status"].update(
+            label=(
+                f"Επεξεργασία ολοκληρώθηκε: {progress.rows} γραμμές από {progress.pages_done} σελίδες"
+                + (f" — {len(progress.failed_pages)} σελίδες χωρίς πίνακα" if progress.failed_pages else "")
+            ),
+            state="error" if progress.failed_pages and not all_tables else "complete",
+            expanded=bool(progress.failed_pages or progress.header_errors),
+        )
     
     return all_tables
 
-def parse_text_for_tables(text, page_num):
-    """
-    Αναλύει κείμενο για να βρει πίνακες
-    """
-    lines = text.split('\n')
-    
-    # Ψάχνουμε για γραμμές που μοιάζουν με πίνακα
-    table_lines = []
-    in_table = False
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Ψάχνουμε για patterns που υποδεικνύουν πίνακα
-        if (re.search(r'\d{1,2}/\d{1,2}/\d{4}', line) or  # Ημερομηνίες
-            re.search(r'[\d,]+\.\d{2}', line) or  # Ποσά
-            line.count(' ') > 3 or  # Πολλά κενά
-            '\t' in line):  # Tabs
-            
-            table_lines.append(line)
-            in_table = True
-        elif in_table and len(table_lines) > 0:
-            # Αν είχαμε βρει πίνακα αλλά τώρα δεν βρίσκουμε δεδομένα
-            if len(table_lines) > 5:  # Αν έχουμε αρκετές γραμμές
-                break
-            else:
-                table_lines = []  # Reset αν δεν έχουμε αρκετές γραμμές
-                in_table = False
-    
-    if len(table_lines) < 3:
-        return None
-    
-    # Δημιουργούμε headers
-    headers = ['Στήλη_1', 'Στήλη_2', 'Στήλη_3', 'Στήλη_4', 'Στήλη_5', 'Στήλη_6']
-    
-    # Μετατρέπουμε τις γραμμές σε δεδομένα
-    data = [headers]
-    for line in table_lines:
-        # Χωρίζουμε τη γραμμή σε στήλες
-        parts = line.split()
-        if len(parts) >= 3:  # Αν έχει αρκετές στήλες
-            # Συμπληρώνουμε με κενά αν χρειάζεται
-            while len(parts) < len(headers):
-                parts.append('')
-            data.append(parts[:len(headers)])
-    
-    return data if len(data) > 1 else None
-
 def detect_currency(value):
     """Ανίχνευση νομίσματος από την τιμή"""
     if pd.isna(value) or value == '' or value == '-':
@@ -1871,6 +1744,56 @@ def format_number_greek(value, decimals=None):
         return str(value) if value else ''
 
 
+# Cache μορφοποίησης για τιμές που επαναλαμβάνονται σε στήλες/πίνακες (typed: 1 ≠ 1.0 ≠ True)
+_format_currency_memo = lru_cache(maxsize=4096, typed=True)(format_currency)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _format_number_greek_memo(value, decimals):
+    return format_number_greek(value, decimals=decimals)
+
+
+def _format_number_greek_cached(value, decimals=None):
+    if isinstance(value, float) and value == 0:
+        # -0.0 και 0.0 έχουν ίδιο κλειδί στην cache αλλά όχι πάντα ίδια μορφή (-0,0)
+        return format_number_greek(value, decimals=decimals)
+    return _format_number_greek_memo(value, decimals)
+
+
+def _atlas_map_unique(values, func) -> pd.Series:
+    """Ίδιο αποτέλεσμα με values.apply(func), με μία κλήση ανά μοναδική τιμή της στήλης.
+
+    NaN/None και μηδενικά (το factorize ενώνει -0.0 / 0.0 / 0 / False) υπολογίζονται ανά κελί.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    if s.empty:
+        return s.apply(func)
+    try:
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    except TypeError:  # μη hashable τιμές
+        return s.apply(func)
+    uniques = uniques.tolist()
+    per_cell = {i for i, u in enumerate(uniques) if isinstance(u, (int, float)) and u == 0}
+    mapped = [None if i in per_cell else func(u) for i, u in enumerate(uniques)]
+    out = []
+    for i, c in enumerate(codes.tolist()):
+        if c < 0 or c in per_cell:
+            out.append(func(s.iat[i]))
+        else:
+            out.append(mapped[c])
+    return pd.Series(out, index=s.index, name=s.name)
+
+
+def format_currency_series(values) -> pd.Series:
+    """format_currency για ολόκληρη στήλη (Series/ndarray) σε ένα πέρασμα, ίδια έξοδος ανά κελί."""
+    return _atlas_map_unique(values, _format_currency_memo)
+
+
+def format_number_greek_series(values, decimals=None) -> pd.Series:
+    """format_number_greek για ολόκληρη στήλη (Series/ndarray) σε ένα πέρασμα, ίδια έξοδος ανά κελί."""
+    return _atlas_map_unique(values, lambda x: _format_number_greek_cached(x, decimals))
+
+
 def format_insurance_years_from_days(days, year_days: float = 300.0, empty: str = "•") -> str:
     """Έτη ασφάλισης = ημέρες / year_days, πάντα 2 δεκαδικά."""
     if days is None:
@@ -1892,7 +1815,7 @@ def format_maindata_display_df(df: pd.DataFrame) -> pd.DataFrame:
     for pat in (["μικτές αποδοχές", "μικτες αποδοχες"], ["συνολικές εισφορές", "συνολικες εισφορες"]):
         col = find_column_by_pattern(out, pat)
         if col:
-            out[col] = out[col].apply(format_currency)
+            out[col] = format_currency_series(out[col])
     for col in out.columns:
         cn = normalize_column_name(col).lower()
         decimals = None
@@ -1905,92 +1828,17 @@ def format_maindata_display_df(df: pd.DataFrame) -> pd.DataFrame:
         elif cn in ("ημέρες", "ημερες"):
             decimals = 0
         if decimals is not None:
-            out[col] = out[col].apply(
+            out[col] = _atlas_map_unique(
+                out[col],
                 lambda x, d=decimals: (
-                    format_number_greek(x, decimals=d)
+                    _format_number_greek_cached(x, decimals=d)
                     if pd.notna(x) and str(x).strip() not in ("", "-")
                     else x
-                )
+                ),
             )
     return out
 
 
-def clean_numeric_value(value, exclude_drx=False):
-    """Καθαρισμός και μετατροπή αριθμητικών τιμών σε float
-    
-    Args:
-        value: Η τιμή προς καθαρισμό
-        exclude_drx: Αν True, επιστρέφει 0.0 για ποσά σε ΔΡΧ
-    """
-    try:
-        if pd.isna(value) or value == '' or value == '-':
-            return 0.0
-        
-        # Μετατροπή σε string και καθαρισμός
-        clean_value = str(value).strip()
-        is_negative = False
-
-        # Υποστήριξη unicode minus και αρνητικού σε παρένθεση/τέλος
-        clean_value = clean_value.replace('\u2212', '-')
-        if clean_value.startswith('(') and clean_value.endswith(')'):
-            is_negative = True
-            clean_value = clean_value[1:-1].strip()
-        if clean_value.endswith('-'):
-            is_negative = True
-            clean_value = clean_value[:-1].strip()
-        if clean_value.startswith('-'):
-            is_negative = True
-            clean_value = clean_value[1:].strip()
-        
-        # Έλεγχος για ΔΡΧ αν exclude_drx=True
-        if exclude_drx and 'ΔΡΧ' in clean_value:
-            return 0.0
-        
-        # Αφαίρεση κειμένου όπως "ΔΡΧ", "€", κλπ
-        clean_value = clean_value.replace('ΔΡΧ', '').replace('€', '').replace('%', '').replace(' ', '')
-        
-        # Αφαίρεση όλων των γραμμάτων
-        import re
-        clean_value = re.sub(r'[a-zA-Zα-ωΑ-Ω]', '', clean_value)
-        
-        # Αφαίρεση κενών
-        clean_value = clean_value.strip()
-        
-        if not clean_value or clean_value == '-':
-            return 0.0
-        
-        # Έλεγχος για ελληνικό format (κόμμα ως διαχωριστικός χιλιάδων, τελεία ως δεκαδικός)
-        # π.χ. "1,234.56" ή "1234.56" ή "1,234"
-        if ',' in clean_value and '.' in clean_value:
-            if clean_value.rfind(',') > clean_value.rfind('.'):
-                # Ελληνικό: 1.234,56 (τελεία χιλιάδες, κόμμα δεκαδικά)
-                clean_value = clean_value.replace('.', '').replace(',', '.')
-            else:
-                # US: 1,234.56
-                clean_value = clean_value.replace(',', '')
-            result = float(clean_value)
-            return -result if is_negative else result
-        elif ',' in clean_value:
-            parts = clean_value.split(',')
-            if len(parts) == 2:
-                if len(parts[1]) == 3 and parts[1].isdigit():
-                    clean_value = clean_value.replace(',', '')
-                elif len(parts[1]) <= 2:
-                    clean_value = clean_value.replace(',', '.')
-                else:
-                    clean_value = clean_value.replace(',', '')
-            else:
-                clean_value = clean_value.replace(',', '')
-        elif re.fullmatch(r'\d{1,3}(?:\.\d{3})+', clean_value):
-            clean_value = clean_value.replace('.', '')
-        
-        # Μετατροπή σε float
-        result = float(clean_value)
-        return -result if is_negative else result
-    except (ValueError, TypeError):
-        return 0.0
-
-
 def _atlas_excel_parse_cell(value, *, exclude_drx=False):
     """Μετατροπή κελιού (display string ή αριθμός) σε τύπο κατάλληλο για Excel."""
     if pd.isna(value) or value is None:
@@ -2019,6 +1867,15 @@ def _atlas_excel_parse_cell(value, *, exclude_drx=False):
     return float(clean_numeric_value(cleaned, exclude_drx=exclude_drx))
 
 
+def _atlas_excel_parse_column(series: pd.Series, *, exclude_drx=False) -> list:
+    """_atlas_excel_parse_cell για στήλη κειμένου: μία μετατροπή ανά μοναδική τιμή."""
+    if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+        return [_atlas_excel_parse_cell(v, exclude_drx=exclude_drx) for v in series]
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = [_atlas_excel_parse_cell(u, exclude_drx=exclude_drx) for u in uniques]
+    return [parsed[c] if c >= 0 else pd.NA for c in codes]
+
+
 def _atlas_should_skip_excel_text_col(col_name: str) -> bool:
     low = str(col_name).lower().strip()
     if 'αποδοχ' in low and any(x in low for x in ('τύπος', 'τυπος', 'κωδ', 'γραφ', 'περιγραφ')):
@@ -2031,11 +1888,12 @@ def _atlas_should_skip_excel_text_col(col_name: str) -> bool:
 
 
 def _atlas_df_for_excel_export(df: pd.DataFrame) -> pd.DataFrame:
-    """DataFrame με αριθμούς/ημερομηνίες ως τύπους Excel (όχι formatted text)."""
+    """DataFrame με αριθμούς/ημερομηνίες ως τύπους Excel (όχι formatted text), χωρίς τις typed στήλες."""
     if df is None or getattr(df, 'empty', True):
         return df if df is not None else pd.DataFrame()
 
-    out = df.copy()
+    # Οι βοηθητικές typed στήλες του ingest (__Από, __ΔΡΧ_… κ.λπ.) δεν φτάνουν ποτέ σε φύλλο Excel
+    out = drop_typed_columns(df).copy()
 
     for col in out.columns:
         if _atlas_should_skip_excel_text_col(col):
@@ -2052,7 +1910,7 @@ def _atlas_df_for_excel_export(df: pd.DataFrame) -> pd.DataFrame:
             out[col] = pd.to_numeric(series, errors='coerce')
             continue
 
-        converted = [_atlas_excel_parse_cell(v, exclude_drx=exclude_drx) for v in series]
+        converted = _atlas_excel_parse_column(series, exclude_drx=exclude_drx)
         s = pd.Series(converted, index=series.index)
         orig_digits = series.astype(str).str.contains(r'\d', regex=True, na=False)
         num = pd.to_numeric(s, errors='coerce')
@@ -2066,6 +1924,18 @@ def _atlas_df_for_excel_export(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
+def _atlas_all_data_export_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Φύλλο «Όλα_Δεδομένα»: γραμμές με έγκυρη ημερομηνία Από, χρονολογικά, χωρίς typed στήλες."""
+    all_df_sorted = df.copy()
+    if 'Από' in all_df_sorted.columns:
+        all_df_sorted['Από_DateTime'] = typed_dates(all_df_sorted, 'Από')
+        # Φιλτράρουμε μόνο τις γραμμές με έγκυρη ημερομηνία
+        all_df_sorted = all_df_sorted.dropna(subset=['Από_DateTime'])
+        all_df_sorted = all_df_sorted.sort_values('Από_DateTime', na_position='last')
+        all_df_sorted = all_df_sorted.drop('Από_DateTime', axis=1)
+    return drop_typed_columns(all_df_sorted)
+
+
 def _atlas_write_df_to_excel(writer, df: pd.DataFrame, sheet_name: str, *, index: bool = False) -> None:
     """Εξαγωγή πίνακα στο Excel με σωστούς τύπους δεδομένων."""
     export_df = _atlas_df_for_excel_export(df)
@@ -2107,15 +1977,6 @@ def _atlas_write_df_to_excel(writer, df: pd.DataFrame, sheet_name: str, *, index
             cell.number_format = fmt
 
 
-def get_negative_amount_sign(gross_val, contrib_val) -> int:
-    """Επιστρέφει -1 όταν υπάρχουν αρνητικά ποσά (διαγραφή εγγραφής)."""
-    try:
-        if (gross_val is not None and gross_val < 0) or (contrib_val is not None and contrib_val < 0):
-            return -1
-    except Exception:
-        pass
-    return 1
-
 def apply_negative_time_sign(df: pd.DataFrame,
                              gross_col: str = 'Μικτές αποδοχές',
                              contrib_col: str = 'Συνολικές εισφορές') -> pd.DataFrame:
@@ -2125,15 +1986,15 @@ def apply_negative_time_sign(df: pd.DataFrame,
     if gross_col not in df.columns and contrib_col not in df.columns:
         return df
 
-    def _row_sign(r) -> int:
-        gross_val = clean_numeric_value(r.get(gross_col, 0), exclude_drx=True)
-        contrib_val = clean_numeric_value(r.get(contrib_col, 0), exclude_drx=True)
-        return get_negative_amount_sign(gross_val, contrib_val)
-
-    sign_series = df.apply(_row_sign, axis=1)
+    # Πρόσημο γραμμής (get_negative_amount_sign) για όλη τη στήλη: -1 όταν κάποιο ποσό < 0
+    negative = pd.Series(False, index=df.index)
+    for amount_col in (gross_col, contrib_col):
+        if amount_col in df.columns:
+            negative = negative | (clean_numeric_series(df[amount_col], exclude_drx=True) < 0)
+    sign_series = pd.Series(1, index=df.index).mask(negative, -1)
     for col in ['Έτη', 'Μήνες', 'Ημέρες']:
         if col in df.columns:
-            numeric = df[col].apply(clean_numeric_value)
+            numeric = clean_numeric_series(df[col])
             # Ίδια λογική με Καταμέτρηση: -abs() όταν αρνητικές αποδοχές/εισφορές,
             # όχι val*sign (αλλιώς ήδη αρνητικές ημέρες γίνονται θετικές: -17 → +17).
             df[col] = numeric.where(sign_series >= 0, -numeric.abs())
@@ -2156,9 +2017,9 @@ def find_negative_entries(df: pd.DataFrame) -> pd.DataFrame:
 
     neg_mask = pd.Series(False, index=df.index)
     if gross_col:
-        neg_mask = neg_mask | df[gross_col].apply(lambda x: (clean_numeric_value(x, exclude_drx=True) or 0) < 0)
+        neg_mask = neg_mask | (clean_numeric_series(df[gross_col], exclude_drx=True) < 0)
     if contrib_col:
-        neg_mask = neg_mask | df[contrib_col].apply(lambda x: (clean_numeric_value(x, exclude_drx=True) or 0) < 0)
+        neg_mask = neg_mask | (clean_numeric_series(df[contrib_col], exclude_drx=True) < 0)
 
     neg_df = df[neg_mask]
     if neg_df.empty:
@@ -2192,8 +2053,8 @@ def find_gaps_in_insurance_data(df):
     
     # Φιλτράρουμε μόνο τις γραμμές με έγκυρες ημερομηνίες
     gaps_df = df.copy()
-    gaps_df['Από_DateTime'] = pd.to_datetime(gaps_df['Από'], format='%d/%m/%Y', errors='coerce')
-    gaps_df['Έως_DateTime'] = pd.to_datetime(gaps_df['Έως'], format='%d/%m/%Y', errors='coerce')
+    gaps_df['Από_DateTime'] = typed_dates(gaps_df, 'Από')
+    gaps_df['Έως_DateTime'] = typed_dates(gaps_df, 'Έως')
     gaps_df = gaps_df.dropna(subset=['Από_DateTime', 'Έως_DateTime'])
     
     if gaps_df.empty:
@@ -2258,8 +2119,8 @@ def find_zero_duration_intervals(df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame()
 
     zero_duration_df = df.copy()
-    zero_duration_df['Από_DateTime'] = pd.to_datetime(zero_duration_df['Από'], format='%d/%m/%Y', errors='coerce')
-    zero_duration_df['Έως_DateTime'] = pd.to_datetime(zero_duration_df['Έως'], format='%d/%m/%Y', errors='coerce')
+    zero_duration_df['Από_DateTime'] = typed_dates(zero_duration_df, 'Από')
+    zero_duration_df['Έως_DateTime'] = typed_dates(zero_duration_df, 'Έως')
     zero_duration_df = zero_duration_df.dropna(subset=['Από_DateTime', 'Έως_DateTime'])
 
     duration_columns = ['Έτη', 'Μήνες', 'Ημέρες']
@@ -2267,7 +2128,7 @@ def find_zero_duration_intervals(df: pd.DataFrame) -> pd.DataFrame:
         if col not in zero_duration_df.columns:
             zero_duration_df[col] = 0
         numeric_col = f"__{col}_numeric"
-        zero_duration_df[numeric_col] = zero_duration_df[col].apply(clean_numeric_value)
+        zero_duration_df[numeric_col] = clean_numeric_series(zero_duration_df[col])
 
     zero_duration_df['__duration_sum'] = (
         zero_duration_df['__Έτη_numeric'] +
@@ -2319,150 +2180,90 @@ def find_zero_duration_intervals(df: pd.DataFrame) -> pd.DataFrame:
     return zero_display_df
 
 
-def normalize_column_name(name):
-    """
-    Κανονικοποιεί ένα όνομα στήλης για σύγκριση
-    Αφαιρεί \n, πολλαπλά κενά, και μετατρέπει σε πεζά
-    """
-    if pd.isna(name):
-        return ""
-    # Αντικατάσταση \n και tabs με κενό
-    normalized = str(name).replace('\n', ' ').replace('\t', ' ').replace('\r', ' ')
-    # Αφαίρεση πολλαπλών κενών
-    normalized = ' '.join(normalized.split())
-    # Αφαίρεση περιττών κενών στην αρχή/τέλος
-    normalized = normalized.strip()
-    return normalized
-
-def find_column_by_pattern(df, patterns):
-    """
-    Βρίσκει μια στήλη με βάση patterns (υποστηρίζει πολλαπλά patterns)
-    Επιστρέφει το πραγματικό όνομα της στήλης ή None
-    """
-    if isinstance(patterns, str):
-        patterns = [patterns]
-    
-    for col in df.columns:
-        col_normalized = normalize_column_name(col).lower()
-        for pattern in patterns:
-            pattern_normalized = pattern.lower().strip()
-            if pattern_normalized in col_normalized or col_normalized in pattern_normalized:
-                return col
-    return None
+def _atlas_unlink_quiet(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
 
-def normalize_column_names(df):
-    """
-    Κανονικοποίηση ονομάτων στηλών με mapping σε standard names.
-    Υποστηρίζει κεφαλές που εμφανίζονται «σε μια λέξη» (π.χ. PDF από Firefox: ΣυνολικέςΕισφορές, Κλάδος/ΠακέτοΚάλυψης).
-    """
-    # Mapping από patterns -> standard name (με προτεραιότητα - πιο συγκεκριμένα πρώτα)
-    column_mapping = {
-        'Συνολικές εισφορές': ['συνολικές εισφορές', 'συνολικες εισφορες', 'συνολικ εισφορ', 'συνολικέςεισφορές', 'συνολικεςεισφορες'],
-        'Μικτές αποδοχές': ['μικτές αποδοχές', 'μικτες αποδοχες', 'μικτ αποδοχ', 'μικτέςαποδοχές', 'μικτεςαποδοχες'],
-        'Τύπος Αποδοχών': ['τύπος αποδοχών', 'τυπος αποδοχων', 'τυπος απο', 'τύποςαποδοχών', 'τυποςαποδοχων'],
-        'Τύπος Ασφάλισης': ['τύπος ασφάλισης', 'τυπος ασφαλισης', 'μημισθωτηασφαλιση', 'μισθωτήασφάλιση', 'μισθωτη ασφαλιση'],
-        'Κλάδος/Πακέτο Κάλυψης': ['κλάδος πακέτο κάλυψης', 'κλαδος πακετο καλυψης', 'κλάδος', 'πακέτο κάλυψης', 'κλάδος/πακέτοκάλυψης', 'κλαδοςπακετοκαλυψης'],
-        'Α-Μ εργοδότη': ['α μ εργοδότη', 'α/μ εργοδ', 'εργοδότη', 'α-μ εργοδότη', 'αμεργοδότη', 'α-μεργοδότη'],
-        'Ημέρες': ['ημέρες', 'ημερες', 'ημερ'],
-        'Έτη': ['έτη', 'ετη'],
-        'Μήνες': ['μήνες', 'μηνες'],
-        'Από': ['από'],
-        'Έως': ['έως', 'εως'],
-    }
-    
-    # Δημιουργία mapping από παλιό -> νέο όνομα
-    rename_dict = {}
-    used_standards = set()  # Για να μην αντιστοιχίσουμε δύο στήλες στο ίδιο standard name
-    
-    # Πρώτα ψάχνουμε για exact matches ή πολύ κοντινά matches
-    for col in df.columns:
-        col_normalized = normalize_column_name(col).lower()
-        col_no_space = col_normalized.replace(' ', '').replace('/', '').replace('-', '').replace('_', '')
-        
-        # Ελέγχουμε για κάθε standard name (με τη σειρά προτεραιότητας)
-        matched = False
-        for standard_name, patterns in column_mapping.items():
-            if standard_name in used_standards:
-                continue
-                
-            # Έλεγχος για match
-            for pattern in patterns:
-                # Ελέγχουμε αν το pattern ταιριάζει
-                if pattern == col_normalized:
-                    rename_dict[col] = standard_name
-                    used_standards.add(standard_name)
-                    matched = True
-                    break
-                elif len(pattern) > 5 and pattern in col_normalized:
-                    rename_dict[col] = standard_name
-                    used_standards.add(standard_name)
-                    matched = True
-                    break
-                elif len(col_normalized) > 5 and col_normalized in pattern:
-                    rename_dict[col] = standard_name
-                    used_standards.add(standard_name)
-                    matched = True
-                    break
-                # Παραλλαγή «μία λέξη» (π.χ. από Firefox): στήλη χωρίς κενά/παύλες = standard χωρίς κενά/παύλες
-                pattern_no_space = pattern.replace(' ', '').replace('/', '').replace('-', '').replace('_', '')
-                if len(pattern_no_space) >= 3 and (col_no_space == pattern_no_space or pattern_no_space in col_no_space or col_no_space in pattern_no_space):
-                    rename_dict[col] = standard_name
-                    used_standards.add(standard_name)
-                    matched = True
-                    break
-            
-            if matched:
-                break
-        
-        if matched:
-            continue
-        # Fallback: standard name χωρίς κενά/σύμβολα = στήλη χωρίς κενά/σύμβολα
-        for standard_name in column_mapping:
-            if standard_name in used_standards:
-                continue
-            standard_no_space = standard_name.lower().replace(' ', '').replace('/', '').replace('-', '').replace('_', '')
-            if len(standard_no_space) >= 3 and (col_no_space == standard_no_space or standard_no_space in col_no_space):
-                rename_dict[col] = standard_name
-                used_standards.add(standard_name)
-                break
-    
-    # Εφαρμογή mapping
-    if rename_dict:
-        df = df.rename(columns=rename_dict)
-    
-    return df
 
 class _AtlasPdfUpload:
-    """Bytes + όνομα αρχείου — σταθερό στο session (όχι widget UploadedFile)."""
+    """Bytes + όνομα αρχείου — το μοναδικό αντίγραφο του PDF στο session (όχι widget UploadedFile).
+
+    Μετά την εξαγωγή, spill() γράφει τα bytes σε προσωρινό αρχείο και τα αφήνει από τη μνήμη·
+    getvalue() τα ξαναδιαβάζει από εκεί. Το αρχείο σβήνεται με discard() ή όταν το αντικείμενο
+    φύγει από τη μνήμη (τέλος session).
+    """
 
-    __slots__ = ("name", "_bytes")
+    __slots__ = ("name", "size", "_bytes", "_path", "_finalizer", "__weakref__")
 
     def __init__(self, data: bytes, name: str):
         self._bytes = data
         self.name = name
+        self.size = len(data)
+        self._path = None
+        self._finalizer = None
 
     def getvalue(self) -> bytes:
-        return self._bytes
+        if self._bytes is None and self._path is not None:
+            with open(self._path, "rb") as fh:
+                return fh.read()
+        return self._bytes or b""
+
+    @property
+    def resident_bytes(self) -> int:
+        """Bytes του PDF που κρατιούνται στη μνήμη (0 μετά το spill)."""
+        return len(self._bytes) if self._bytes is not None else 0
+
+    def spill(self) -> bool:
+        """Μεταφορά των bytes σε προσωρινό αρχείο· False (μένουν στη μνήμη) αν αποτύχει η εγγραφή."""
+        if self._bytes is None:
+            return True
+        try:
+            fd, path = tempfile.mkstemp(prefix="atlas_pdf_", suffix=".pdf")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(self._bytes)
+        except OSError:
+            return False
+        self._path = path
+        self._finalizer = weakref.finalize(self, _atlas_unlink_quiet, path)
+        self._bytes = None
+        return True
+
+    def discard(self) -> None:
+        """Αφήνει τα bytes και σβήνει το προσωρινό αρχείο (αν υπάρχει)."""
+        self._bytes = None
+        if self._finalizer is not None:
+            self._finalizer()
+        self._path = None
+
+
+def _atlas_discard_uploaded_pdf() -> None:
+    upload = st.session_state.pop("uploaded_file", None)
+    if isinstance(upload, _AtlasPdfUpload):
+        upload.discard()
 
 
 def _atlas_store_uploaded_pdf(uploaded_file) -> None:
-    """Αποθήκευση PDF bytes στο session."""
-    pdf_bytes = uploaded_file.getvalue()
-    st.session_state["uploaded_file_bytes"] = pdf_bytes
+    """Αποθήκευση PDF bytes στο session (ένα αντίγραφο, στο _AtlasPdfUpload)."""
+    _atlas_discard_uploaded_pdf()
     st.session_state["filename"] = uploaded_file.name
-    st.session_state["uploaded_file"] = _AtlasPdfUpload(pdf_bytes, uploaded_file.name)
+    st.session_state["uploaded_file"] = _AtlasPdfUpload(uploaded_file.getvalue(), uploaded_file.name)
     st.session_state["file_uploaded"] = True
-    for _k in ("_atlas_extract_in_progress", "_atlas_pending_html_edition", "extracted_data", "processing_done"):
+    for _k in (
+        "_atlas_extract_in_progress", "_atlas_pending_html_edition",
+        "extracted_data", "extracted_data_fingerprint", "processing_done",
+    ):
         st.session_state.pop(_k, None)
 
 
 def _atlas_reset_upload_session() -> None:
+    _atlas_discard_uploaded_pdf()
     for key in [
-        "file_uploaded", "processing_done", "uploaded_file", "uploaded_file_bytes",
-        "extracted_data", "show_results", "filename",
+        "file_uploaded", "processing_done",
+        "extracted_data", "extracted_data_fingerprint", "show_results", "filename",
         "_atlas_extract_in_progress", "_atlas_pending_html_edition",
-        "_atlas_analytics_sig", "_atlas_cached_gaps", "_atlas_cached_zero_duration",
-        "_atlas_cached_audit", "ai_chat_context", "ai_chat_history", "main_ai_summary_result",
+        "_atlas_analytics_sig", "_atlas_case", "ai_chat_context", "ai_chat_history", "main_ai_summary_result",
         "atlas_view_exports", "atlas_export_main_df", "atlas_export_extra_columns",
         "atlas_export_extra_df", "atlas_export_apd_df", "_atlas_pension_tab_visible_snap",
     ]:
@@ -2474,8 +2275,8 @@ def extract_efka_data(uploaded_file):
     Εξαγωγή δεδομένων από PDF αρχείο
     """
     try:
-        if isinstance(uploaded_file, (bytes, bytearray)):
-            pdf_bytes = bytes(uploaded_file)
+        if isinstance(uploaded_file, (bytes, bytearray, memoryview)):
+            pdf_bytes = uploaded_file
         elif hasattr(uploaded_file, "getvalue"):
             pdf_bytes = uploaded_file.getvalue()
         else:
@@ -2485,38 +2286,35 @@ def extract_efka_data(uploaded_file):
         st.error(f"Δεν ήταν δυνατή η ανάγνωση του PDF: {e}")
         return pd.DataFrame()
 
-    # Δημιουργούμε ένα προσωρινό αρχείο
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-        tmp_file.write(pdf_bytes)
-        tmp_path = tmp_file.name
-    
+    # Cache περιεχομένου: ίδιο PDF (άλλος χρήστης / μετά από reset) → χωρίς νέα εξαγωγή
+    cache = get_extract_cache()
+    cache_key = pdf_cache_key(pdf_bytes) if cache is not None else None
+    if cache is not None:
+        cached_df = cache.get(cache_key)
+        if cached_df is not None and not cached_df.empty:
+            st.success(f"🎉 Συνολικά {len(cached_df)} γραμμές δεδομένων (από cache — το αρχείο έχει ήδη αναλυθεί)")
+            return cached_df
+
     try:
-        # Εξάγουμε πίνακες
-        all_tables = extract_tables_adaptive(tmp_path)
+        # Εξάγουμε πίνακες απευθείας από τη μνήμη (ήδη κανονικοποιημένα ονόματα στηλών)
+        all_tables = extract_tables_adaptive(pdf_bytes)
         
         if not all_tables:
             st.error("Δεν βρέθηκαν πίνακες στο PDF αρχείο")
             return pd.DataFrame()
         
-        # Κανονικοποίηση ονομάτων στηλών για όλους τους πίνακες
-        for i in range(len(all_tables)):
-            all_tables[i] = normalize_column_names(all_tables[i])
-        
         # Συνδυάζουμε όλα τα DataFrames
         with nullcontext():
             combined_df = pd.concat(all_tables, ignore_index=True)
         
         st.success(f"🎉 Συνολικά εξήχθησαν {len(combined_df)} γραμμές δεδομένων από {len(all_tables)} πίνακες")
+        if cache is not None:
+            cache.put(cache_key, combined_df)
         return combined_df
     
     except Exception as e:
         st.error(f"Σφάλμα κατά την εξαγωγή: {str(e)}")
         return pd.DataFrame()
-    
-    finally:
-        # Διαγράφουμε το προσωρινό αρχείο
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
 
 def build_description_map(df: pd.DataFrame) -> dict[str, str]:
     """Δημιουργεί mapping κωδικός -> περιγραφή για πακέτα κάλυψης."""
@@ -2533,470 +2331,162 @@ def build_description_map(df: pd.DataFrame) -> dict[str, str]:
             description_map[code] = desc
     return description_map
 
-def compute_parallel_months(base_df: pd.DataFrame) -> list[tuple[int, int]]:
-    if base_df.empty or not all(col in base_df.columns for col in ['Από', 'Έως']):
-        return []
 
-    # Έως 2016: μην μετράνε πακέτα 127, 131, 132, 133, 026
-    if 'Κλάδος/Πακέτο Κάλυψης' in base_df.columns:
-        pkg = base_df['Κλάδος/Πακέτο Κάλυψης'].astype(str).str.strip()
-        base_df = base_df[~pkg.isin(EXCLUDED_PACKAGES_PARALLEL_UNTIL_2016)].copy()
-    if base_df.empty:
-        return []
+def _atlas_row_text(df: pd.DataFrame, col: str, fallback: str | None = None) -> pd.Series:
+    """str(row.get(col, row.get(fallback, ''))).strip() ανά γραμμή (μία κλήση ανά μοναδική τιμή)."""
+    for name in (col, fallback):
+        if name and name in df.columns:
+            return _atlas_map_unique(df[name], lambda x: str(x).strip())
+    return pd.Series('', index=df.index, dtype=object)
 
-    parallel_rows = []
-    for _, row in base_df.iterrows():
-        try:
-            if pd.isna(row['Από']) or pd.isna(row['Έως']):
-                continue
-
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
 
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
+def _atlas_interval_days(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """(days_val, έχει τιμή) ανά γραμμή όπως στους μηνιαίους βρόχους: Ημέρες + Έτη*300 + Μήνες*25.
 
-            days_val = 0
-            if 'Ημέρες' in row and pd.notna(row['Ημέρες']) and str(row['Ημέρες']).strip() != '':
-                d = clean_numeric_value(row['Ημέρες'])
-                if d is not None and d != 0:
-                    days_val += d
-
-            if 'Έτη' in row and pd.notna(row['Έτη']):
-                y = clean_numeric_value(row['Έτη'])
-                if y is not None and y != 0:
-                    days_val += y * 300
-
-            if 'Μήνες' in row and pd.notna(row['Μήνες']):
-                m = clean_numeric_value(row['Μήνες'])
-                if m is not None and m != 0:
-                    days_val += m * 25
-
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
+    Μηδενικές τιμές παραλείπονται· «έχει τιμή» = τουλάχιστον ένας μη μηδενικός όρος.
+    """
+    total = pd.Series(0.0, index=df.index)
+    touched = pd.Series(False, index=df.index)
+    for col, factor in (('Ημέρες', 1), ('Έτη', 300), ('Μήνες', 25)):
+        if col in df.columns:
+            values = typed_numeric(df, col)
+            nonzero = values != 0
+            total = total + (values * factor).where(nonzero, 0.0)
+            touched = touched | nonzero
+    return total, touched
 
-            num_months = len(months_list)
-            if num_months == 0:
-                continue
 
-            days_parts = distribute_days_to_months(days_val, num_months)
-
-            for i, m_dt in enumerate(months_list):
-                parallel_rows.append({
-                    'ΕΤΟΣ': m_dt.year,
-                    'Μήνας_Num': m_dt.month,
-                    'ΤΑΜΕΙΟ': str(row.get('Ταμείο', '')).strip(),
-                    'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': str(row.get('Τύπος Ασφάλισης', '')).strip(),
-                    'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': str(row.get('Κλάδος/Πακέτο Κάλυψης', '')).strip(),
-                    'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': str(row.get('Τύπος Αποδοχών', '')).strip(),
-                    'Ημέρες': days_parts[i]
-                })
-        except Exception:
-            continue
+def _atlas_interval_amount(df: pd.DataFrame, col: str, or_zero: bool = False) -> pd.Series:
+    """Ποσό ανά γραμμή όπως στους μηνιαίους βρόχους: 0 όταν το κείμενο έχει ΔΡΧ/DRX,
+    αλλιώς clean_numeric_value(exclude_drx=True). or_zero: -0.0 → 0.0 (`... or 0.0`)."""
+    if col not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    text = df[col].astype(str).str.upper()
+    drx = text.str.contains('ΔΡΧ', regex=False, na=False) | text.str.contains('DRX', regex=False, na=False)
+    values = typed_numeric(df, col, exclude_drx=True).mask(drx, 0.0)
+    return values.where(values != 0, 0.0) if or_zero else values
 
-    if not parallel_rows:
-        return []
 
-    p_c_df = pd.DataFrame(parallel_rows)
-
-    def is_oaee_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        is_oaee_tameio = 'OAEE' in t or 'ΟΑΕΕ' in t or 'TEBE' in t or 'ΤΕΒΕ' in t or 'TAE' in t or 'ΤΑΕ' in t
-        is_k = kl in ['K', 'Κ']
-        return is_oaee_tameio and is_k
-
-    def is_tsm_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        is_tsm_tameio = 'ΤΣΜΕΔΕ' in t or 'TSMEDE' in t
-        is_ks = kl in ['ΚΣ', 'ΠΚΣ', 'KS', 'PKS']
-        return is_tsm_tameio and is_ks
-
-    def is_oga_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        is_oga_tameio = 'ΟΓΑ' in t or 'OGA' in t
-        is_k = kl in ['K', 'Κ']
-        return is_oga_tameio and is_k
-
-    p_c_df['is_ika'] = p_c_df.apply(_is_ika_parallel_row, axis=1)
-    p_c_df['is_oaee'] = p_c_df.apply(is_oaee_match, axis=1)
-    p_c_df['is_tsm'] = p_c_df.apply(is_tsm_match, axis=1)
-    p_c_df['is_oga'] = p_c_df.apply(is_oga_match, axis=1)
-    p_c_df['is_tsay'] = p_c_df.apply(_is_tsay_parallel_row, axis=1)
-
-    month_groups = p_c_df.groupby(['ΕΤΟΣ', 'Μήνας_Num'])
-    valid_months = []
-    for (year, month), group in month_groups:
-        ika_days = group.loc[group['is_ika'], 'Ημέρες'].sum()
-        oaee_days = group.loc[group['is_oaee'], 'Ημέρες'].sum()
-        tsm_days = group.loc[group['is_tsm'], 'Ημέρες'].sum()
-        oga_days = group.loc[group['is_oga'], 'Ημέρες'].sum()
-        tsay_days = group.loc[group['is_tsay'], 'Ημέρες'].sum()
-
-        has_ika = ika_days > 0
-        has_oaee = oaee_days > 0
-        has_tsm = tsm_days > 0
-        has_oga = oga_days > 0
-        has_tsay = tsay_days > 0
-
-        if _parallel_until_2016_month_match(has_ika, has_oaee, has_tsm, has_oga, has_tsay):
-            if year <= 2016:
-                valid_months.append((year, month))
-
-    return valid_months
+def _atlas_signed_interval_values(df: pd.DataFrame, or_zero: bool = False, float_start: bool = False):
+    """(ημέρες, μικτές, εισφορές) ανά γραμμή· εγγραφές με αρνητικό ποσό (διαγραφή) → -|ημέρες|.
 
-def compute_parallel_months_2017(base_df: pd.DataFrame) -> list[tuple[int, int]]:
-    """Μήνες πιθανής παράλληλης απασχόλησης από 01/2017 και μετά.
-    Κριτήρια:
-    - ΙΚΑ (αποδοχές 01/16/99) + ΕΦΚΑ μη μισθωτή
-    - ΕΦΚΑ μισθωτή + ΕΦΚΑ μη μισθωτή
+    float_start: ο βρόχος ξεκινούσε από 0.0 (όχι 0), οπότε και οι μηδενικές ημέρες γίνονται -0.0.
     """
-    if base_df.empty or not all(col in base_df.columns for col in ['Από', 'Έως']):
-        return []
+    days, touched = _atlas_interval_days(df)
+    gross = _atlas_interval_amount(df, 'Μικτές αποδοχές', or_zero)
+    contrib = _atlas_interval_amount(df, 'Συνολικές εισφορές', or_zero)
+    negative = (gross < 0) | (contrib < 0)
+    if not float_start:
+        negative = negative & touched
+    return days.mask(negative, -days.abs()), gross, contrib
 
-    parallel_rows = []
-    for _, row in base_df.iterrows():
-        try:
-            if pd.isna(row['Από']) or pd.isna(row['Έως']):
-                continue
 
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
+def _atlas_aggregate_interval_flags(df: pd.DataFrame, start_dates, end_dates, row_months, pre2002_rule, post2002: bool) -> pd.Series:
+    """Σημαία «ενοποιημένο διάστημα» ανά γραμμή (κίτρινη επισήμανση).
 
-            days_val = 0
-            if 'Ημέρες' in row and pd.notna(row['Ημέρες']) and str(row['Ημέρες']).strip() != '':
-                d = clean_numeric_value(row['Ημέρες'])
-                if d is not None and d != 0:
-                    days_val += d
-            if 'Έτη' in row and pd.notna(row['Έτη']):
-                y = clean_numeric_value(row['Έτη'])
-                if y is not None and y != 0:
-                    days_val += y * 300
-            if 'Μήνες' in row and pd.notna(row['Μήνες']):
-                m = clean_numeric_value(row['Μήνες'])
-                if m is not None and m != 0:
-                    days_val += m * 25
-
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
+    Διαστήματα >1 μήνα που λήγουν από 01/01/2002 → post2002· όσα λήγουν νωρίτερα κρίνονται με
+    pre2002_rule(row, start_dt, end_dt, num_months) — μόνο εκεί χρειάζεται η ίδια η γραμμή.
+    """
+    cutoff = pd.Timestamp('2002-01-01')
+    flags = []
+    for pos, (start_dt, end_dt, n_months) in enumerate(zip(start_dates, end_dates, row_months)):
+        if n_months <= 1:
+            flags.append(False)
+        elif end_dt >= cutoff:
+            flags.append(post2002)
+        else:
+            flags.append(bool(pre2002_rule(df.iloc[pos], start_dt, end_dt, int(n_months))))
+    return pd.Series(flags, index=df.index, dtype=bool)
 
-            num_months = len(months_list)
-            if num_months == 0:
-                continue
-            days_parts = distribute_days_to_months(days_val, num_months)
-
-            for i, m_dt in enumerate(months_list):
-                parallel_rows.append({
-                    'ΕΤΟΣ': m_dt.year,
-                    'Μήνας_Num': m_dt.month,
-                    'ΤΑΜΕΙΟ': str(row.get('Ταμείο', '')).strip(),
-                    'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': str(row.get('Τύπος Ασφάλισης', '')).strip(),
-                    'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': str(row.get('Τύπος Αποδοχών', '')).strip(),
-                    'Ημέρες': days_parts[i]
-                })
-        except Exception:
-            continue
 
-    if not parallel_rows:
-        return []
+_PARALLEL_2016_FLAGS = ['is_ika', 'is_oaee', 'is_tsm', 'is_oga', 'is_tsay']
+_PARALLEL_2017_FLAGS = ['is_ika', 'is_efka_mis', 'is_efka_non']
 
-    p_df = pd.DataFrame(parallel_rows)
-
-    def _is_ika(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        et = str(row.get('ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', '')).strip()
-        is_ika_tameio = 'IKA' in t or 'ΙΚΑ' in t
-        is_misthoti = 'ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type
-        is_et_ika = et in ['01', '1', '16', '99']
-        return (is_ika_tameio or is_misthoti) and is_et_ika
-
-    def _is_efka_misthoti(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        is_efka = 'ΕΦΚΑ' in t or 'EFKA' in t
-        is_misthoti = 'ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type
-        return is_efka and is_misthoti
-
-    def _is_efka_non_misthoti(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        is_efka = 'ΕΦΚΑ' in t or 'EFKA' in t
-        is_non_misthoti = ('ΜΗ' in i_type and 'ΜΙΣΘΩΤΗ' in i_type) or ('NON' in i_type and 'SAL' in i_type)
-        return is_efka and is_non_misthoti
-
-    p_df['is_ika'] = p_df.apply(_is_ika, axis=1)
-    p_df['is_efka_mis'] = p_df.apply(_is_efka_misthoti, axis=1)
-    p_df['is_efka_non'] = p_df.apply(_is_efka_non_misthoti, axis=1)
-
-    valid_months = []
-    month_groups = p_df.groupby(['ΕΤΟΣ', 'Μήνας_Num'])
-    for (year, month), group in month_groups:
-        if year < 2017:
-            continue
-        ika_days = group.loc[group['is_ika'], 'Ημέρες'].sum()
-        efka_mis_days = group.loc[group['is_efka_mis'], 'Ημέρες'].sum()
-        efka_non_days = group.loc[group['is_efka_non'], 'Ημέρες'].sum()
 
-        has_ika_non = ika_days > 0 and efka_non_days > 0
-        has_efka_mix = efka_mis_days > 0 and efka_non_days > 0
-        if has_ika_non or has_efka_mix:
-            valid_months.append((year, month))
+def _atlas_month_flag_sums(month_index, days, flags: pd.DataFrame, rows=None) -> pd.DataFrame:
+    """Ημέρες ανά μήνα (index: έτος*12 + μήνας-1, πυκνός άξονας) και κατηγορία (στήλες του flags).
 
-    return valid_months
+    Ίδια με group.loc[group[flag], 'Ημέρες'].sum() ανά (ΕΤΟΣ, Μήνας_Num), με ένα np.bincount ανά κατηγορία·
+    month_index / days: ndarray ανά μηνιαία γραμμή, rows: προαιρετική μάσκα μηνιαίων γραμμών.
+    """
+    flag_values = flags.to_numpy(dtype=bool)
+    if rows is not None:
+        month_index, days, flag_values = month_index[rows], days[rows], flag_values[rows]
+    months, sums = month_category_sums(month_index, days, flag_values)
+    return pd.DataFrame(sums, index=pd.Index(months, name='month_index'), columns=list(flags.columns))
 
 
-def _sum_parallel_overlap_days_until_2016(month_groups, valid_months: list[tuple[int, int]]) -> int:
-    total = 0
-    for (year, month) in valid_months:
-        try:
-            g = month_groups.get_group((year, month))
-        except KeyError:
-            continue
-        ika_days = g.loc[g['is_ika'], 'Ημέρες'].sum()
-        oaee_days = g.loc[g['is_oaee'], 'Ημέρες'].sum()
-        tsm_days = g.loc[g['is_tsm'], 'Ημέρες'].sum()
-        oga_days = g.loc[g['is_oga'], 'Ημέρες'].sum()
-        tsay_days = g.loc[g['is_tsay'], 'Ημέρες'].sum()
-        ika_cap = min(ika_days, 25)
-        oaee_cap = min(oaee_days, 25)
-        tsm_cap = min(tsm_days, 25)
-        oga_cap = min(oga_days, 25)
-        tsay_cap = min(tsay_days, 25)
-        candidates = []
-        if ika_cap > 0 and oaee_cap > 0:
-            candidates.append(max(ika_cap + oaee_cap - 25, 0))
-        if ika_cap > 0 and tsay_cap > 0:
-            candidates.append(max(ika_cap + tsay_cap - 25, 0))
-        if oaee_cap > 0 and tsm_cap > 0:
-            candidates.append(max(oaee_cap + tsm_cap - 25, 0))
-        if oga_cap > 0 and ika_cap > 0:
-            candidates.append(max(oga_cap + ika_cap - 25, 0))
-        if oga_cap > 0 and oaee_cap > 0:
-            candidates.append(max(oga_cap + oaee_cap - 25, 0))
-        total += max(candidates) if candidates else 0
-    return int(round(total))
-
-
-def _sum_parallel_overlap_days_2017(month_groups, valid_months: list[tuple[int, int]]) -> int:
-    total = 0
-    for (year, month) in valid_months:
-        try:
-            g = month_groups.get_group((year, month))
-        except KeyError:
-            continue
-        ika_cap = min(g.loc[g['is_ika'], 'Ημέρες'].sum(), 25)
-        efka_mis_cap = min(g.loc[g['is_efka_mis'], 'Ημέρες'].sum(), 25)
-        efka_non_cap = min(g.loc[g['is_efka_non'], 'Ημέρες'].sum(), 25)
-        cands = []
-        if ika_cap > 0 and efka_non_cap > 0:
-            cands.append(max(ika_cap + efka_non_cap - 25, 0))
-        if efka_mis_cap > 0 and efka_non_cap > 0:
-            cands.append(max(efka_mis_cap + efka_non_cap - 25, 0))
-        total += max(cands) if cands else 0
-    return int(round(total))
-
-
-def _parallel_month_groups_until_2016(base_df: pd.DataFrame):
-    """Μηνιαίο DataFrame + groupby για παράλληλη ασφάλιση έως 2016."""
-    if base_df.empty or not all(col in base_df.columns for col in ['Από', 'Έως']):
-        return None, None
-    work_df = base_df
-    if 'Κλάδος/Πακέτο Κάλυψης' in work_df.columns:
-        pkg = work_df['Κλάδος/Πακέτο Κάλυψης'].astype(str).str.strip()
-        work_df = work_df[~pkg.isin(EXCLUDED_PACKAGES_PARALLEL_UNTIL_2016)].copy()
-    if work_df.empty:
-        return None, None
+def _atlas_parallel_month_sums(p_df: pd.DataFrame, flag_cols: list[str]) -> pd.DataFrame:
+    """_atlas_month_flag_sums για μηνιαίο DataFrame με στήλες ΕΤΟΣ, Μήνας_Num, Ημέρες και flag_cols."""
+    month_index = p_df['ΕΤΟΣ'].to_numpy(dtype='int64') * 12 + p_df['Μήνας_Num'].to_numpy(dtype='int64') - 1
+    return _atlas_month_flag_sums(month_index, p_df['Ημέρες'].to_numpy(dtype=float), p_df[flag_cols])
 
-    parallel_rows = []
-    for _, row in work_df.iterrows():
-        try:
-            if pd.isna(row['Από']) or pd.isna(row['Έως']):
-                continue
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
-            days_val = 0
-            if 'Ημέρες' in row and pd.notna(row['Ημέρες']) and str(row['Ημέρες']).strip() != '':
-                d = clean_numeric_value(row['Ημέρες'])
-                if d is not None and d != 0:
-                    days_val += d
-            if 'Έτη' in row and pd.notna(row['Έτη']):
-                y = clean_numeric_value(row['Έτη'])
-                if y is not None and y != 0:
-                    days_val += y * 300
-            if 'Μήνες' in row and pd.notna(row['Μήνες']):
-                m = clean_numeric_value(row['Μήνες'])
-                if m is not None and m != 0:
-                    days_val += m * 25
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-            if not months_list:
-                continue
-            days_parts = distribute_days_to_months(days_val, len(months_list))
-            for i, m_dt in enumerate(months_list):
-                parallel_rows.append({
-                    'ΕΤΟΣ': m_dt.year,
-                    'Μήνας_Num': m_dt.month,
-                    'ΤΑΜΕΙΟ': str(row.get('Ταμείο', '')).strip(),
-                    'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': str(row.get('Τύπος Ασφάλισης', '')).strip(),
-                    'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': str(row.get('Κλάδος/Πακέτο Κάλυψης', '')).strip(),
-                    'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': str(row.get('Τύπος Αποδοχών', '')).strip(),
-                    'Ημέρες': days_parts[i],
-                })
-        except Exception:
-            continue
-    if not parallel_rows:
-        return None, None
 
-    p_c_df = pd.DataFrame(parallel_rows)
+def _atlas_month_tuples(month_index) -> list[tuple[int, int]]:
+    return [(int(m) // 12, int(m) % 12 + 1) for m in month_index]
 
-    def is_oaee_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        return ('OAEE' in t or 'ΟΑΕΕ' in t or 'TEBE' in t or 'ΤΕΒΕ' in t or 'TAE' in t or 'ΤΑΕ' in t) and kl in ['K', 'Κ']
 
-    def is_tsm_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        return ('ΤΣΜΕΔΕ' in t or 'TSMEDE' in t) and kl in ['ΚΣ', 'ΠΚΣ', 'KS', 'PKS']
+def _parallel_until_2016_valid_months(sums: pd.DataFrame) -> pd.Series:
+    """Μήνες (≤2016) παράλληλης ασφάλισης: συνύπαρξη ημερών στα ζεύγη του _parallel_until_2016_month_match."""
+    has = sums > 0
+    match = _parallel_until_2016_month_match(has['is_ika'], has['is_oaee'], has['is_tsm'], has['is_oga'], has['is_tsay'])
+    return match & (sums.index // 12 <= 2016)
 
-    def is_oga_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        return ('ΟΓΑ' in t or 'OGA' in t) and kl in ['K', 'Κ']
 
-    p_c_df['is_ika'] = p_c_df.apply(_is_ika_parallel_row, axis=1)
-    p_c_df['is_oaee'] = p_c_df.apply(is_oaee_match, axis=1)
-    p_c_df['is_tsm'] = p_c_df.apply(is_tsm_match, axis=1)
-    p_c_df['is_oga'] = p_c_df.apply(is_oga_match, axis=1)
-    p_c_df['is_tsay'] = p_c_df.apply(_is_tsay_parallel_row, axis=1)
-    return p_c_df, p_c_df.groupby(['ΕΤΟΣ', 'Μήνας_Num'])
+def _parallel_2017_valid_months(sums: pd.DataFrame) -> pd.Series:
+    """Μήνες (2017+) με ΙΚΑ & ΕΦΚΑ μη μισθωτή ή ΕΦΚΑ μισθωτή & ΕΦΚΑ μη μισθωτή."""
+    has = sums > 0
+    match = (has['is_ika'] & has['is_efka_non']) | (has['is_efka_mis'] & has['is_efka_non'])
+    return match & (sums.index // 12 >= 2017)
 
 
-def _parallel_month_groups_2017(base_df: pd.DataFrame):
-    """Μηνιαίο DataFrame + groupby για παράλληλη απασχόληση 2017+."""
-    if base_df.empty or not all(col in base_df.columns for col in ['Από', 'Έως']):
-        return None, None
+def compute_parallel_months(base_df: pd.DataFrame) -> list[tuple[int, int]]:
+    # Έως 2016: μην μετράνε πακέτα 127, 131, 132, 133, 026 (βλ. analyze_parallel)
+    return analyze_parallel(base_df).months_2016
 
-    parallel_rows = []
-    for _, row in base_df.iterrows():
-        try:
-            if pd.isna(row['Από']) or pd.isna(row['Έως']):
-                continue
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
-            days_val = 0
-            if 'Ημέρες' in row and pd.notna(row['Ημέρες']) and str(row['Ημέρες']).strip() != '':
-                d = clean_numeric_value(row['Ημέρες'])
-                if d is not None and d != 0:
-                    days_val += d
-            if 'Έτη' in row and pd.notna(row['Έτη']):
-                y = clean_numeric_value(row['Έτη'])
-                if y is not None and y != 0:
-                    days_val += y * 300
-            if 'Μήνες' in row and pd.notna(row['Μήνες']):
-                m = clean_numeric_value(row['Μήνες'])
-                if m is not None and m != 0:
-                    days_val += m * 25
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-            if not months_list:
-                continue
-            days_parts = distribute_days_to_months(days_val, len(months_list))
-            for i, m_dt in enumerate(months_list):
-                parallel_rows.append({
-                    'ΕΤΟΣ': m_dt.year,
-                    'Μήνας_Num': m_dt.month,
-                    'ΤΑΜΕΙΟ': str(row.get('Ταμείο', '')).strip(),
-                    'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': str(row.get('Τύπος Ασφάλισης', '')).strip(),
-                    'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': str(row.get('Τύπος Αποδοχών', '')).strip(),
-                    'Ημέρες': days_parts[i],
-                })
-        except Exception:
-            continue
-    if not parallel_rows:
-        return None, None
+def compute_parallel_months_2017(base_df: pd.DataFrame) -> list[tuple[int, int]]:
+    """Μήνες πιθανής παράλληλης απασχόλησης από 01/2017 και μετά.
+    Κριτήρια:
+    - ΙΚΑ (αποδοχές 01/16/99) + ΕΦΚΑ μη μισθωτή
+    - ΕΦΚΑ μισθωτή + ΕΦΚΑ μη μισθωτή
+    """
+    return analyze_parallel(base_df).months_2017
 
-    p_df = pd.DataFrame(parallel_rows)
 
-    def _is_ika(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        et = str(row.get('ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', '')).strip()
-        return (('IKA' in t or 'ΙΚΑ' in t) or ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)) and et in ['01', '1', '16', '99']
+def _atlas_parallel_overlap_days(sums: pd.DataFrame, pairs) -> int:
+    """Σύνολο παράλληλων ημερών στους μήνες του sums: ανά μήνα το μέγιστο max(a + b - 25, 0)
+    των ζευγών με ημέρες και στις δύο πλευρές (πλαφόν 25 ανά κατηγορία), 0 χωρίς ζεύγος."""
+    if sums.empty:
+        return 0
+    caps = sums.clip(upper=25)
+    candidates = pd.concat(
+        [(caps[a] + caps[b] - 25).clip(lower=0).where((caps[a] > 0) & (caps[b] > 0), 0) for a, b in pairs], axis=1
+    )
+    return int(round(sum(candidates.max(axis=1).tolist())))
+
 
-    def _is_efka_misthoti(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        return ('ΕΦΚΑ' in t or 'EFKA' in t) and ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)
+def _sum_parallel_overlap_days_until_2016(sums: pd.DataFrame) -> int:
+    """sums: _atlas_parallel_month_sums(..., _PARALLEL_2016_FLAGS) μόνο για τους έγκυρους μήνες."""
+    return _atlas_parallel_overlap_days(sums, [
+        ('is_ika', 'is_oaee'), ('is_ika', 'is_tsay'), ('is_oaee', 'is_tsm'), ('is_oga', 'is_ika'), ('is_oga', 'is_oaee'),
+    ])
 
-    def _is_efka_non_misthoti(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        return ('ΕΦΚΑ' in t or 'EFKA' in t) and (('ΜΗ' in i_type and 'ΜΙΣΘΩΤΗ' in i_type) or ('NON' in i_type and 'SAL' in i_type))
 
-    p_df['is_ika'] = p_df.apply(_is_ika, axis=1)
-    p_df['is_efka_mis'] = p_df.apply(_is_efka_misthoti, axis=1)
-    p_df['is_efka_non'] = p_df.apply(_is_efka_non_misthoti, axis=1)
-    return p_df, p_df.groupby(['ΕΤΟΣ', 'Μήνας_Num'])
+def _sum_parallel_overlap_days_2017(sums: pd.DataFrame) -> int:
+    """sums: _atlas_parallel_month_sums(..., _PARALLEL_2017_FLAGS) μόνο για τους έγκυρους μήνες."""
+    return _atlas_parallel_overlap_days(sums, [('is_ika', 'is_efka_non'), ('is_efka_mis', 'is_efka_non')])
 
 
 def compute_parallel_summary_metrics(base_df: pd.DataFrame) -> tuple[int, int]:
     """Επιστρέφει (μήνες παράλληλης, ημέρες παράλληλης) έως 2016."""
-    valid_months = compute_parallel_months(base_df)
-    if not valid_months:
-        return 0, 0
-    _, month_groups = _parallel_month_groups_until_2016(base_df)
-    if month_groups is None:
-        return len(valid_months), 0
-    return len(valid_months), _sum_parallel_overlap_days_until_2016(month_groups, valid_months)
+    result = analyze_parallel(base_df)
+    return len(result.months_2016), result.overlap_days_2016
 
 
 def compute_parallel_2017_summary_metrics(base_df: pd.DataFrame) -> tuple[int, int]:
     """Επιστρέφει (μήνες παράλληλης 2017+, ημέρες παράλληλης 2017+)."""
-    valid_months = compute_parallel_months_2017(base_df)
-    if not valid_months:
-        return 0, 0
-    _, month_groups = _parallel_month_groups_2017(base_df)
-    if month_groups is None:
-        return len(valid_months), 0
-    return len(valid_months), _sum_parallel_overlap_days_2017(month_groups, valid_months)
+    result = analyze_parallel(base_df)
+    return len(result.months_2017), result.overlap_days_2017
 
 
 EXCLUDED_PACKAGES_PARALLEL = {'Α', 'Λ', 'Υ', 'Ο', 'Χ', '026', '899'}
@@ -3037,6 +2527,46 @@ def _is_ika_parallel_row(row) -> bool:
     return False
 
 
+_PARALLEL_FLAG_KEYS = ['ΤΑΜΕΙΟ', 'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', 'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', 'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ']
+
+
+def _atlas_key_flags(frame: pd.DataFrame, predicates: dict, keys: list[str] = _PARALLEL_FLAG_KEYS) -> pd.DataFrame:
+    """Στήλες bool ανά γραμμή από κανόνες row → bool που διαβάζουν μόνο τις στήλες keys.
+
+    Ίδιο αποτέλεσμα με frame.apply(κανόνας, axis=1): κάθε κανόνας αξιολογείται μία φορά ανά
+    διακριτό συνδυασμό (Ταμείο, Τύπος Ασφάλισης, Πακέτο, Τύπος Αποδοχών — συνήθως <30) και
+    απλώνεται στις γραμμές με τον κωδικό συνδυασμού της καθεμίας.
+    """
+    cols = [c for c in keys if c in frame.columns]
+    if frame.empty:
+        return pd.DataFrame({name: pd.Series(False, index=frame.index) for name in predicates})
+    if not cols:
+        return pd.DataFrame({name: bool(pred(pd.Series(dtype=object))) for name, pred in predicates.items()}, index=frame.index)
+    codes = frame.groupby(cols, sort=False, dropna=False).ngroup().to_numpy()
+    combos = frame[cols].drop_duplicates()  # ίδια σειρά με το ngroup(sort=False): πρώτη εμφάνιση
+    return pd.DataFrame(
+        {name: combos.apply(pred, axis=1).astype(bool).to_numpy()[codes] for name, pred in predicates.items()},
+        index=frame.index,
+    )
+
+
+# _is_ika_parallel_row για ένα έτος πριν και ένα μετά το 2002 (το ΕΤΟΣ μετρά μόνο ως «< 2002»)
+_IKA_PARALLEL_BY_ERA = {
+    'pre2002': lambda row: _is_ika_parallel_row({**row.to_dict(), 'ΕΤΟΣ': 2001}),
+    'post2002': lambda row: _is_ika_parallel_row({**row.to_dict(), 'ΕΤΟΣ': 2002}),
+}
+
+
+def _atlas_ika_parallel_flags(frame: pd.DataFrame) -> pd.Series:
+    """_is_ika_parallel_row ανά γραμμή· ο κανόνας αξιολογείται ανά συνδυασμό για ένα έτος πριν
+    και ένα μετά το 2002 (_IKA_PARALLEL_BY_ERA)."""
+    flags = _atlas_key_flags(frame, _IKA_PARALLEL_BY_ERA)
+    if 'ΕΤΟΣ' not in frame.columns:
+        return flags['post2002'].rename(None)
+    pre = pd.to_numeric(frame['ΕΤΟΣ'], errors='coerce') < 2002
+    return flags['pre2002'].where(pre, flags['post2002']).rename(None)
+
+
 def _is_tsay_fund_and_package(row) -> bool:
     t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
     kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
@@ -3063,6 +2593,55 @@ def _is_tsay_parallel_row(row) -> bool:
     return _is_tsay_misthoti_parallel_row(row) or _is_tsay_non_misthoti_parallel_row(row)
 
 
+def _is_oaee_parallel_row(row) -> bool:
+    t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
+    kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
+    return ('OAEE' in t or 'ΟΑΕΕ' in t or 'TEBE' in t or 'ΤΕΒΕ' in t or 'TAE' in t or 'ΤΑΕ' in t) and kl in ['K', 'Κ']
+
+
+def _is_tsm_parallel_row(row) -> bool:
+    t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
+    kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
+    return ('ΤΣΜΕΔΕ' in t or 'TSMEDE' in t) and kl in ['ΚΣ', 'ΠΚΣ', 'KS', 'PKS']
+
+
+def _is_oga_parallel_row(row) -> bool:
+    t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
+    kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
+    return ('ΟΓΑ' in t or 'OGA' in t) and kl in ['K', 'Κ']
+
+
+def _is_ika_parallel_2017_row(row) -> bool:
+    """ΙΚΑ (ή μισθωτή) με αποδοχές 01/16/99 — παράλληλη απασχόληση 2017+ και πολλαπλή απασχόληση."""
+    t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
+    i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
+    et = str(row.get('ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', '')).strip()
+    return (('IKA' in t or 'ΙΚΑ' in t) or ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)) and et in ['01', '1', '16', '99']
+
+
+def _is_efka_misthoti_row(row) -> bool:
+    t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
+    i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
+    return ('ΕΦΚΑ' in t or 'EFKA' in t) and ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)
+
+
+def _is_efka_non_misthoti_row(row) -> bool:
+    t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
+    i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
+    return ('ΕΦΚΑ' in t or 'EFKA' in t) and (('ΜΗ' in i_type and 'ΜΙΣΘΩΤΗ' in i_type) or ('NON' in i_type and 'SAL' in i_type))
+
+
+# Κανόνες κατηγοριών ανά γραμμή (εκτός από το ΙΚΑ ≤2016, βλ. _IKA_PARALLEL_BY_ERA)
+_PARALLEL_2016_RULES = {
+    'is_oaee': _is_oaee_parallel_row, 'is_tsm': _is_tsm_parallel_row, 'is_oga': _is_oga_parallel_row,
+    'is_tsay': _is_tsay_parallel_row, 'is_tsay_mis': _is_tsay_misthoti_parallel_row,
+    'is_tsay_non': _is_tsay_non_misthoti_parallel_row,
+}
+_PARALLEL_2017_RULES = {
+    'is_ika': _is_ika_parallel_2017_row, 'is_efka_mis': _is_efka_misthoti_row, 'is_efka_non': _is_efka_non_misthoti_row,
+}
+
+
 def _parallel_until_2016_month_match(
     has_ika: bool,
     has_oaee: bool,
@@ -3070,12 +2649,13 @@ def _parallel_until_2016_month_match(
     has_oga: bool,
     has_tsay: bool,
 ) -> bool:
+    # & / | ώστε να δουλεύει και για στήλες bool (όλοι οι μήνες μαζί)
     return (
-        (has_ika and has_oaee)
-        or (has_ika and has_tsm)
-        or (has_ika and has_tsay)
-        or (has_oaee and has_tsm)
-        or (has_oga and (has_ika or has_oaee))
+        (has_ika & has_oaee)
+        | (has_ika & has_tsm)
+        | (has_ika & has_tsay)
+        | (has_oaee & has_tsm)
+        | (has_oga & (has_ika | has_oaee))
     )
 
 
@@ -3131,88 +2711,73 @@ def _compute_is_aggregate_interval(row, start_dt, end_dt, num_months: int) -> bo
     return duration_days > 31 and not expected
 
 
-def _build_monthly_rows_for_parallel(df: pd.DataFrame, description_map: dict | None = None) -> list[dict]:
-    """Κοινή λογική ανάλυσης ανά μήνα για Παράλληλη Ασφάλιση / Απασχόληση.
-    Εξαιρούνται τα πακέτα Α, Λ, Υ, Ο, Χ, 026, 899 (όπως στην καταμέτρηση).
+def _atlas_monthly_count_frame(
+    df: pd.DataFrame,
+    description_map: dict | None = None,
+    *,
+    or_zero: bool = False,
+    float_start: bool = False,
+    aggregate_rule=None,
+    aggregate_post2002: bool = True,
+    package_fallback: str | None = None,
+    skip_packages=None,
+    with_foreas: bool = False,
+) -> pd.DataFrame:
+    """Μηνιαίες γραμμές καταμέτρησης (ΕΤΟΣ, ΤΑΜΕΙΟ, ..., Μήνας_Num, Ημέρες, Μικτές_Part, Εισφορές_Part).
+
+    Κάθε διάστημα Από–Έως αναπτύσσεται με το explode_months (ημέρες όπως distribute_days_to_months,
+    ποσά ισόποσα ανά μήνα). or_zero / float_start: όπως τα `... or 0.0` / `days_val = 0.0` των βρόχων,
+    aggregate_rule: στήλη Is_Aggregate (βλ. _atlas_aggregate_interval_flags), skip_packages: πακέτα εκτός.
     """
-    if not df.empty and 'Κλάδος/Πακέτο Κάλυψης' in df.columns:
-        pkg = df['Κλάδος/Πακέτο Κάλυψης'].astype(str).str.strip()
-        df = df[~pkg.isin(EXCLUDED_PACKAGES_PARALLEL)].copy()
-    rows: list[dict] = []
-    for _, row in df.iterrows():
-        try:
-            if pd.isna(row.get('Από')) or pd.isna(row.get('Έως')):
-                continue
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
+    start_dates, end_dates = interval_dates(df)
+    klados = _atlas_row_text(df, 'Κλάδος/Πακέτο Κάλυψης', package_fallback)
+    keep = ~klados.isin(skip_packages) if skip_packages else None
+    days, gross, contrib = _atlas_signed_interval_values(df, or_zero=or_zero, float_start=float_start)
+    parts = explode_months(start_dates, end_dates, days=days, gross=gross, contrib=contrib, keep=keep)
+    if not len(parts):
+        return pd.DataFrame()
+    return _atlas_monthly_frame_from_parts(
+        df, parts, start_dates, end_dates, klados, description_map,
+        aggregate_rule=aggregate_rule, aggregate_post2002=aggregate_post2002, with_foreas=with_foreas,
+    )
 
-            days_val = 0.0
-            if 'Ημέρες' in row and pd.notna(row.get('Ημέρες')) and str(row.get('Ημέρες', '')).strip() != '':
-                d = clean_numeric_value(row.get('Ημέρες'))
-                if d is not None and d != 0:
-                    days_val += float(d)
-            if 'Έτη' in row and pd.notna(row.get('Έτη')):
-                y = clean_numeric_value(row.get('Έτη'))
-                if y is not None and y != 0:
-                    days_val += float(y) * 300
-            if 'Μήνες' in row and pd.notna(row.get('Μήνες')):
-                m = clean_numeric_value(row.get('Μήνες'))
-                if m is not None and m != 0:
-                    days_val += float(m) * 25
-
-            raw_gross = str(row.get('Μικτές αποδοχές', ''))
-            gross_val = 0.0 if ('ΔΡΧ' in raw_gross.upper() or 'DRX' in raw_gross.upper()) else (clean_numeric_value(raw_gross, exclude_drx=True) or 0.0)
-            raw_contrib = str(row.get('Συνολικές εισφορές', ''))
-            contrib_val = 0.0 if ('ΔΡΧ' in raw_contrib.upper() or 'DRX' in raw_contrib.upper()) else (clean_numeric_value(raw_contrib, exclude_drx=True) or 0.0)
-            sign = get_negative_amount_sign(gross_val, contrib_val)
-            if sign == -1:
-                days_val = -abs(days_val)
-
-            tameio = str(row.get('Ταμείο', '')).strip()
-            insurance_type = str(row.get('Τύπος Ασφάλισης', '')).strip()
-            employer = str(row.get('Α-Μ εργοδότη', '')).strip()
-            klados = str(row.get('Κλάδος/Πακέτο Κάλυψης', '')).strip()
-            klados_desc = description_map.get(klados, '') if isinstance(description_map, dict) else ''
-            earnings_type = str(row.get('Τύπος Αποδοχών', '')).strip()
-
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-            num_months = len(months_list)
-            if num_months == 0:
-                continue
 
-            days_parts = distribute_days_to_months(days_val, num_months)
-            gross_per_month = gross_val / num_months
-            contrib_per_month = contrib_val / num_months
-            is_aggregate = _compute_is_aggregate_interval(row, start_dt, end_dt, num_months)
-
-            for i, m_dt in enumerate(months_list):
-                rows.append({
-                    'ΕΤΟΣ': m_dt.year,
-                    'ΤΑΜΕΙΟ': tameio,
-                    'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': insurance_type,
-                    'ΕΡΓΟΔΟΤΗΣ': employer,
-                    'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': klados,
-                    'ΠΕΡΙΓΡΑΦΗ': klados_desc,
-                    'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': earnings_type,
-                    'Μήνας_Num': m_dt.month,
-                    'Ημέρες': days_parts[i],
-                    'Μικτές_Part': gross_per_month,
-                    'Εισφορές_Part': contrib_per_month,
-                    'Is_Aggregate': is_aggregate,
-                })
-        except Exception:
-            continue
-    return rows
+def _atlas_monthly_frame_from_parts(
+    df: pd.DataFrame,
+    parts,
+    start_dates,
+    end_dates,
+    klados: pd.Series,
+    description_map: dict | None = None,
+    *,
+    aggregate_rule=None,
+    aggregate_post2002: bool = True,
+    with_foreas: bool = False,
+) -> pd.DataFrame:
+    """Στήλες του _atlas_monthly_count_frame από έτοιμη ανάπτυξη parts (MonthlyParts με days/gross/contrib)."""
+    desc_map = description_map if isinstance(description_map, dict) else {}
+    columns = {
+        'ΕΤΟΣ': parts.year,
+        'ΤΑΜΕΙΟ': parts.take(_atlas_row_text(df, 'Ταμείο')),
+    }
+    if with_foreas:
+        columns['ΦΟΡΕΑΣ'] = parts.take(_atlas_row_text(df, 'Φορέας'))
+    columns.update({
+        'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': parts.take(_atlas_row_text(df, 'Τύπος Ασφάλισης')),
+        'ΕΡΓΟΔΟΤΗΣ': parts.take(_atlas_row_text(df, 'Α-Μ εργοδότη')),
+        'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': parts.take(klados),
+        'ΠΕΡΙΓΡΑΦΗ': parts.take([desc_map.get(k, '') for k in klados]),
+        'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': parts.take(_atlas_row_text(df, 'Τύπος Αποδοχών')),
+        'Μήνας_Num': parts.month,
+        'Ημέρες': parts.days,
+        'Μικτές_Part': parts.gross,
+        'Εισφορές_Part': parts.contrib,
+    })
+    if aggregate_rule is not None:
+        columns['Is_Aggregate'] = parts.take(_atlas_aggregate_interval_flags(
+            df, start_dates, end_dates, parts.row_months, aggregate_rule, post2002=aggregate_post2002
+        ))
+    return pd.DataFrame(columns)
 
 
 _PARALLEL_HEADER_RENAME = {
@@ -3230,11 +2795,10 @@ def _parallel_agg_style_rows(
 ) -> list[dict[str, str]]:
     style_rows: list[dict[str, str]] = []
     bold_cols = ['Έτος', 'Ταμείο', 'Τύπος Ασφάλισης', 'Σύνολο']
+    # Στήλες μηνών μία φορά (όχι flag_merge.iloc[i] ανά γραμμή)
+    flagged = [(mc, [bool(v) for v in flag_merge[mc].tolist()]) for mc in month_cols if mc in flag_merge.columns]
     for i in range(len(out)):
-        rs: dict[str, str] = {}
-        for mc in month_cols:
-            if mc in flag_merge.columns and bool(flag_merge.iloc[i].get(mc, False)):
-                rs[mc] = 'background-color:#fff9c4;color:#000;'
+        rs: dict[str, str] = {mc: 'background-color:#fff9c4;color:#000;' for mc, flags in flagged if flags[i]}
         for bc in bold_cols:
             rs.setdefault(bc, '')
             rs[bc] += 'font-weight:700;'
@@ -3290,156 +2854,170 @@ def _pivot_parallel_df(
 
     for c in renamed_m_cols + ['Σύνολο']:
         if c in out.columns:
-            out[c] = out[c].apply(lambda x: format_number_greek(x, decimals=0) if pd.notna(x) and x != 0 else '')
+            out[c] = _atlas_map_unique(out[c], lambda x: _format_number_greek_cached(x, decimals=0) if pd.notna(x) and x != 0 else '')
     for c in ['Μικτές Αποδοχές', 'Συνολικές Εισφορές']:
         if c in out.columns:
-            out[c] = out[c].apply(format_currency)
+            out[c] = format_currency_series(out[c])
 
     if with_styles:
         return out, style_rows
     return out
 
 
-def build_parallel_print_df(
-    df: pd.DataFrame,
-    description_map: dict | None = None,
-    with_styles: bool = False,
-) -> pd.DataFrame | tuple[pd.DataFrame, list[dict[str, str]]] | None:
-    """Παράγει το DataFrame Παράλληλης Ασφάλισης (≤2016) έτοιμο για εκτύπωση."""
-    if df.empty or not all(c in df.columns for c in ['Από', 'Έως']):
-        return None
+_PARALLEL_MONTH_MAP = {1: 'ΙΑΝ', 2: 'ΦΕΒ', 3: 'ΜΑΡ', 4: 'ΑΠΡ', 5: 'ΜΑΙ', 6: 'ΙΟΥΝ', 7: 'ΙΟΥΛ', 8: 'ΑΥΓ', 9: 'ΣΕΠ', 10: 'ΟΚΤ', 11: 'ΝΟΕ', 12: 'ΔΕΚ'}
 
-    monthly_rows = _build_monthly_rows_for_parallel(df, description_map)
-    if not monthly_rows:
-        return None
+# Τιμές εργοδότη που δεν μετρούν στην πολλαπλή απασχόληση
+_MULTI_EMPTY_EMPLOYER = ['', 'nan', 'NaN', 'None']
 
-    p_df = pd.DataFrame(monthly_rows)
-    # Έως 2016: μην υπολογίζονται πακέτα 127, 131, 132, 133, 026 ακόμα και με τύπο αποδοχών 01 κτλ με ημέρες
-    if 'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ' in p_df.columns:
-        pkg = p_df['ΚΛΑΔΟΣ/ΠΑΚΕΤΟ'].astype(str).str.strip()
-        p_df = p_df[~pkg.isin(EXCLUDED_PACKAGES_PARALLEL_UNTIL_2016)].copy()
-    if p_df.empty:
-        return None
 
-    p_df['ΕΤΟΣ'] = p_df['ΕΤΟΣ'].astype(int)
-    p_df['Μήνας_Num'] = p_df['Μήνας_Num'].astype(int)
-
-    def _is_oaee_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        return ('OAEE' in t or 'ΟΑΕΕ' in t or 'TEBE' in t or 'ΤΕΒΕ' in t or 'TAE' in t or 'ΤΑΕ' in t) and kl in ['K', 'Κ']
-
-    def _is_tsm_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        return ('ΤΣΜΕΔΕ' in t or 'TSMEDE' in t) and kl in ['ΚΣ', 'ΠΚΣ', 'KS', 'PKS']
-
-    def _is_oga_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        kl = str(row.get('ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', '')).strip().upper()
-        return ('ΟΓΑ' in t or 'OGA' in t) and kl in ['K', 'Κ']
-
-    def _is_ika_general(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        return ('IKA' in t or 'ΙΚΑ' in t) or ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)
-
-    p_df['is_ika'] = p_df.apply(_is_ika_parallel_row, axis=1)
-    p_df['is_oaee'] = p_df.apply(_is_oaee_match, axis=1)
-    p_df['is_tsm'] = p_df.apply(_is_tsm_match, axis=1)
-    p_df['is_oga'] = p_df.apply(_is_oga_match, axis=1)
-    p_df['is_tsay'] = p_df.apply(_is_tsay_parallel_row, axis=1)
-    p_df['is_ika_general'] = p_df.apply(_is_ika_general, axis=1)
-
-    month_groups = p_df.groupby(['ΕΤΟΣ', 'Μήνας_Num'])
-    valid_months = []
-    for (year, month), group in month_groups:
-        if year > 2016:
-            continue
-        ika_d = group.loc[group['is_ika'], 'Ημέρες'].sum()
-        oaee_d = min(group.loc[group['is_oaee'], 'Ημέρες'].sum(), 25)
-        tsm_d = min(group.loc[group['is_tsm'], 'Ημέρες'].sum(), 25)
-        oga_d = min(group.loc[group['is_oga'], 'Ημέρες'].sum(), 25)
-        tsay_d = min(group.loc[group['is_tsay'], 'Ημέρες'].sum(), 25)
-        if _parallel_until_2016_month_match(ika_d > 0, oaee_d > 0, tsm_d > 0, oga_d > 0, tsay_d > 0):
-            valid_months.append((year, month))
-
-    if not valid_months:
-        return None
+class ParallelAnalysis:
+    """Αποτέλεσμα του analyze_parallel (μία ανάπτυξη των διαστημάτων σε μήνες).
 
-    valid_df = pd.DataFrame(valid_months, columns=['ΕΤΟΣ', 'Μήνας_Num'])
-    filtered = p_df.merge(valid_df, on=['ΕΤΟΣ', 'Μήνας_Num'], how='inner')
-    filtered = filtered[filtered['is_ika'] | filtered['is_oaee'] | filtered['is_tsm'] | filtered['is_oga'] | filtered['is_tsay']]
-    filtered = filtered.drop(columns=['is_ika', 'is_oaee', 'is_tsm', 'is_oga', 'is_tsay', 'is_ika_general'])
+    monthly: μηνιαίες γραμμές όλων των διαστημάτων (στήλες _atlas_monthly_count_frame, ημέρες με πρόσημο·
+    φτιάχνονται την πρώτη φορά που ζητούνται, μαζί με το Is_Aggregate),
+    sums_2016 / sums_2017: ημέρες ανά κατηγορία στους έγκυρους μήνες (index: έτος*12 + μήνας-1),
+    months_2016 / months_2017 / multi_months: μήνες (έτος, μήνας) παράλληλης ασφάλισης ≤2016,
+    παράλληλης απασχόλησης 2017+ και πολλαπλής απασχόλησης, overlap_days_2016 / overlap_days_2017:
+    παράλληλες ημέρες. Οι πίνακες εκτύπωσης φτιάχνονται με print_df() την πρώτη φορά που ζητούνται.
+    """
 
-    if filtered.empty:
-        return None
+    __slots__ = (
+        'sums_2016', 'sums_2017', 'months_2016', 'months_2017', 'overlap_days_2016', 'overlap_days_2017',
+        'multi_months', '_monthly', '_build_monthly', '_print_rows', '_print_frames',
+    )
 
-    month_map = {1: 'ΙΑΝ', 2: 'ΦΕΒ', 3: 'ΜΑΡ', 4: 'ΑΠΡ', 5: 'ΜΑΙ', 6: 'ΙΟΥΝ', 7: 'ΙΟΥΛ', 8: 'ΑΥΓ', 9: 'ΣΕΠ', 10: 'ΟΚΤ', 11: 'ΝΟΕ', 12: 'ΔΕΚ'}
-    return _pivot_parallel_df(filtered, month_map, with_styles=with_styles)
+    def __init__(self, build_monthly, sums_2016, sums_2017, multi_months, print_rows):
+        self._monthly = None
+        self._build_monthly = build_monthly
+        self.sums_2016 = sums_2016
+        self.sums_2017 = sums_2017
+        self.months_2016 = _atlas_month_tuples(sums_2016.index)
+        self.months_2017 = _atlas_month_tuples(sums_2017.index)
+        self.overlap_days_2016 = _sum_parallel_overlap_days_until_2016(sums_2016)
+        self.overlap_days_2017 = _sum_parallel_overlap_days_2017(sums_2017)
+        self.multi_months = multi_months
+        self._print_rows = print_rows
+        self._print_frames = {}
+
+    @property
+    def monthly(self) -> pd.DataFrame:
+        if self._monthly is None:
+            self._monthly = self._build_monthly()
+            self._build_monthly = None
+        return self._monthly
+
+    def print_df(
+        self,
+        kind: str,
+        with_styles: bool = False,
+    ) -> pd.DataFrame | tuple[pd.DataFrame, list[dict[str, str]]] | None:
+        """Πίνακας εκτύπωσης 'parallel' (≤2016), 'parallel_2017' ή 'multi' (None χωρίς γραμμές).
+
+        Το αποτέλεσμα κρατιέται ανά (kind, with_styles) και είναι κοινό — όποιος το αλλάζει παίρνει αντίγραφο.
+        """
+        key = (kind, bool(with_styles))
+        if key not in self._print_frames:
+            rows = self._print_rows[kind]
+            self._print_frames[key] = (
+                _pivot_parallel_df(self.monthly[rows].reset_index(drop=True), _PARALLEL_MONTH_MAP, with_styles=with_styles)
+                if rows.any() else None
+            )
+        return self._print_frames[key]
 
 
-def build_parallel_2017_print_df(
-    df: pd.DataFrame,
-    description_map: dict | None = None,
-    with_styles: bool = False,
-) -> pd.DataFrame | tuple[pd.DataFrame, list[dict[str, str]]] | None:
-    """Παράγει το DataFrame Παράλληλης Απασχόλησης 2017+ έτοιμο για εκτύπωση."""
-    if df.empty or not all(c in df.columns for c in ['Από', 'Έως']):
-        return None
+def analyze_parallel(df: pd.DataFrame, description_map: dict | None = None) -> ParallelAnalysis:
+    """Παράλληλη ασφάλιση (≤2016), παράλληλη απασχόληση (2017+) και πολλαπλή απασχόληση με μία
+    ανάπτυξη των διαστημάτων σε μήνες και μία αξιολόγηση των κανόνων ανά συνδυασμό ταμείου/πακέτου.
 
-    monthly_rows = _build_monthly_rows_for_parallel(df, description_map)
-    if not monthly_rows:
-        return None
+    Οι επιμέρους όψεις είναι μάσκες πάνω στις ίδιες μηνιαίες γραμμές:
+    - μετρήσεις (μήνες, ημέρες): ημέρες χωρίς πρόσημο· ≤2016 χωρίς τα EXCLUDED_PACKAGES_PARALLEL_UNTIL_2016
+    - πίνακες εκτύπωσης και πολλαπλή: ημέρες με πρόσημο (διαγραφές αρνητικές), χωρίς τα
+      EXCLUDED_PACKAGES_PARALLEL (≤2016 και χωρίς τα EXCLUDED_PACKAGES_PARALLEL_UNTIL_2016).
+    """
+    start_dates, end_dates = interval_dates(df)
+    days, _touched = _atlas_interval_days(df)
+    signed, gross, contrib = _atlas_signed_interval_values(df, or_zero=True, float_start=True)
+    # Πεπερασμένο σύνολο ⇔ πεπερασμένο |σύνολο|: ίδιες μηνιαίες γραμμές με ή χωρίς πρόσημο
+    parts = explode_months(start_dates, end_dates, days=signed, gross=gross, contrib=contrib)
+    unsigned = distribute_days_parts(days.to_numpy(dtype=float)[parts.row_id], parts.num_months, parts.offset)
+
+    klados = _atlas_row_text(df, 'Κλάδος/Πακέτο Κάλυψης')
+    month_index = parts.month_index
+
+    keys = pd.DataFrame({
+        'ΤΑΜΕΙΟ': _atlas_row_text(df, 'Ταμείο'),
+        'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': _atlas_row_text(df, 'Τύπος Ασφάλισης'),
+        'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': klados,
+        'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': _atlas_row_text(df, 'Τύπος Αποδοχών'),
+    })
+    rules_2016 = _atlas_key_flags(keys, {**_IKA_PARALLEL_BY_ERA, **_PARALLEL_2016_RULES}).take(parts.row_id)
+    rules_2016 = rules_2016.reset_index(drop=True)
+    flags_2016 = pd.concat([
+        rules_2016['pre2002'].where(pd.Series(parts.year < 2002), rules_2016['post2002']).rename('is_ika'),
+        rules_2016[list(_PARALLEL_2016_RULES)],
+    ], axis=1)
+    flags_2017 = _atlas_key_flags(keys, _PARALLEL_2017_RULES).take(parts.row_id).reset_index(drop=True)
+
+    keep_2016 = parts.take(~klados.isin(EXCLUDED_PACKAGES_PARALLEL_UNTIL_2016))
+    keep_print = parts.take(~klados.isin(EXCLUDED_PACKAGES_PARALLEL))
+    keep_print_2016 = keep_print & keep_2016
+
+    sums_2016 = _atlas_month_flag_sums(month_index, unsigned, flags_2016, keep_2016)
+    sums_2017 = _atlas_month_flag_sums(month_index, unsigned, flags_2017)
+
+    signed_days = parts.days
+    core_2016 = flags_2016[_PARALLEL_2016_FLAGS]
+    print_2016 = _atlas_month_flag_sums(month_index, signed_days, core_2016, keep_print_2016)
+    print_2017 = _atlas_month_flag_sums(month_index, signed_days, flags_2017, keep_print)
+    month_series = pd.Series(month_index)
+    print_rows = {
+        'parallel': (
+            keep_print_2016
+            & month_series.isin(print_2016.index[_parallel_until_2016_valid_months(print_2016)]).to_numpy()
+            & core_2016.any(axis=1).to_numpy()
+        ),
+        'parallel_2017': (
+            keep_print
+            & month_series.isin(print_2017.index[_parallel_2017_valid_months(print_2017)]).to_numpy()
+            & flags_2017.any(axis=1).to_numpy()
+        ),
+    }
 
-    p_df = pd.DataFrame(monthly_rows)
-    p_df['ΕΤΟΣ'] = p_df['ΕΤΟΣ'].astype(int)
-    p_df['Μήνας_Num'] = p_df['Μήνας_Num'].astype(int)
-
-    def _is_ika(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        et = str(row.get('ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', '')).strip()
-        return (('IKA' in t or 'ΙΚΑ' in t) or ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)) and et in ['01', '1', '16', '99']
-
-    def _is_efka_mis(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        return ('ΕΦΚΑ' in t or 'EFKA' in t) and ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)
-
-    def _is_efka_non(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        return ('ΕΦΚΑ' in t or 'EFKA' in t) and (('ΜΗ' in i_type and 'ΜΙΣΘΩΤΗ' in i_type) or ('NON' in i_type and 'SAL' in i_type))
-
-    p_df['is_ika'] = p_df.apply(_is_ika, axis=1)
-    p_df['is_efka_mis'] = p_df.apply(_is_efka_mis, axis=1)
-    p_df['is_efka_non'] = p_df.apply(_is_efka_non, axis=1)
-
-    month_groups = p_df.groupby(['ΕΤΟΣ', 'Μήνας_Num'])
-    valid_months = []
-    for (year, month), group in month_groups:
-        if year < 2017:
-            continue
-        ika_d = group.loc[group['is_ika'], 'Ημέρες'].sum()
-        efka_mis_d = group.loc[group['is_efka_mis'], 'Ημέρες'].sum()
-        efka_non_d = group.loc[group['is_efka_non'], 'Ημέρες'].sum()
-        if (ika_d > 0 and efka_non_d > 0) or (efka_mis_d > 0 and efka_non_d > 0):
-            valid_months.append((year, month))
+    # Πολλαπλή: μήνες με ΙΚΑ (αποδοχές 01/16/99) και >1 διακριτό εργοδότη
+    ika = keep_print & flags_2017['is_ika'].to_numpy()
+    employer = pd.Series(parts.take(_atlas_row_text(df, 'Α-Μ εργοδότη')))
+    with_employer = ika & ~employer.isin(_MULTI_EMPTY_EMPLOYER).to_numpy()
+    employers = employer[with_employer].groupby(month_index[with_employer]).nunique()
+    multi_index = employers.index[employers > 1]
+    print_rows['multi'] = ika & month_series.isin(multi_index).to_numpy()
+
+    return ParallelAnalysis(
+        lambda: _atlas_monthly_frame_from_parts(
+            df, parts, start_dates, end_dates, klados, description_map, aggregate_rule=_compute_is_aggregate_interval,
+        ),
+        sums_2016[_parallel_until_2016_valid_months(sums_2016)],
+        sums_2017[_parallel_2017_valid_months(sums_2017)],
+        _atlas_month_tuples(multi_index),
+        print_rows,
+    )
 
-    if not valid_months:
-        return None
 
-    valid_df = pd.DataFrame(valid_months, columns=['ΕΤΟΣ', 'Μήνας_Num'])
-    filtered = p_df.merge(valid_df, on=['ΕΤΟΣ', 'Μήνας_Num'], how='inner')
-    filtered = filtered[filtered['is_ika'] | filtered['is_efka_mis'] | filtered['is_efka_non']]
-    filtered = filtered.drop(columns=['is_ika', 'is_efka_mis', 'is_efka_non'])
+def build_parallel_print_df(
+    df: pd.DataFrame,
+    description_map: dict | None = None,
+    with_styles: bool = False,
+) -> pd.DataFrame | tuple[pd.DataFrame, list[dict[str, str]]] | None:
+    """Παράγει το DataFrame Παράλληλης Ασφάλισης (≤2016) έτοιμο για εκτύπωση."""
+    return analyze_parallel(df, description_map).print_df('parallel', with_styles)
 
-    if filtered.empty:
-        return None
 
-    month_map = {1: 'ΙΑΝ', 2: 'ΦΕΒ', 3: 'ΜΑΡ', 4: 'ΑΠΡ', 5: 'ΜΑΙ', 6: 'ΙΟΥΝ', 7: 'ΙΟΥΛ', 8: 'ΑΥΓ', 9: 'ΣΕΠ', 10: 'ΟΚΤ', 11: 'ΝΟΕ', 12: 'ΔΕΚ'}
-    return _pivot_parallel_df(filtered, month_map, with_styles=with_styles)
+def build_parallel_2017_print_df(
+    df: pd.DataFrame,
+    description_map: dict | None = None,
+    with_styles: bool = False,
+) -> pd.DataFrame | tuple[pd.DataFrame, list[dict[str, str]]] | None:
+    """Παράγει το DataFrame Παράλληλης Απασχόλησης 2017+ έτοιμο για εκτύπωση."""
+    return analyze_parallel(df, description_map).print_df('parallel_2017', with_styles)
 
 
 def compute_multi_employment_months(
@@ -3447,35 +3025,7 @@ def compute_multi_employment_months(
     description_map: dict | None = None,
 ) -> list[tuple[int, int]]:
     """Μήνες με ΙΚΑ (αποδοχές 01, 16, ή 99) και >1 εργοδότη στον ίδιο μήνα."""
-    if base_df.empty or not all(c in base_df.columns for c in ['Από', 'Έως']):
-        return []
-
-    monthly_rows = _build_monthly_rows_for_parallel(base_df, description_map)
-    if not monthly_rows:
-        return []
-
-    p_df = pd.DataFrame(monthly_rows)
-    p_df['ΕΤΟΣ'] = p_df['ΕΤΟΣ'].astype(int)
-    p_df['Μήνας_Num'] = p_df['Μήνας_Num'].astype(int)
-
-    def _is_ika_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        et = str(row.get('ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', '')).strip()
-        return (('IKA' in t or 'ΙΚΑ' in t) or ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)) and et in ['01', '1', '16', '99']
-
-    p_df['is_ika'] = p_df.apply(_is_ika_match, axis=1)
-    ika_rows = p_df[p_df['is_ika']].copy()
-    ika_rows['ΕΡΓΟΔΟΤΗΣ_Clean'] = ika_rows['ΕΡΓΟΔΟΤΗΣ'].replace(['', 'nan', 'NaN', 'None'], pd.NA)
-    ika_rows = ika_rows.dropna(subset=['ΕΡΓΟΔΟΤΗΣ_Clean'])
-    if ika_rows.empty:
-        return []
-
-    multi_months: list[tuple[int, int]] = []
-    for (year, month), group in ika_rows.groupby(['ΕΤΟΣ', 'Μήνας_Num']):
-        if group['ΕΡΓΟΔΟΤΗΣ_Clean'].nunique() > 1:
-            multi_months.append((int(year), int(month)))
-    return sorted(multi_months)
+    return analyze_parallel(base_df, description_map).multi_months
 
 
 def compute_multi_employment_summary_metrics(
@@ -3492,39 +3042,7 @@ def build_multi_employment_print_df(
     with_styles: bool = False,
 ) -> pd.DataFrame | tuple[pd.DataFrame, list[dict[str, str]]] | None:
     """Παράγει το DataFrame Πολλαπλής Απασχόλησης (ΙΚΑ, >1 εργοδότες) έτοιμο για εκτύπωση."""
-    if df.empty or not all(c in df.columns for c in ['Από', 'Έως']):
-        return None
-
-    monthly_rows = _build_monthly_rows_for_parallel(df, description_map)
-    if not monthly_rows:
-        return None
-
-    p_df = pd.DataFrame(monthly_rows)
-    p_df['ΕΤΟΣ'] = p_df['ΕΤΟΣ'].astype(int)
-    p_df['Μήνας_Num'] = p_df['Μήνας_Num'].astype(int)
-
-    multi_months = compute_multi_employment_months(df, description_map)
-    if not multi_months:
-        return None
-
-    def _is_ika_match(row):
-        t = str(row.get('ΤΑΜΕΙΟ', '')).upper()
-        i_type = str(row.get('ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', '')).upper()
-        et = str(row.get('ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', '')).strip()
-        return (('IKA' in t or 'ΙΚΑ' in t) or ('ΜΙΣΘΩΤΗ' in i_type and 'ΜΗ' not in i_type)) and et in ['01', '1', '16', '99']
-
-    p_df['is_ika'] = p_df.apply(_is_ika_match, axis=1)
-
-    valid_df = pd.DataFrame(multi_months, columns=['ΕΤΟΣ', 'Μήνας_Num'])
-    filtered = p_df.merge(valid_df, on=['ΕΤΟΣ', 'Μήνας_Num'], how='inner')
-    filtered = filtered[filtered['is_ika']]
-    filtered = filtered.drop(columns=['is_ika'])
-
-    if filtered.empty:
-        return None
-
-    month_map = {1: 'ΙΑΝ', 2: 'ΦΕΒ', 3: 'ΜΑΡ', 4: 'ΑΠΡ', 5: 'ΜΑΙ', 6: 'ΙΟΥΝ', 7: 'ΙΟΥΛ', 8: 'ΑΥΓ', 9: 'ΣΕΠ', 10: 'ΟΚΤ', 11: 'ΝΟΕ', 12: 'ΔΕΚ'}
-    return _pivot_parallel_df(filtered, month_map, with_styles=with_styles)
+    return analyze_parallel(df, description_map).print_df('multi', with_styles)
 
 
 def compute_applied_monthly_day_caps(data_df: pd.DataFrame) -> list[dict]:
@@ -3534,76 +3052,31 @@ def compute_applied_monthly_day_caps(data_df: pd.DataFrame) -> list[dict]:
         return []
 
     excluded_packages = {'Α', 'Λ', 'Υ', 'Ο', 'Χ', '026', '899'}
-    monthly_rows: list[dict] = []
-
-    for _, row in data_df.iterrows():
-        try:
-            start_dt = pd.to_datetime(row.get('Από'), format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row.get('Έως'), format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
-
-            package = str(row.get('Κλάδος/Πακέτο Κάλυψης', '')).strip()
-            if not package or package.upper() in excluded_packages:
-                continue
+    package = _atlas_row_text(data_df, 'Κλάδος/Πακέτο Κάλυψης')
+    keep = (package != '') & ~package.str.upper().isin(excluded_packages)
 
-            # Ίδιος τύπος ημερών με build_count_report: Έτη*300 + Μήνες*25 + Ημέρες
-            days_val = 0.0
-            if 'Ημέρες' in row and pd.notna(row.get('Ημέρες')) and str(row.get('Ημέρες', '')).strip() != '':
-                d = clean_numeric_value(row.get('Ημέρες'))
-                if d is not None and d != 0:
-                    days_val += float(d)
-            if 'Έτη' in row and pd.notna(row.get('Έτη')):
-                y = clean_numeric_value(row.get('Έτη'))
-                if y is not None and y != 0:
-                    days_val += float(y) * 300
-            if 'Μήνες' in row and pd.notna(row.get('Μήνες')):
-                m = clean_numeric_value(row.get('Μήνες'))
-                if m is not None and m != 0:
-                    days_val += float(m) * 25
-            gross_val = clean_numeric_value(row.get('Μικτές αποδοχές'), exclude_drx=True)
-            raw_contrib = str(row.get('Συνολικές εισφορές', ''))
-            if 'ΔΡΧ' in raw_contrib.upper() or 'DRX' in raw_contrib.upper():
-                contrib_val = 0.0
-            else:
-                contrib_val = clean_numeric_value(raw_contrib, exclude_drx=True)
-            gross_val = gross_val if gross_val is not None else 0.0
-            contrib_val = contrib_val if contrib_val is not None else 0.0
-
-            sign = get_negative_amount_sign(gross_val, contrib_val)
-            if sign == -1:
-                days_val = -abs(days_val)
-
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-
-            if not months_list:
-                continue
-
-            days_parts = distribute_days_to_months(days_val, len(months_list))
-            tameio = str(row.get('Ταμείο', '')).strip()
-            for i, m_dt in enumerate(months_list):
-                monthly_rows.append({
-                    'Έτος': int(m_dt.year),
-                    'Μήνας': int(m_dt.month),
-                    'Ταμείο': tameio,
-                    'Πακέτο': package,
-                    'Ημέρες': float(days_parts[i])
-                })
-        except Exception:
-            continue
-
-    if not monthly_rows:
+    # Ίδιος τύπος ημερών με build_count_report: Έτη*300 + Μήνες*25 + Ημέρες
+    days, _touched = _atlas_interval_days(data_df)
+    if 'Μικτές αποδοχές' in data_df.columns:
+        gross = typed_numeric(data_df, 'Μικτές αποδοχές', exclude_drx=True)
+    else:
+        gross = pd.Series(0.0, index=data_df.index)
+    contrib = _atlas_interval_amount(data_df, 'Συνολικές εισφορές')
+    negative = (gross < 0) | (contrib < 0)
+    days = days.mask(negative, -days.abs())
+
+    start_dates, end_dates = interval_dates(data_df)
+    parts = explode_months(start_dates, end_dates, days=days, keep=keep)
+    if not len(parts):
         return []
 
-    m_df = pd.DataFrame(monthly_rows)
+    m_df = pd.DataFrame({
+        'Έτος': parts.year,
+        'Μήνας': parts.month,
+        'Ταμείο': parts.take(_atlas_row_text(data_df, 'Ταμείο')),
+        'Πακέτο': parts.take(package),
+        'Ημέρες': parts.days,
+    })
     grouped = m_df.groupby(['Έτος', 'Μήνας', 'Ταμείο', 'Πακέτο'], as_index=False)['Ημέρες'].sum()
     grouped['is_ika'] = grouped['Ταμείο'].astype(str).str.upper().str.contains('ΙΚΑ|IKA', na=False)
     capped = grouped[(~grouped['is_ika']) & (grouped['Ημέρες'] > 25)].copy()
@@ -3614,18 +3087,19 @@ def compute_applied_monthly_day_caps(data_df: pd.DataFrame) -> list[dict]:
     return capped[['Έτος', 'Μήνας', 'Ταμείο', 'Πακέτο', 'Ημέρες']].to_dict('records')
 
 
-def compute_complex_file_metrics(data_df: pd.DataFrame) -> tuple[int, int, int, int]:
+def compute_complex_file_metrics(data_df: pd.DataFrame, case: 'AtlasCase | None' = None) -> tuple[int, int, int, int]:
     """
     Υπολογίζει μετρήσεις για το προειδοποιητικό «Περίπλοκο αρχείο».
     Επιστρέφει (n_aggregated, n_limits_25, n_unpaid_months, n_negative).
+    case: AtlasCase του data_df (κοινή κατανομή καταμέτρησης με το audit).
     """
     n_agg, n_limits_25, n_unpaid, n_negative = 0, 0, 0, 0
     # 1. Ενοποιημένα διαστήματα (Check 9 λογική)
     try:
         if 'Από' in data_df.columns and 'Έως' in data_df.columns:
             t_df = data_df.copy()
-            t_df['D_From'] = pd.to_datetime(t_df['Από'], format='%d/%m/%Y', errors='coerce')
-            t_df['D_To'] = pd.to_datetime(t_df['Έως'], format='%d/%m/%Y', errors='coerce')
+            t_df['D_From'] = typed_dates(t_df, 'Από')
+            t_df['D_To'] = typed_dates(t_df, 'Έως')
             t_df['Duration'] = (t_df['D_To'] - t_df['D_From']).dt.days + 1
             def _get_num(val):
                 try: return clean_numeric_value(val) or 0
@@ -3664,7 +3138,7 @@ def compute_complex_file_metrics(data_df: pd.DataFrame) -> tuple[int, int, int,
         pass
     # 3. Απλήρωτοι μήνες (από καταμέτρηση, 1995+, K/ΚΣ/ΜΕ + ΕΤΑΑ + ΕΦΚΑ Κ)
     try:
-        days_df, contrib_df = get_count_allocation(data_df)
+        days_df, contrib_df = case.count_allocation if case is not None else get_count_allocation(data_df)
         if not days_df.empty and not contrib_df.empty:
             try:
                 years = pd.to_numeric(days_df['ΕΤΟΣ'], errors='coerce')
@@ -3831,6 +3305,69 @@ def _render_complex_file_warning_banner(dom_base: str) -> None:
     components.html(banner_html, height=120)
 
 
+def _atlas_month_cap_limits(frame: pd.DataFrame, month_days: int, ika_month_days: int) -> tuple[pd.Series, pd.Series]:
+    """(Όριο, Όριο_μήνυμα) ανά γραμμή: πλαφόν 25/μήνα (ΙΚΑ 31)· ΕΤΑΑ-ΤΑΝ/ΚΕΑΔ μήνυμα υπέρβασης μόνο >30."""
+    limit = pd.Series(month_days, index=frame.index)
+    notice = limit.copy()
+    if 'Ταμείο' in frame.columns:
+        t_upper = frame['Ταμείο'].astype(str).str.upper().str.strip()
+        limit[t_upper.str.contains('ΙΚΑ|IKA', na=False)] = ika_month_days
+        notice = limit.copy()
+        notice[t_upper.str.contains('ΕΤΑΑ-ΤΑΝ|ETAA-TAN|ΕΤΑΑ-ΚΕΑΔ|ETAA-KEAD', na=False)] = 30
+    return limit, notice
+
+
+def _atlas_month_cap_may_bind(frame: pd.DataFrame, keys: list[str], limit) -> pd.Series:
+    """True για γραμμές (διάστημα, έτος) ομάδας-έτους όπου το πλαφόν μήνα μπορεί να κόψει ημέρες.
+
+    Άνω φράγμα κάθε μήνα της ομάδας: άθροισμα των θετικών μέγιστων μηνιαίων μεριδίων (_peak)·
+    μη αριθμητικό μερίδιο → πάντα ανά μήνα.
+    """
+    peaks = frame['_peak'].clip(lower=0).fillna(float('inf'))
+    bound = peaks.groupby([frame[k] for k in keys], dropna=False).transform('sum')
+    return ~(bound <= limit)
+
+
+def _atlas_capped_month_ledger(
+    work_df: pd.DataFrame,
+    cap_group_keys: list[str],
+    month_days: int,
+    year_days: int,
+    ika_month_days: int,
+    from_dt: pd.Timestamp | None = None,
+    to_dt: pd.Timestamp | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, MonthLedger | None]:
+    """(groups, limits, ledger) για ημέρες με πλαφόν μήνα ανά ομάδα (cap_group_keys).
+
+    groups: μία γραμμή ανά ομάδα (ταξινομημένες, θέση = δείκτης ομάδας στο ledger),
+    limits: Όριο / Όριο_μήνυμα ανά ομάδα, ledger: MonthLedger ή None χωρίς μήνες.
+    Σύνολο διαστήματος = Έτη*year_days + Μήνες*month_days + Ημέρες· με from_dt/to_dt μένουν
+    μόνο οι μήνες εντός εύρους και το σύνολο κλιμακώνεται στο ποσοστό τους.
+    """
+    def _num(col):
+        if col not in work_df.columns:
+            return pd.Series(0.0, index=work_df.index)
+        values = typed_numeric(work_df, col)
+        return values.where(values != 0, 0.0)
+
+    key_frame = pd.DataFrame({
+        k: work_df[k].to_numpy() if k in work_df.columns else [''] * len(work_df)
+        for k in cap_group_keys
+    })
+    grouped = key_frame.groupby(cap_group_keys, sort=True, dropna=False)
+    group_ids = grouped.ngroup().to_numpy()
+    groups = grouped.size().index.to_frame(index=False)
+    limits = pd.DataFrame(dict(zip(('Όριο', 'Όριο_μήνυμα'), _atlas_month_cap_limits(groups, month_days, ika_month_days))))
+
+    total_days = (_num('Έτη') * year_days) + (_num('Μήνες') * month_days) + _num('Ημέρες')
+    first, last = window_month_bounds(from_dt, to_dt)
+    start_dates, end_dates = interval_dates(work_df)
+    ledger = build_month_ledger(
+        start_dates, end_dates, total_days, group_ids, len(groups), limits['Όριο'].to_numpy(), first=first, last=last
+    )
+    return groups, limits, ledger
+
+
 def compute_summary_capped_days_by_group(
     summary_df: pd.DataFrame,
     group_keys: list[str],
@@ -3863,84 +3400,25 @@ def compute_summary_capped_days_by_group(
     if 'Τύπος Ασφάλισης' in work_df.columns:
         work_df['Τύπος Ασφάλισης'] = work_df['Τύπος Ασφάλισης'].astype(str).str.strip()
 
-    monthly_rows: list[dict] = []
-    for _, row in work_df.iterrows():
-        try:
-            start_dt = pd.to_datetime(row.get('Από'), format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row.get('Έως'), format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
-
-            years_val = clean_numeric_value(row.get('Έτη')) or 0.0
-            months_val = clean_numeric_value(row.get('Μήνες')) or 0.0
-            days_val = clean_numeric_value(row.get('Ημέρες')) or 0.0
-            total_days_val = (years_val * year_days) + (months_val * month_days) + days_val
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-
-            if not months_list:
-                continue
-
-            # Φίλτρο μηνών εντός εύρους Από-Έως
-            orig_len = len(months_list)
-            if from_dt is not None:
-                months_list = [m for m in months_list if m >= from_dt.replace(day=1)]
-            if to_dt is not None:
-                to_month = to_dt.replace(day=1)
-                months_list = [m for m in months_list if m <= to_month]
-            if not months_list:
-                continue
-
-            n_filtered = len(months_list)
-            share_total = total_days_val if n_filtered == orig_len else total_days_val * n_filtered / orig_len
-            days_parts = distribute_days_to_months(share_total, n_filtered)
-            base_rec = {k: row.get(k, '') for k in cap_group_keys}
-            for i, m_dt in enumerate(months_list):
-                rec = dict(base_rec)
-                rec['Έτος'] = int(m_dt.year)
-                rec['Μήνας'] = int(m_dt.month)
-                rec['Συνολικές_Ημέρες'] = float(days_parts[i])
-                monthly_rows.append(rec)
-        except Exception:
-            continue
-
-    if not monthly_rows:
+    groups, limits, ledger = _atlas_capped_month_ledger(
+        work_df, cap_group_keys, month_days, year_days, ika_month_days, from_dt, to_dt
+    )
+    if ledger is None:
         return empty_capped, empty_exceeded
 
-    monthly_df = pd.DataFrame(monthly_rows)
-    per_month = monthly_df.groupby(cap_group_keys + ['Έτος', 'Μήνας'], as_index=False)['Συνολικές_Ημέρες'].sum()
-
-    if 'Ταμείο' in per_month.columns:
-        t_upper = per_month['Ταμείο'].astype(str).str.upper().str.strip()
-        is_ika = t_upper.str.contains('ΙΚΑ|IKA', na=False)
-        is_etaa_tan_kead = t_upper.str.contains('ΕΤΑΑ-ΤΑΝ|ETAA-TAN|ΕΤΑΑ-ΚΕΑΔ|ETAA-KEAD', na=False)
-    else:
-        is_ika = pd.Series(False, index=per_month.index)
-        is_etaa_tan_kead = pd.Series(False, index=per_month.index)
-
-    per_month['Όριο'] = month_days
-    per_month.loc[is_ika, 'Όριο'] = ika_month_days
-    per_month['Συνολικές_Ημέρες_cap'] = per_month[['Συνολικές_Ημέρες', 'Όριο']].min(axis=1)
-
     # Πλαφόν υπολογισμού: 25/μήνα (ΙΚΑ 31). ΕΤΑΑ-ΤΑΝ/ΚΕΑΔ: μήνυμα υπέρβασης μόνο όταν >30 ημ./μήνα (ξεχωριστό από πλαφόν ΙΚΑ).
-    per_month['Όριο_μήνυμα'] = per_month['Όριο']
-    per_month.loc[is_etaa_tan_kead, 'Όριο_μήνυμα'] = 30
-    exceeded = per_month[per_month['Συνολικές_Ημέρες'] > per_month['Όριο_μήνυμα']].copy()
-    if not exceeded.empty:
-        exceeded = exceeded.rename(columns={'Συνολικές_Ημέρες': 'Ημέρες'})
+    g, col = (ledger.raw > limits['Όριο_μήνυμα'].to_numpy()[:, None]).nonzero()
+    if len(g):
+        exceeded = groups.iloc[g].reset_index(drop=True)
+        exceeded['Έτος'] = (ledger.start + col) // 12
+        exceeded['Μήνας'] = (ledger.start + col) % 12 + 1
+        exceeded['Ημέρες'] = ledger.raw[g, col]
+        exceeded['Όριο'] = limits['Όριο'].to_numpy()[g]
         exceeded['Υπέρβαση'] = (exceeded['Ημέρες'] - exceeded['Όριο']).round(1)
-        exceeded = exceeded[[c for c in ['Κλάδος/Πακέτο Κάλυψης', 'Ταμείο', 'Τύπος Ασφάλισης', 'Έτος', 'Μήνας', 'Ημέρες', 'Όριο', 'Υπέρβαση'] if c in exceeded.columns]]
     else:
         exceeded = empty_exceeded.copy()
 
-    capped = per_month.groupby(cap_group_keys, as_index=False)['Συνολικές_Ημέρες_cap'].sum()
+    capped = groups.assign(Συνολικές_Ημέρες_cap=ledger.window())[ledger.present].reset_index(drop=True)
     return capped, exceeded
 
 
@@ -3961,13 +3439,7 @@ def compute_summary_capped_dk(
     if 'Τύπος Ασφάλισης' in group_keys and 'Τύπος Ασφάλισης' in summary_df.columns:
         cap_group_keys.append('Τύπος Ασφάλισης')
 
-    _capped, _ = compute_summary_capped_days_by_group(
-        summary_df, group_keys, month_days=month_days, year_days=year_days,
-        ika_month_days=ika_month_days, from_dt=from_dt, to_dt=to_dt
-    )
-    if _capped.empty:
-        return pd.DataFrame(columns=cap_group_keys + ['dk1', 'dk3', 'dk4', 'dk5', 'dk6', 'dk7a', 'dk7b', 'dk7c'])
-
+    dk_cols = ['dk1', 'dk3', 'dk4', 'dk5', 'dk6', 'dk7a', 'dk7b', 'dk7c']
     work_df = summary_df.copy()
     if 'Κλάδος/Πακέτο Κάλυψης' in work_df.columns:
         work_df['Κλάδος/Πακέτο Κάλυψης'] = work_df['Κλάδος/Πακέτο Κάλυψης'].astype(str).str.strip()
@@ -3975,78 +3447,6 @@ def compute_summary_capped_dk(
         if c in work_df.columns:
             work_df[c] = work_df[c].astype(str).str.strip()
 
-    monthly_rows: list[dict] = []
-    for _, row in work_df.iterrows():
-        try:
-            start_dt = pd.to_datetime(row.get('Από'), format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row.get('Έως'), format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
-            years_val = clean_numeric_value(row.get('Έτη')) or 0.0
-            months_val = clean_numeric_value(row.get('Μήνες')) or 0.0
-            days_val = clean_numeric_value(row.get('Ημέρες')) or 0.0
-            total_days_val = (years_val * year_days) + (months_val * month_days) + days_val
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-            if not months_list:
-                continue
-            orig_len = len(months_list)
-            if from_dt is not None:
-                months_list = [m for m in months_list if m >= from_dt.replace(day=1)]
-            if to_dt is not None:
-                to_month = to_dt.replace(day=1)
-                months_list = [m for m in months_list if m <= to_month]
-            if not months_list:
-                continue
-            n_filtered = len(months_list)
-            share_total = total_days_val if n_filtered == orig_len else total_days_val * n_filtered / orig_len
-            days_parts = distribute_days_to_months(share_total, n_filtered)
-            base_rec = {k: row.get(k, '') for k in cap_group_keys}
-            for i, m_dt in enumerate(months_list):
-                rec = dict(base_rec)
-                rec['Έτος'] = int(m_dt.year)
-                rec['Μήνας'] = int(m_dt.month)
-                rec['Συνολικές_Ημέρες'] = float(days_parts[i])
-                monthly_rows.append(rec)
-        except Exception:
-            continue
-
-    if not monthly_rows:
-        return pd.DataFrame(columns=cap_group_keys + ['dk1', 'dk3', 'dk4', 'dk5', 'dk6', 'dk7a', 'dk7b', 'dk7c'])
-
-    monthly_df = pd.DataFrame(monthly_rows)
-    per_month = monthly_df.groupby(cap_group_keys + ['Έτος', 'Μήνας'], as_index=False)['Συνολικές_Ημέρες'].sum()
-    if 'Ταμείο' in per_month.columns:
-        t_upper = per_month['Ταμείο'].astype(str).str.upper().str.strip()
-        is_ika = t_upper.str.contains('ΙΚΑ|IKA', na=False)
-    else:
-        is_ika = pd.Series(False, index=per_month.index)
-    per_month['Όριο'] = month_days
-    per_month.loc[is_ika, 'Όριο'] = ika_month_days
-    per_month['Συνολικές_Ημέρες_cap'] = per_month[['Συνολικές_Ημέρες', 'Όριο']].min(axis=1)
-    per_month['_m_dt'] = pd.to_datetime(per_month['Έτος'].astype(str) + '-' + per_month['Μήνας'].astype(str) + '-01')
-
-    today = pd.Timestamp.today().normalize()
-    d2002 = pd.Timestamp('2002-01-01')
-    five = pd.Timestamp(f'{today.year - 4}-01-01')
-    max_y = per_month['Έτος'].max()
-    five_last = pd.Timestamp(f'{int(max_y) - 4}-01-01') if pd.notna(max_y) else pd.NaT
-    last_end = pd.Timestamp(f'{int(max_y)}-12-31') if pd.notna(max_y) else pd.NaT
-    d2014 = pd.Timestamp('2014-12-31')
-    d2010 = pd.Timestamp('2010-12-31')
-    d2011 = pd.Timestamp('2011-12-31')
-    d2012 = pd.Timestamp('2012-12-31')
-    BAREA_DAYS = 6205
-    window_end = today
-    window_start = today - pd.Timedelta(days=BAREA_DAYS)
-
     def _strip_accents(s):
         import unicodedata
         return ''.join(c for c in unicodedata.normalize('NFD', str(s)) if unicodedata.category(c) != 'Mn')
@@ -4056,27 +3456,44 @@ def compute_summary_capped_dk(
             if 'ΒΑΡΕ' in _strip_accents(desc).upper():
                 varea_codes.add(str(code).strip())
     pkg_col = 'Κλάδος/Πακέτο Κάλυψης'
-    per_month['_is_varea'] = per_month[pkg_col].astype(str).str.strip().isin(varea_codes) if pkg_col in per_month.columns else False
-
-    per_month['dk1'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_m_dt'] >= d2002, 0)
-    per_month['dk3'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_m_dt'] >= five, 0)
-    per_month['dk4'] = 0
-    if pd.notna(five_last):
-        per_month['dk4'] = per_month['Συνολικές_Ημέρες_cap'].where(
-            (per_month['_m_dt'] >= five_last) & (per_month['_m_dt'] <= last_end), 0
-        )
-    per_month['dk5'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_m_dt'] <= d2014, 0)
-    month_end = per_month['_m_dt'] + pd.offsets.MonthEnd(0)
-    in_window = (month_end >= window_start) & (per_month['_m_dt'] <= window_end)
-    per_month['dk6'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_is_varea'] & in_window, 0)
-    per_month['dk7a'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_m_dt'] <= d2010, 0)
-    per_month['dk7b'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_m_dt'] <= d2011, 0)
-    per_month['dk7c'] = per_month['Συνολικές_Ημέρες_cap'].where(per_month['_m_dt'] <= d2012, 0)
 
-    dk_cols = ['dk1', 'dk3', 'dk4', 'dk5', 'dk6', 'dk7a', 'dk7b', 'dk7c']
-    result = per_month.groupby(cap_group_keys)[dk_cols].sum().reset_index()
+    def _is_varea(frame):
+        if pkg_col not in frame.columns:
+            return pd.Series(False, index=frame.index)
+        return frame[pkg_col].astype(str).str.strip().isin(varea_codes)
+
+    groups, _limits, ledger = _atlas_capped_month_ledger(
+        work_df, cap_group_keys, month_days, year_days, ika_month_days, from_dt, to_dt
+    )
+    if ledger is None:
+        return pd.DataFrame(columns=cap_group_keys + dk_cols)
+
+    today = pd.Timestamp.today().normalize()
+    max_y = ledger.last_month // 12
+    BAREA_DAYS = 6205
+    window_end = today
+    window_start = today - pd.Timedelta(days=BAREA_DAYS)
+
+    def _month(y, m=1):
+        return y * 12 + m - 1
+
+    # Κάθε dk είναι παράθυρο μηνών: δύο αναζητήσεις στα αθροιστικά σύνολα του ledger ανά ομάδα.
+    # dk6 (ΒΑΡΕΑ, τελευταίες 6205 ημέρες): μήνες με τέλος >= αρχή παραθύρου και αρχή <= σήμερα.
+    result = groups.copy()
+    result['dk1'] = ledger.window(_month(2002))
+    result['dk3'] = ledger.window(_month(today.year - 4))
+    result['dk4'] = ledger.window(_month(max_y - 4), _month(max_y, 12))
+    result['dk5'] = ledger.window(None, _month(2014, 12))
+    dk6 = ledger.window(_month(window_start.year, window_start.month), _month(window_end.year, window_end.month))
+    result['dk6'] = pd.Series(dk6).where(_is_varea(result), 0)
+    result['dk7a'] = ledger.window(None, _month(2010, 12))
+    result['dk7b'] = ledger.window(None, _month(2011, 12))
+    result['dk7c'] = ledger.window(None, _month(2012, 12))
+
+    result = result[ledger.present].reset_index(drop=True)
     for c in dk_cols:
-        result[c] = result[c].round(0).astype(int)
+        # round(6) πρώτα: η σειρά άθροισης δεν αλλάζει τη στρογγυλοποίηση στο .5
+        result[c] = result[c].round(6).round(0).astype(int)
     return result
 
 
@@ -4093,7 +3510,7 @@ def _get_gemini_api_key() -> str:
 def _df_to_records_for_ai(df: pd.DataFrame, max_rows: int | None = None) -> list[dict]:
     if df is None or not isinstance(df, pd.DataFrame) or df.empty:
         return []
-    safe_df = df.copy()
+    safe_df = drop_typed_columns(df).copy()
     safe_df = safe_df.replace({pd.NA: None})
     if max_rows is not None and max_rows > 0 and len(safe_df) > max_rows:
         safe_df = safe_df.head(max_rows)
@@ -4510,12 +3927,19 @@ def ai_chat_response(
             return f"Σφάλμα Gemini: {e}"
 
 
-def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | None = None) -> pd.DataFrame:
+def generate_audit_report(
+    data_df: pd.DataFrame,
+    extra_data_df: pd.DataFrame | None = None,
+    case: 'AtlasCase | None' = None,
+) -> pd.DataFrame:
+    """case: AtlasCase του data_df — κενά, καταμέτρηση και παράλληλη (έλεγχοι 3, 4, 5 / 5Β) από εκεί."""
+    if case is None:
+        case = AtlasCase(data_df)
     audit_rows = []
 
     # Check 1: Old/New Insured
     try:
-        dates = pd.to_datetime(data_df['Από'], format='%d/%m/%Y', errors='coerce')
+        dates = typed_dates(data_df, 'Από')
         min_date = dates.min()
         if pd.notna(min_date):
             cutoff = pd.Timestamp('1993-01-01')
@@ -4533,8 +3957,8 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
     try:
         if 'Ταμείο' in data_df.columns:
             temp_df = data_df.copy()
-            temp_df['Start'] = pd.to_datetime(temp_df['Από'], format='%d/%m/%Y', errors='coerce')
-            temp_df['End'] = pd.to_datetime(temp_df['Έως'], format='%d/%m/%Y', errors='coerce')
+            temp_df['Start'] = typed_dates(temp_df, 'Από')
+            temp_df['End'] = typed_dates(temp_df, 'Έως')
             temp_df['End'] = temp_df['End'].fillna(temp_df['Start'])
             temp_df = temp_df.dropna(subset=['Start'])
 
@@ -4577,8 +4001,8 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
 
     # Check 3: Gaps και Διαστήματα χωρίς ημέρες ασφάλισης
     try:
-        gaps = find_gaps_in_insurance_data(data_df)
-        zero_duration = find_zero_duration_intervals(data_df)
+        gaps = case.gaps
+        zero_duration = case.zero_duration
 
         parts = []
         if not gaps.empty:
@@ -4624,7 +4048,7 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
     # Check 4: Απλήρωτες εισφορές — από την καταμέτρηση (επιμέρισμα μηνών/εισφορών), όχι από το κεντρικό df
     check4_added = False
     try:
-        days_df, contrib_df = get_count_allocation(data_df)
+        days_df, contrib_df = case.count_allocation
         if days_df.empty or contrib_df.empty:
             audit_rows.append({'A/A': 4, 'Έλεγχος': 'Απλήρωτες εισφορές', 'Εύρημα': '-', 'Λεπτομέρειες': 'Δεν υπάρχουν στοιχεία καταμέτρησης (Από, Έως, Ημέρες)', 'Ενέργειες': '-'})
             check4_added = True
@@ -4730,7 +4154,8 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
 
     # Check 5: Parallel Insurance (Month-based Logic)
     try:
-        valid_months = compute_parallel_months(data_df)
+        parallel = case.parallel
+        valid_months = parallel.months_2016
         p_found = bool(valid_months)
 
         if p_found:
@@ -4747,7 +4172,7 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
 
     # Check 5B: Parallel Employment 2017+ (ΙΚΑ + ΕΦΚΑ ΜΗ ΜΙΣΘΩΤΗ / ΕΦΚΑ ΜΙΣΘΩΤΗ + ΕΦΚΑ ΜΗ ΜΙΣΘΩΤΗ)
     try:
-        valid_months_2017 = compute_parallel_months_2017(data_df)
+        valid_months_2017 = parallel.months_2017
         p2017_found = bool(valid_months_2017)
         if p2017_found:
             audit_rows.append({
@@ -4767,8 +4192,8 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
 
         if 'Α-Μ εργοδότη' in data_df.columns:
             m_df = data_df.copy()
-            m_df['Start'] = pd.to_datetime(m_df['Από'], format='%d/%m/%Y', errors='coerce')
-            m_df['End'] = pd.to_datetime(m_df['Έως'], format='%d/%m/%Y', errors='coerce')
+            m_df['Start'] = typed_dates(m_df, 'Από')
+            m_df['End'] = typed_dates(m_df, 'Έως')
             m_df = m_df.dropna(subset=['Start', 'End'])
 
             def is_ika_multi(row):
@@ -4776,7 +4201,7 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
                 t = str(row.get('Ταμείο', '')).upper()
                 return ('IKA' in t or 'ΙΚΑ' in t) and et in ['01', '1', '16', '99']
 
-            m_df['is_ika'] = m_df.apply(is_ika_multi, axis=1)
+            m_df['is_ika'] = _atlas_key_flags(m_df, {'is_ika': is_ika_multi}, ['Ταμείο', 'Τύπος Αποδοχών'])['is_ika']
             m_df = m_df[m_df['is_ika']]
 
             m_df['Emp'] = m_df['Α-Μ εργοδότη'].astype(str).str.strip().replace(['nan', 'None', '', 'NaN'], pd.NA)
@@ -4853,7 +4278,7 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
     try:
         if 'Από' in data_df.columns and 'Μικτές αποδοχές' in data_df.columns and 'Μήνες' in data_df.columns:
             t_df = data_df.copy()
-            t_df['Dt'] = pd.to_datetime(t_df['Από'], format='%d/%m/%Y', errors='coerce')
+            t_df['Dt'] = typed_dates(t_df, 'Από')
             t_df['Y'] = t_df['Dt'].dt.year
 
             def get_val_chk(x):
@@ -4864,7 +4289,7 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
                 return x if pd.notna(x) else 0.0
 
             t_df['G'] = t_df['Μικτές αποδοχές'].apply(get_val_chk)
-            t_df['M'] = t_df['Μήνες'].apply(lambda x: clean_numeric_value(x) or 1)
+            t_df['M'] = clean_numeric_series(t_df['Μήνες']).replace(0.0, 1)
 
             min_dt = t_df['Dt'].min()
             is_p = False
@@ -4899,8 +4324,8 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
     try:
         if 'Από' in data_df.columns and 'Έως' in data_df.columns:
             t_df = data_df.copy()
-            t_df['D_From'] = pd.to_datetime(t_df['Από'], format='%d/%m/%Y', errors='coerce')
-            t_df['D_To'] = pd.to_datetime(t_df['Έως'], format='%d/%m/%Y', errors='coerce')
+            t_df['D_From'] = typed_dates(t_df, 'Από')
+            t_df['D_To'] = typed_dates(t_df, 'Έως')
             t_df['Duration'] = (t_df['D_To'] - t_df['D_From']).dt.days + 1
 
             def get_num(val):
@@ -5042,17 +4467,129 @@ def generate_audit_report(data_df: pd.DataFrame, extra_data_df: pd.DataFrame | N
     return pd.DataFrame(audit_rows)
 
 
-def _atlas_results_data_signature(df: pd.DataFrame | None, source_filename: str) -> tuple:
-    """Υπογραφή για invalidation cache αποτελεσμάτων (μόνο στο session του χρήστη, όχι μεταξύ χρηστών)."""
+def _atlas_data_fingerprint(df: pd.DataFrame | None) -> str:
+    """content_fingerprint του df — του extracted_data από το ingest, αλλιώς υπολογίζεται εδώ."""
     if df is None:
-        return (str(source_filename or ""), 0, 0, 0)
-    n = len(df)
-    m = int(df.shape[1]) if n else 0
-    return (str(source_filename or ""), n, m, id(df))
+        return ""
+    if df is st.session_state.get("extracted_data"):
+        stored = st.session_state.get("extracted_data_fingerprint")
+        if stored:
+            return stored
+    return content_fingerprint(df)
+
+
+def _atlas_results_data_signature(df: pd.DataFrame | None, source_filename: str) -> tuple:
+    """Υπογραφή για invalidation cache αποτελεσμάτων (μόνο στο session του χρήστη, όχι μεταξύ χρηστών).
+
+    Βασίζεται στο περιεχόμενο (content_fingerprint): αντίγραφα των ίδιων δεδομένων δίνουν την ίδια υπογραφή.
+    """
+    return (str(source_filename or ""), _atlas_data_fingerprint(df))
+
+
+class AtlasCase:
+    """Ένας φάκελος (df) και τα παράγωγά του, το καθένα υπολογισμένο το πολύ μία φορά.
+
+    Κάθε ιδιότητα υπολογίζεται την πρώτη φορά που ζητείται και κρατιέται· τα αποτελέσματα είναι
+    κοινά (audit, HTML αναφορά, JSON, σελίδα αποτελεσμάτων) — όποιος τα αλλάζει παίρνει αντίγραφο.
+    Το df δεν αλλάζει μετά τη δημιουργία· fingerprint (content_fingerprint) ταυτοποιεί τα δεδομένα.
+    """
+
+    __slots__ = ('df', '_memo')
+
+    def __init__(self, df: pd.DataFrame, description_map: dict | None = None, fingerprint: str | None = None):
+        self.df = df
+        self._memo = {}
+        if description_map is not None:
+            self._memo['description_map'] = description_map
+        if fingerprint:
+            self._memo['fingerprint'] = fingerprint
+
+    def _get(self, key, build):
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    @property
+    def fingerprint(self) -> str:
+        return self._get('fingerprint', lambda: content_fingerprint(self.df))
+
+    @property
+    def description_map(self) -> dict[str, str]:
+        return self._get('description_map', lambda: build_description_map(self.df))
+
+    @property
+    def count_df(self) -> pd.DataFrame:
+        """Γραμμές καταμέτρησης (χωρίς τα εξαιρούμενα πακέτα)."""
+        def _build():
+            from html_viewer_builder import filter_count_df
+            return filter_count_df(self.df)
+        return self._get('count_df', _build)
+
+    @property
+    def c_df(self) -> pd.DataFrame:
+        """Μηνιαίες γραμμές καταμέτρησης (build_count_c_dataframe)."""
+        return self._get('c_df', lambda: build_count_c_dataframe(self.count_df, self.description_map))
+
+    def count_report(self, force_insurance_type_subtotals: bool = False):
+        """build_count_report της καταμέτρησης (ένα αποτέλεσμα ανά εμφάνιση γραμμών «Σύνολο τύπου ασφάλισης»).
+
+        force_insurance_type_subtotals=True (HTML): πάντα οι γραμμές υποσυνόλου· αλλιώς όπως η τρέχουσα
+        επιλογή πακέτων (cnt_filter_klados), που διαβάζεται εδώ και περνά ρητά στο build_count_report.
+        """
+        subtotals = bool(force_insurance_type_subtotals) or _atlas_count_subtotals_selected()
+        return self._get(
+            ('count_report', subtotals),
+            lambda: build_count_report(
+                self.count_df, description_map=self.description_map, show_count_totals_only=False,
+                c_df=self.c_df, insurance_type_subtotals=subtotals,
+            ),
+        )
+
+    @property
+    def count_allocation(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """(days_df, contrib_df) του get_count_allocation — έλεγχος 4 και «Περίπλοκο αρχείο»."""
+        return self._get('count_allocation', lambda: get_count_allocation(self.df))
+
+    def summary_display(self, basis_label: str | None = None) -> pd.DataFrame:
+        """Συνοπτική Αναφορά ανά συντελεστές υπολογισμού (None = η τρέχουσα επιλογή «ins_days_basis»)."""
+        basis_label = _atlas_ins_days_basis(basis_label)
+        return self._get(('summary_display', basis_label), lambda: (
+            build_summary_grouped_display(self.df, self.df, basis_label)
+            if 'Κλάδος/Πακέτο Κάλυψης' in self.df.columns
+            else pd.DataFrame()
+        ))
+
+    @property
+    def gaps(self) -> pd.DataFrame:
+        return self._get('gaps', lambda: find_gaps_in_insurance_data(self.df))
+
+    @property
+    def zero_duration(self) -> pd.DataFrame:
+        return self._get('zero_duration', lambda: find_zero_duration_intervals(self.df))
 
+    @property
+    def parallel(self) -> ParallelAnalysis:
+        return self._get('parallel', lambda: analyze_parallel(self.df, self.description_map))
 
-def ensure_atlas_gaps_audit_cache(df: pd.DataFrame, source_filename: str) -> None:
-    """Υπολογίζει μία φορά gaps, zero_duration και audit· αποθηκεύει σε st.session_state."""
+    @property
+    def complex_metrics(self) -> tuple[int, int, int, int]:
+        return self._get('complex_metrics', lambda: compute_complex_file_metrics(self.df, self))
+
+    @property
+    def audit(self) -> pd.DataFrame:
+        return self._get('audit', lambda: generate_audit_report(self.df, case=self))
+
+    @property
+    def syntaksi_payload(self) -> dict:
+        """Δεδομένα της καρτέλας Συντάξιμες του HTML viewer."""
+        def _build():
+            from html_viewer_builder import _syntaksi_build_payload
+            return _syntaksi_build_payload(self.df, self.description_map, self)
+        return self._get('syntaksi_payload', _build)
+
+
+def ensure_atlas_gaps_audit_cache(df: pd.DataFrame, source_filename: str, description_map: dict | None = None) -> None:
+    """Κρατά στο st.session_state το AtlasCase του τρέχοντος φακέλου (νέο μόνο όταν αλλάξει το αρχείο)."""
     sig = _atlas_results_data_signature(df, source_filename)
     prev_sig = st.session_state.get("_atlas_analytics_sig")
     if prev_sig == sig:
@@ -5060,28 +4597,136 @@ def ensure_atlas_gaps_audit_cache(df: pd.DataFrame, source_filename: str) -> Non
     if prev_sig is not None:
         for _k in ("ai_chat_context", "ai_chat_history", "main_ai_summary_result"):
             st.session_state.pop(_k, None)
+    case = st.session_state.get("_atlas_case")
     if df is None or df.empty:
-        st.session_state["_atlas_analytics_sig"] = sig
-        st.session_state["_atlas_cached_gaps"] = pd.DataFrame()
-        st.session_state["_atlas_cached_zero_duration"] = pd.DataFrame()
-        st.session_state["_atlas_cached_audit"] = pd.DataFrame()
-        return
-    st.session_state["_atlas_cached_gaps"] = find_gaps_in_insurance_data(df)
-    st.session_state["_atlas_cached_zero_duration"] = find_zero_duration_intervals(df)
-    st.session_state["_atlas_cached_audit"] = generate_audit_report(df)
+        st.session_state.pop("_atlas_case", None)
+    elif case is None or case.fingerprint != sig[1]:
+        st.session_state["_atlas_case"] = AtlasCase(df, description_map, sig[1])
     st.session_state["_atlas_analytics_sig"] = sig
 
 
+def get_atlas_case(df: pd.DataFrame, description_map: dict | None = None) -> AtlasCase:
+    """AtlasCase του df από το session (νέο, και αποθηκεύεται, αν το session κρατά άλλα δεδομένα)."""
+    fingerprint = _atlas_data_fingerprint(df)
+    case = st.session_state.get("_atlas_case")
+    if case is None or case.fingerprint != fingerprint:
+        case = AtlasCase(df, description_map, fingerprint)
+        st.session_state["_atlas_case"] = case
+    return case
+
+
+def _atlas_cached_case_df(name: str) -> pd.DataFrame:
+    case = st.session_state.get("_atlas_case")
+    if case is None:
+        return pd.DataFrame()
+    return getattr(case, name)
+
+
 def get_atlas_cached_gaps_df() -> pd.DataFrame:
-    return st.session_state.get("_atlas_cached_gaps", pd.DataFrame())
+    return _atlas_cached_case_df("gaps")
 
 
 def get_atlas_cached_zero_duration_df() -> pd.DataFrame:
-    return st.session_state.get("_atlas_cached_zero_duration", pd.DataFrame())
+    return _atlas_cached_case_df("zero_duration")
 
 
 def get_atlas_cached_audit_df() -> pd.DataFrame:
-    return st.session_state.get("_atlas_cached_audit", pd.DataFrame())
+    return _atlas_cached_case_df("audit")
+
+
+def get_atlas_cached_parallel(df: pd.DataFrame, description_map: dict | None = None) -> ParallelAnalysis:
+    """analyze_parallel του τρέχοντος φακέλου από το AtlasCase του session."""
+    return get_atlas_case(df, description_map).parallel
+
+
+# Κατηγορίες της atlas_session_memory_usage → κλειδιά st.session_state
+_ATLAS_SESSION_MEMORY_GROUPS = {
+    "pdf": ("uploaded_file",),
+    "data": ("extracted_data",),
+    "caches": ("_atlas_case", "ai_chat_context", "main_ai_summary_result"),
+    "exports": (
+        "atlas_view_exports", "atlas_export_main_df",
+        "atlas_export_extra_df", "atlas_export_apd_df",
+    ),
+}
+
+
+def _atlas_nbytes(obj, seen: set | None = None) -> int:
+    """Εκτίμηση bytes μνήμης: DataFrame/Series (deep), κείμενο, συλλογές, thunks και αντικείμενα με __slots__.
+
+    Κάθε αντικείμενο μετράει μία φορά (κοινά DataFrame μεταξύ κλειδιών δεν διπλομετρούνται).
+    """
+    if seen is None:
+        seen = set()
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, _AtlasPdfUpload):
+        return obj.resident_bytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_atlas_nbytes(k, seen) + _atlas_nbytes(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(_atlas_nbytes(v, seen) for v in obj)
+    if callable(obj) and getattr(obj, "__closure__", None):
+        # thunk (π.χ. atlas_view_exports): μετράνε οι τιμές που κρατά ζωντανές
+        size = sys.getsizeof(obj)
+        for cell in obj.__closure__:
+            try:
+                size += _atlas_nbytes(cell.cell_contents, seen)
+            except ValueError:
+                pass
+        return size
+    slots = [name for klass in type(obj).__mro__ for name in getattr(klass, "__slots__", ())]
+    if slots:
+        return sys.getsizeof(obj) + sum(_atlas_nbytes(getattr(obj, name, None), seen) for name in slots)
+    nbytes = getattr(obj, "nbytes", None)
+    return int(nbytes) if isinstance(nbytes, int) else sys.getsizeof(obj)
+
+
+def atlas_session_memory_usage() -> dict[str, int]:
+    """Bytes που κρατά το session ανά κατηγορία (pdf, data, caches, exports) και total."""
+    seen: set = set()
+    usage = {
+        group: sum(_atlas_nbytes(st.session_state.get(key), seen) for key in keys)
+        for group, keys in _ATLAS_SESSION_MEMORY_GROUPS.items()
+    }
+    usage["total"] = sum(usage.values())
+    return usage
+
+
+def _atlas_render_session_memory_readout() -> None:
+    """Ένδειξη μνήμης session στο sidebar (μόνο με ATLAS_MEMORY_READOUT=1· κατάσταση στην αρχή του rerun)."""
+    if os.getenv("ATLAS_MEMORY_READOUT", "0").strip() != "1":
+        return
+    usage = atlas_session_memory_usage()
+    labels = {"pdf": "PDF", "data": "Δεδομένα", "caches": "Cache αναλύσεων", "exports": "Εξαγωγές", "total": "Σύνολο"}
+    lines = [f"{labels[k]}: {v / (1024 * 1024):.1f} MB" for k, v in usage.items()]
+    report_cache = get_report_cache()
+    if report_cache is not None:
+        rc = report_cache.stats()
+        lines.append(
+            f"HTML cache (διεργασία): {rc['bytes'] / (1024 * 1024):.1f} MB, "
+            f"{rc['hits']} hits / {rc['misses']} misses"
+        )
+    with st.sidebar:
+        st.caption("Μνήμη session")
+        st.caption("  \n".join(lines))
+
+
+def _atlas_ins_days_basis(basis_label: str | None = None) -> str:
+    """Συντελεστές υπολογισμού ημερών: το basis_label ή η επιλογή «ins_days_basis» του session (25/300 εκτός Streamlit)."""
+    if basis_label is not None:
+        return str(basis_label)
+    try:
+        return str(st.session_state.get('ins_days_basis', 'Μήνας = 25, Έτος = 300'))
+    except Exception:
+        return 'Μήνας = 25, Έτος = 300'
 
 
 def build_summary_grouped_display(summary_df: pd.DataFrame, source_df: pd.DataFrame, basis_label: str | None = None) -> pd.DataFrame:
@@ -5098,10 +4743,10 @@ def build_summary_grouped_display(summary_df: pd.DataFrame, source_df: pd.DataFr
     currency_columns = ['Μικτές αποδοχές', 'Συνολικές εισφορές']
     for col in numeric_columns:
         if col in summary_df.columns:
-            summary_df[col] = summary_df[col].apply(clean_numeric_value)
+            summary_df[col] = typed_numeric(summary_df, col)
     for col in currency_columns:
         if col in summary_df.columns:
-            summary_df[col] = summary_df[col].apply(lambda x: clean_numeric_value(x, exclude_drx=True))
+            summary_df[col] = typed_numeric(summary_df, col, exclude_drx=True)
 
     summary_df = apply_negative_time_sign(summary_df)
 
@@ -5111,13 +4756,8 @@ def build_summary_grouped_display(summary_df: pd.DataFrame, source_df: pd.DataFr
     if 'Τύπος Ασφάλισης' in summary_df.columns:
         group_keys.append('Τύπος Ασφάλισης')
 
-    if basis_label is None:
-        try:
-            basis_label = st.session_state.get('ins_days_basis', 'Μήνας = 25, Έτος = 300')
-        except Exception:
-            basis_label = 'Μήνας = 25, Έτος = 300'
-
-    if str(basis_label).startswith('Μήνας = 30'):
+    basis_label = _atlas_ins_days_basis(basis_label)
+    if basis_label.startswith('Μήνας = 30'):
         month_days, year_days = 30, 360
     else:
         month_days, year_days = 25, 300
@@ -5219,7 +4859,7 @@ def build_summary_grouped_display(summary_df: pd.DataFrame, source_df: pd.DataFr
     display_summary = summary_final.copy()
     for curr_col in ['Μικτές αποδοχές', 'Συνολικές εισφορές']:
         if curr_col in display_summary.columns:
-            display_summary[curr_col] = display_summary[curr_col].apply(format_currency)
+            display_summary[curr_col] = format_currency_series(display_summary[curr_col])
     if _col_eisf_pct in display_summary.columns:
         def _fmt_eisf_pct(v):
             if pd.isna(v) or v is None or v == '':
@@ -5249,80 +4889,9 @@ def get_count_allocation(count_df: pd.DataFrame, description_map: dict[str, str]
     required_cols = ['Από', 'Έως', 'Ημέρες']
     if not all(col in count_df.columns for col in required_cols):
         return pd.DataFrame(), pd.DataFrame()
-    counting_rows = []
-    def _get_num(val):
-        try: return clean_numeric_value(val) or 0
-        except Exception: return 0
-    def _is_expected_oaee(r, duration_days):
-        tam = str(r.get('Ταμείο', '')).upper()
-        if 'ΟΑΕΕ' not in tam: return False
-        months_val, days_val = _get_num(r.get('Μήνες')), _get_num(r.get('Ημέρες'))
-        if months_val and months_val <= 2:
-            if days_val and abs(days_val - months_val * 25) <= 1: return True
-            if not days_val and duration_days <= 62: return True
-        return False
-    def _is_expected_tsm(r, duration_days, start_dt, end_dt):
-        tam = str(r.get('Ταμείο', '')).upper()
-        if 'ΤΣΜΕΔΕ' not in tam: return False
-        months_val, days_val = _get_num(r.get('Μήνες')), _get_num(r.get('Ημέρες'))
-        if pd.notna(start_dt) and pd.notna(end_dt) and start_dt.year == end_dt.year:
-            sem1, sem2 = (start_dt.month == 1 and end_dt.month == 6), (start_dt.month == 7 and end_dt.month == 12)
-            if sem1 or sem2:
-                if months_val == 6 and (not days_val or abs(days_val - 150) <= 2): return True
-                if not months_val and 150 <= duration_days <= 190: return True
-        return False
-    for _, row in count_df.iterrows():
-        try:
-            if pd.isna(row['Από']) or pd.isna(row['Έως']): continue
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
-            if pd.isna(start_dt) or pd.isna(end_dt): continue
-            duration_days = (end_dt - start_dt).days + 1
-            is_pre2002 = end_dt < pd.Timestamp('2002-01-01')
-            expected_agg = _is_expected_oaee(row, duration_days) or _is_expected_tsm(row, duration_days, start_dt, end_dt)
-            days_val = 0
-            if 'Ημέρες' in row and pd.notna(row['Ημέρες']) and str(row['Ημέρες']).strip() != '':
-                d = clean_numeric_value(row['Ημέρες'])
-                if d is not None and d != 0: days_val += d
-            if 'Έτη' in row and pd.notna(row['Έτη']):
-                y = clean_numeric_value(row['Έτη'])
-                if y is not None and y != 0: days_val += y * 300
-            if 'Μήνες' in row and pd.notna(row['Μήνες']):
-                m = clean_numeric_value(row['Μήνες'])
-                if m is not None and m != 0: days_val += m * 25
-            raw_gross = str(row.get('Μικτές αποδοχές', ''))
-            gross_val = 0.0 if ('ΔΡΧ' in raw_gross.upper() or 'DRX' in raw_gross.upper()) else (clean_numeric_value(raw_gross, exclude_drx=True) or 0.0)
-            raw_contrib = str(row.get('Συνολικές εισφορές', ''))
-            contrib_val = 0.0 if ('ΔΡΧ' in raw_contrib.upper() or 'DRX' in raw_contrib.upper()) else (clean_numeric_value(raw_contrib, exclude_drx=True) or 0.0)
-            sign = get_negative_amount_sign(gross_val, contrib_val)
-            if sign == -1: days_val = -abs(days_val)
-            tameio = str(row.get('Ταμείο', '')).strip()
-            insurance_type = str(row.get('Τύπος Ασφάλισης', '')).strip()
-            employer = str(row.get('Α-Μ εργοδότη', '')).strip()
-            klados = str(row.get('Κλάδος/Πακέτο Κάλυψης', '')).strip()
-            klados_desc = description_map.get(klados, '') if isinstance(description_map, dict) else ''
-            earnings_type = str(row.get('Τύπος Αποδοχών', '')).strip()
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                curr = curr.replace(year=curr.year + 1, month=1) if curr.month == 12 else curr.replace(month=curr.month + 1)
-            num_months = len(months_list)
-            if num_months == 0: continue
-            days_parts = distribute_days_to_months(days_val, num_months)
-            contrib_per_month = contrib_val / num_months
-            for i, m_dt in enumerate(months_list):
-                counting_rows.append({
-                    'ΕΤΟΣ': m_dt.year, 'ΤΑΜΕΙΟ': tameio, 'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': insurance_type,
-                    'ΕΡΓΟΔΟΤΗΣ': employer, 'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': klados, 'ΠΕΡΙΓΡΑΦΗ': klados_desc, 'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': earnings_type,
-                    'Μήνας_Num': m_dt.month, 'Ημέρες': days_parts[i], 'Εισφορές_Part': contrib_per_month
-                })
-        except Exception:
-            continue
-    if not counting_rows:
+    c_df = _atlas_monthly_count_frame(count_df, description_map, or_zero=True)
+    if c_df.empty:
         return pd.DataFrame(), pd.DataFrame()
-    c_df = pd.DataFrame(counting_rows)
     pivot_df = c_df.groupby(['ΕΤΟΣ', 'ΤΑΜΕΙΟ', 'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', 'ΕΡΓΟΔΟΤΗΣ', 'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', 'ΠΕΡΙΓΡΑΦΗ', 'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', 'Μήνας_Num'])['Ημέρες'].sum().reset_index()
     contrib_df = c_df.groupby(['ΕΤΟΣ', 'ΤΑΜΕΙΟ', 'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', 'ΕΡΓΟΔΟΤΗΣ', 'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', 'ΠΕΡΙΓΡΑΦΗ', 'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ', 'Μήνας_Num'])['Εισφορές_Part'].sum().reset_index()
     days_pivot = pivot_df.pivot(index=['ΕΤΟΣ', 'ΤΑΜΕΙΟ', 'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ', 'ΕΡΓΟΔΟΤΗΣ', 'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ', 'ΠΕΡΙΓΡΑΦΗ', 'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ'], columns='Μήνας_Num', values='Ημέρες').fillna(0)
@@ -5543,7 +5112,7 @@ def _compute_apd_yearly_for_syntaksi_packages(
     else:
         is_palios = False
         try:
-            _fd = pd.to_datetime(source_df["Από"], format="%d/%m/%Y", errors="coerce")
+            _fd = typed_dates(source_df, 'Από')
             if not _fd.isnull().all() and _fd.min() < pd.Timestamp("1993-01-01"):
                 is_palios = True
         except Exception:
@@ -5551,7 +5120,7 @@ def _compute_apd_yearly_for_syntaksi_packages(
         plafond_map = PLAFOND_PALIOS if is_palios else PLAFOND_NEOS
     earnings_col = next((c for c in sub.columns if "Τύπος Αποδοχών" in c), None)
 
-    sub["_y"] = pd.to_datetime(sub["Από"], format="%d/%m/%Y", errors="coerce").dt.year
+    sub["_y"] = typed_dates(sub, 'Από').dt.year
     for year_raw in sub["_y"].dropna().unique():
         y = int(year_raw)
         if y < 2002:
@@ -5664,7 +5233,7 @@ def df_has_tsmede_misthoti_insurance(df: pd.DataFrame) -> bool:
     is_tsmede = t_up.str.contains('ΤΣΜΕΔΕ', na=False) | t_up.str.contains('TSMEDE', na=False)
     if not is_tsmede.any():
         return False
-    kind = df['Τύπος Ασφάλισης'].apply(insurance_kind_classify_count)
+    kind = _atlas_map_unique(df['Τύπος Ασφάλισης'], insurance_kind_classify_count)
     return bool((is_tsmede & (kind == 'ΜΙΣΘΩΤΗ')).any())
 
 
@@ -5743,7 +5312,7 @@ def compute_kind_monthly_capped_from_c_df(c_df_src: pd.DataFrame, year: int, kin
     sub = c_df_src[c_df_src['ΕΤΟΣ'] == year].copy()
     if sub.empty:
         return {m: 0.0 for m in range(1, 13)}
-    sub['_k'] = sub['ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ'].apply(insurance_kind_classify_count)
+    sub['_k'] = _atlas_map_unique(sub['ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ'], insurance_kind_classify_count)
     if kind_code is not None:
         sub = sub[sub['_k'] == kind_code]
     if sub.empty:
@@ -5763,7 +5332,7 @@ def compute_ika_misthoti_monthly_from_c_df(c_df_src: pd.DataFrame, year: int) ->
     sub = c_df_src[c_df_src['ΕΤΟΣ'] == year].copy()
     if sub.empty:
         return {m: 0.0 for m in range(1, 13)}
-    sub['_k'] = sub['ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ'].apply(insurance_kind_classify_count)
+    sub['_k'] = _atlas_map_unique(sub['ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ'], insurance_kind_classify_count)
     sub = sub[sub['_k'] == 'ΜΙΣΘΩΤΗ']
     tameio_u = sub['ΤΑΜΕΙΟ'].astype(str).str.upper()
     sub = sub[tameio_u.str.contains('ΙΚΑ', na=False) | tameio_u.str.contains('IKA', na=False)]
@@ -5809,33 +5378,68 @@ def compute_diadochiki_total_days_from_c_df(c_df_src: pd.DataFrame) -> float:
     return total
 
 
-def build_syntaksi_annual_table(c_df: pd.DataFrame) -> pd.DataFrame:
+def build_syntaksi_annual_table(count_df: pd.DataFrame) -> pd.DataFrame:
     """Πίνακας ανά έτος: ημέρες μισθωτή/μη μισθωτή (με πλαφόν), μικτές μόνο μισθωτή, εισφορές μόνο μη μισθωτή, τεκμαρτές (προσωρινά ÷0,20).
-    Το πεδίο «Συνολικές αποδοχές» εδώ είναι προσωρινό (μικτές+τεκμαρτές)· στην καρτέλα Συντάξιμες επανυπολογίζεται ως Συντ. αποδοχές (μικτές μισθωτή από καταμέτρηση)+τεκμαρτές (με κοιν. πόρους και επιλεγμένο %) πριν το ΔΤΚ."""
-    if c_df is None or c_df.empty:
+    Το πεδίο «Συνολικές αποδοχές» εδώ είναι προσωρινό (μικτές+τεκμαρτές)· στην καρτέλα Συντάξιμες επανυπολογίζεται ως Συντ. αποδοχές (μικτές μισθωτή από καταμέτρηση)+τεκμαρτές (με κοιν. πόρους και επιλεγμένο %) πριν το ΔΤΚ.
+
+    count_df: γραμμές Καταμέτρησης (όπως στο build_count_c_dataframe). Τα ετήσια σύνολα βγαίνουν
+    απευθείας ανά (διάστημα, έτος) με explode_years· μηνιαίες γραμμές μόνο για (έτος, τύπο, ταμείο)
+    όπου το πλαφόν μήνα (compute_kind_monthly_capped_from_c_df) μπορεί να κόψει ημέρες."""
+    required_cols = ['Από', 'Έως', 'Ημέρες']
+    if count_df is None or count_df.empty or not all(col in count_df.columns for col in required_cols):
+        return pd.DataFrame()
+    start_dates, end_dates = interval_dates(count_df)
+    days, gross, contrib = _atlas_signed_interval_values(count_df)
+    years = explode_years(start_dates, end_dates, days=days, gross=gross, contrib=contrib)
+    if not len(years):
         return pd.DataFrame()
-    years = sorted({int(y) for y in c_df['ΕΤΟΣ'].dropna().unique()})
+
+    tameio = _atlas_row_text(count_df, 'Ταμείο')
+    kind = _atlas_map_unique(_atlas_row_text(count_df, 'Τύπος Ασφάλισης'), insurance_kind_classify_count)
+    y_df = pd.DataFrame({
+        'ΕΤΟΣ': years.year,
+        'ΤΑΜΕΙΟ': years.take(tameio),
+        '_k': years.take(kind),
+        'Ημέρες': years.days,
+        '_peak': years.peak,
+        'Μικτές_Part': years.gross,
+        'Εισφορές_Part': years.contrib,
+    })
+    cap_keys = ['ΕΤΟΣ', '_k', 'ΤΑΜΕΙΟ']
+    cap = _atlas_map_unique(y_df['ΤΑΜΕΙΟ'], tameio_monthly_cap_days_count)
+    monthly = _atlas_month_cap_may_bind(y_df, cap_keys, cap)
+
+    days_by_kind = y_df[~monthly].groupby(['ΕΤΟΣ', '_k'])['Ημέρες'].sum()
+    if monthly.any():
+        parts = explode_year_months(start_dates, end_dates, days, years, monthly.to_numpy())
+        m_df = pd.DataFrame({
+            'ΕΤΟΣ': parts.year,
+            '_k': parts.take(kind),
+            'ΤΑΜΕΙΟ': parts.take(tameio),
+            'Μήνας_Num': parts.month,
+            'Ημέρες': parts.days,
+        })
+        g = m_df.groupby(cap_keys + ['Μήνας_Num'], as_index=False)['Ημέρες'].sum()
+        g['_capped'] = g['Ημέρες'].clip(upper=_atlas_map_unique(g['ΤΑΜΕΙΟ'], tameio_monthly_cap_days_count))
+        days_by_kind = days_by_kind.add(g.groupby(['ΕΤΟΣ', '_k'])['_capped'].sum(), fill_value=0)
+
+    gross_m = y_df[y_df['_k'] == 'ΜΙΣΘΩΤΗ'].groupby('ΕΤΟΣ')['Μικτές_Part'].sum()
+    contrib_nm = y_df[y_df['_k'] == 'ΜΗ ΜΙΣΘΩΤΗ'].groupby('ΕΤΟΣ')['Εισφορές_Part'].sum()
     rows = []
-    for y in years:
-        days_m = compute_count_year_kind_total_days(c_df, y, 'ΜΙΣΘΩΤΗ')
-        days_nm = compute_count_year_kind_total_days(c_df, y, 'ΜΗ ΜΙΣΘΩΤΗ')
-        sub = c_df[c_df['ΕΤΟΣ'] == y].copy()
-        sub['_k'] = sub['ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ'].apply(insurance_kind_classify_count)
-        gross_m = float(sub[sub['_k'] == 'ΜΙΣΘΩΤΗ']['Μικτές_Part'].sum()) if 'Μικτές_Part' in sub.columns else 0.0
-        contrib_t = (
-            float(sub[sub['_k'] == 'ΜΗ ΜΙΣΘΩΤΗ']['Εισφορές_Part'].sum())
-            if 'Εισφορές_Part' in sub.columns
-            else 0.0
-        )
+    for y in sorted({int(y) for y in y_df['ΕΤΟΣ'].unique()}):
+        days_m = float(days_by_kind.get((y, 'ΜΙΣΘΩΤΗ'), 0.0))
+        days_nm = float(days_by_kind.get((y, 'ΜΗ ΜΙΣΘΩΤΗ'), 0.0))
+        gross_y = float(gross_m.get(y, 0.0))
+        contrib_t = float(contrib_nm.get(y, 0.0))
         tekmark = _syntaksi_eisfores_to_tekmark(contrib_t, 0.20)
         rows.append({
             'Έτος': y,
             'Σύνολο ημερών (μισθωτή)': days_m,
-            'Συνολικές μικτές αποδοχές': gross_m,
+            'Συνολικές μικτές αποδοχές': gross_y,
             'Σύνολο ημερών (μη μισθωτή)': days_nm,
             'Συνολικές εισφορές': contrib_t,
             'Τεκμαρτές αποδοχές': tekmark,
-            'Συνολικές αποδοχές': gross_m + tekmark,
+            'Συνολικές αποδοχές': gross_y + tekmark,
         })
     return pd.DataFrame(rows)
 
@@ -6395,8 +5999,6 @@ def build_count_c_dataframe(count_df: pd.DataFrame, description_map: dict[str, s
     if not all(col in count_df.columns for col in required_cols):
         return pd.DataFrame()
 
-    counting_rows = []
-
     def _get_num(val):
         try:
             return clean_numeric_value(val) or 0
@@ -6432,105 +6034,14 @@ def build_count_c_dataframe(count_df: pd.DataFrame, description_map: dict[str, s
                     return True
         return False
 
-    for _, row in count_df.iterrows():
-        try:
-            if pd.isna(row['Από']) or pd.isna(row['Έως']):
-                continue
-
-            start_dt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            end_dt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
-
-            if pd.isna(start_dt) or pd.isna(end_dt):
-                continue
-
-            duration_days = (end_dt - start_dt).days + 1
-            is_pre2002 = end_dt < pd.Timestamp('2002-01-01')
-            expected_agg_pattern = _is_expected_oaee(row, duration_days) or _is_expected_tsm(row, duration_days, start_dt, end_dt)
-
-            days_val = 0
-            if 'Ημέρες' in row and pd.notna(row['Ημέρες']) and str(row['Ημέρες']).strip() != '':
-                d = clean_numeric_value(row['Ημέρες'])
-                if d is not None and d != 0:
-                    days_val += d
-
-            if 'Έτη' in row and pd.notna(row['Έτη']):
-                y = clean_numeric_value(row['Έτη'])
-                if y is not None and y != 0:
-                    days_val += y * 300
-
-            if 'Μήνες' in row and pd.notna(row['Μήνες']):
-                m = clean_numeric_value(row['Μήνες'])
-                if m is not None and m != 0:
-                    days_val += m * 25
-
-            raw_gross = str(row.get('Μικτές αποδοχές', ''))
-            if 'ΔΡΧ' in raw_gross.upper() or 'DRX' in raw_gross.upper():
-                gross_val = 0.0
-            else:
-                gross_val = clean_numeric_value(raw_gross, exclude_drx=True)
-            if gross_val is None:
-                gross_val = 0.0
-
-            raw_contrib = str(row.get('Συνολικές εισφορές', ''))
-            if 'ΔΡΧ' in raw_contrib.upper() or 'DRX' in raw_contrib.upper():
-                contrib_val = 0.0
-            else:
-                contrib_val = clean_numeric_value(raw_contrib, exclude_drx=True)
-            if contrib_val is None:
-                contrib_val = 0.0
-
-            sign = get_negative_amount_sign(gross_val, contrib_val)
-            if sign == -1:
-                days_val = -abs(days_val)
-
-            tameio = str(row.get('Ταμείο', '')).strip()
-            insurance_type = str(row.get('Τύπος Ασφάλισης', '')).strip()
-            employer = str(row.get('Α-Μ εργοδότη', '')).strip()
-            klados = str(row.get('Κλάδος/Πακέτο Κάλυψης', '')).strip()
-            klados_desc = description_map.get(klados, '') if isinstance(description_map, dict) else ''
-            earnings_type = str(row.get('Τύπος Αποδοχών', '')).strip()
-
-            curr = start_dt.replace(day=1)
-            end_month_dt = end_dt.replace(day=1)
-
-            months_list = []
-            while curr <= end_month_dt:
-                months_list.append(curr)
-                if curr.month == 12:
-                    curr = curr.replace(year=curr.year + 1, month=1)
-                else:
-                    curr = curr.replace(month=curr.month + 1)
-
-            num_months = len(months_list)
-            if num_months == 0:
-                continue
-
-            days_parts = distribute_days_to_months(days_val, num_months)
-            gross_per_month = gross_val / num_months
-            contrib_per_month = contrib_val / num_months
-            is_aggregate = (num_months > 1) and is_pre2002 and (duration_days > 31) and not expected_agg_pattern
-
-            for i, m_dt in enumerate(months_list):
-                counting_rows.append({
-                    'ΕΤΟΣ': m_dt.year,
-                    'ΤΑΜΕΙΟ': tameio,
-                    'ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ': insurance_type,
-                    'ΕΡΓΟΔΟΤΗΣ': employer,
-                    'ΚΛΑΔΟΣ/ΠΑΚΕΤΟ': klados,
-                    'ΠΕΡΙΓΡΑΦΗ': klados_desc,
-                    'ΤΥΠΟΣ ΑΠΟΔΟΧΩΝ': earnings_type,
-                    'Μήνας_Num': m_dt.month,
-                    'Ημέρες': days_parts[i],
-                    'Μικτές_Part': gross_per_month,
-                    'Εισφορές_Part': contrib_per_month,
-                    'Is_Aggregate': is_aggregate
-                })
-        except Exception:
-            continue
+    def _is_aggregate(row, start_dt, end_dt, num_months):
+        duration_days = (end_dt - start_dt).days + 1
+        expected_agg_pattern = _is_expected_oaee(row, duration_days) or _is_expected_tsm(row, duration_days, start_dt, end_dt)
+        return duration_days > 31 and not expected_agg_pattern
 
-    if not counting_rows:
-        return pd.DataFrame()
-    return pd.DataFrame(counting_rows)
+    return _atlas_monthly_count_frame(
+        count_df, description_map, aggregate_rule=_is_aggregate, aggregate_post2002=False,
+    )
 
 
 def _pivot_bool_month_columns(pivoted: pd.DataFrame) -> None:
@@ -6569,12 +6080,30 @@ def _count_display_df_arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def build_count_report(count_df: pd.DataFrame, description_map: dict[str, str] | None = None, show_count_totals_only: bool = False, force_insurance_type_subtotals: bool = False):
+def _atlas_count_subtotals_selected() -> bool:
+    """Γραμμές «Σύνολο τύπου ασφάλισης» στο Streamlit: μόνο με επιλεγμένα πακέτα (cnt_filter_klados).
+
+    Χωρίς το widget στο session (πριν ανοίξει η Καταμέτρηση / εκτός Streamlit) → True.
+    """
+    try:
+        if "cnt_filter_klados" in st.session_state:
+            return bool(st.session_state.get("cnt_filter_klados"))
+    except Exception:
+        pass
+    return True
+
+
+def build_count_report(count_df: pd.DataFrame, description_map: dict[str, str] | None = None, show_count_totals_only: bool = False, force_insurance_type_subtotals: bool = False, c_df: pd.DataFrame | None = None, insurance_type_subtotals: bool | None = None):
+    """c_df: έτοιμο build_count_c_dataframe(count_df, description_map) (αλλιώς υπολογίζεται εδώ).
+
+    insurance_type_subtotals: ρητή εμφάνιση των γραμμών «Σύνολο τύπου ασφάλισης»· None = force ή επιλογή του session.
+    """
     required_cols = ['Από', 'Έως', 'Ημέρες']
     if not all(col in count_df.columns for col in required_cols):
         return pd.DataFrame(), [], None, [], []
 
-    c_df = build_count_c_dataframe(count_df, description_map)
+    if c_df is None:
+        c_df = build_count_c_dataframe(count_df, description_map)
     if c_df.empty:
         return pd.DataFrame(), [], None, [], []
 
@@ -6708,17 +6237,14 @@ def build_count_report(count_df: pd.DataFrame, description_map: dict[str, str] |
     # Η γραμμή "Σύνολο τύπου ασφάλισης" εμφανίζεται:
     # - στο Streamlit μόνο όταν έχουν επιλεγεί πακέτα κάλυψης (cnt_filter_klados),
     # - στην HTML: οι γραμμές υπάρχουν στο DOM αλλά κρύβονται από JS μέχρι να επιλεγεί ≥1 πακέτο.
-    _show_insurance_type_subtotals = True
-    if force_insurance_type_subtotals:
+    if insurance_type_subtotals is not None:
+        _show_insurance_type_subtotals = bool(insurance_type_subtotals)
+    elif force_insurance_type_subtotals:
         # Παραγωγή HTML: πάντα δημιουργούμε τις γραμμές υποσυνόλου στο DOM·
         # η εμφάνιση/απόκρυψη γίνεται client-side ανάλογα με τα επιλεγμένα πακέτα.
         _show_insurance_type_subtotals = True
     else:
-        try:
-            if "cnt_filter_klados" in st.session_state:
-                _show_insurance_type_subtotals = bool(st.session_state.get("cnt_filter_klados"))
-        except Exception:
-            _show_insurance_type_subtotals = True
+        _show_insurance_type_subtotals = _atlas_count_subtotals_selected()
     # Σύνολα ανά (έτος, ταμείο, τύπος): οι ημέρες ανά μήνα δεν αθροίζονται απεριόριστα
     # σε πολλαπλούς κλάδους — εφαρμόζεται το ίδιο ανώτατο ανά μήνα/ταμείο με την καταμέτρηση (25, 31 ΙΚΑ).
     insurance_type_totals = {}
@@ -7375,10 +6901,10 @@ def render_totals_tab(
     currency_columns = ['Μικτές αποδοχές', 'Συνολικές εισφορές']
     for col in numeric_columns:
         if col in summary_df.columns:
-            summary_df[col] = summary_df[col].apply(clean_numeric_value)
+            summary_df[col] = typed_numeric(summary_df, col)
     for col in currency_columns:
         if col in summary_df.columns:
-            summary_df[col] = summary_df[col].apply(lambda x: clean_numeric_value(x, exclude_drx=True))
+            summary_df[col] = typed_numeric(summary_df, col, exclude_drx=True)
     summary_df = apply_negative_time_sign(summary_df)
 
     group_keys = ['Κλάδος/Πακέτο Κάλυψης']
@@ -7493,7 +7019,7 @@ def render_totals_tab(
     display_summary = summary_final.copy()
     for curr_col in ['Μικτές αποδοχές', 'Συνολικές εισφορές']:
         if curr_col in display_summary.columns:
-            display_summary[curr_col] = display_summary[curr_col].apply(format_currency)
+            display_summary[curr_col] = format_currency_series(display_summary[curr_col])
     if _col_eisf_pct in display_summary.columns:
         def _fmt_eisf_pct(v):
             if pd.isna(v) or v is None or v == '':
@@ -7669,6 +7195,7 @@ def render_totals_tab(
 
 def main():
     """Κύρια συνάρτηση της εφαρμογής (ATLAS Lite)."""
+    _atlas_render_session_memory_readout()
     _main_inner()
 
 
@@ -7760,12 +7287,6 @@ def _main_inner():
             st.stop()
 
         upload_src = st.session_state.get("uploaded_file")
-        if upload_src is None and st.session_state.get("uploaded_file_bytes"):
-            upload_src = _AtlasPdfUpload(
-                st.session_state["uploaded_file_bytes"],
-                st.session_state.get("filename", "upload.pdf"),
-            )
-            st.session_state["uploaded_file"] = upload_src
         if upload_src is None:
             st.error("Δεν βρέθηκε το αρχείο PDF. Ανεβάστε ξανά το αρχείο.")
             st.session_state["file_uploaded"] = False
@@ -7776,12 +7297,17 @@ def _main_inner():
         try:
             with st.spinner("Ανάλυση PDF…"):
                 df = extract_efka_data(upload_src)
+            # Ingest: typed στήλες (ημερομηνίες/αριθμοί/πρόσημο) μία φορά για όλες τις αναλύσεις
+            df = add_typed_columns(df)
         finally:
             st.session_state["_atlas_extract_in_progress"] = False
 
         if not df.empty:
             st.session_state["extracted_data"] = df
+            st.session_state["extracted_data_fingerprint"] = content_fingerprint(df)
             st.session_state["processing_done"] = True
+            # Το PDF δεν χρειάζεται πια στη μνήμη (νέα εξαγωγή: από το προσωρινό αρχείο / extract_cache)
+            upload_src.spill()
             st.rerun()
         else:
             st.error("Δεν βρέθηκαν δεδομένα για εξαγωγή")
@@ -0,0 +1,178 @@
+"""
+atlas.py
+~~~~~~~~
+Γραμμή εντολών ΑΤΛΑΣ χωρίς Streamlit (cron / μαζική προεπεξεργασία PDF πελατών).
+
+    python -m atlas extract <αρχεία ή φάκελοι> [--workers N] [--out parquet|csv|json]
+
+Ίδια εξαγωγή και κανονικοποίηση με την εφαρμογή (pdf_extraction.extract_frames), με τις
+σελίδες μεγάλων αρχείων σε δεξαμενή διεργασιών. Τα αποτελέσματα γράφονται και στην
+extract_cache, οπότε το ίδιο PDF ανοίγει μετά στην εφαρμογή χωρίς νέα ανάλυση.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from extract_cache import get_extract_cache, pdf_cache_key
+from pdf_extraction import PDF_BACKEND_CHOICES, extract_frames, resolve_pdf_backend
+
+OUTPUT_FORMATS = ("parquet", "csv", "json")
+
+
+def collect_pdf_paths(inputs) -> list[Path]:
+    """Αρχεία PDF από λίστα αρχείων/φακέλων (φάκελοι: *.pdf, όχι αναδρομικά), χωρίς διπλότυπα."""
+    paths: list[Path] = []
+    seen = set()
+    for raw in inputs:
+        p = Path(raw)
+        if p.is_dir():
+            found = sorted(c for c in p.iterdir() if c.is_file() and c.suffix.lower() == ".pdf")
+        else:
+            found = [p]
+        for c in found:
+            key = c.resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(c)
+    return paths
+
+
+def write_frame(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "csv":
+        # utf-8-sig: σωστά ελληνικά όταν ανοίγει στο Excel
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    else:
+        df.to_json(path, orient="records", force_ascii=False, indent=1)
+
+
+class _ProgressLine:
+    """Ένδειξη προόδου μίας γραμμής στο stderr (μόνο σε τερματικό)."""
+
+    def __init__(self, name: str, stream=None):
+        self.name = name
+        self.stream = stream or sys.stderr
+        self.enabled = self.stream.isatty()
+        self._last = 0.0
+
+    def __call__(self, result, progress) -> None:
+        now = time.monotonic()
+        if not self.enabled or (result is not None and now - self._last < 0.2):
+            return
+        self._last = now
+        self.stream.write(
+            f"\r  {self.name}: σελίδα {progress.pages_done}/{progress.data_pages} — "
+            f"{progress.rows} γραμμές"
+        )
+        self.stream.flush()
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+
+
+def extract_file(path: Path, workers=None, backend=None, use_cache=True, on_progress=None):
+    """(DataFrame, σελίδες ή None, από cache) για ένα PDF — ίδιο αποτέλεσμα με το extract_efka_data."""
+    cache = get_extract_cache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = pdf_cache_key(path.read_bytes())
+        cached_df = cache.get(cache_key)
+        if cached_df is not None and not cached_df.empty:
+            return cached_df, None, True
+
+    frames, progress = extract_frames(str(path), workers=workers, backend=backend, on_progress=on_progress)
+    if not frames:
+        return pd.DataFrame(), progress, False
+    df = pd.concat(frames, ignore_index=True)
+    if cache is not None:
+        cache.put(cache_key, df)
+    return df, progress, False
+
+
+def cmd_extract(args) -> int:
+    if resolve_pdf_backend(args.backend) is None:
+        print("Δεν υπάρχει διαθέσιμος PDF reader: pip install pdfplumber pymupdf", file=sys.stderr)
+        return 2
+    paths = collect_pdf_paths(args.paths)
+    if not paths:
+        print("Δεν βρέθηκαν αρχεία PDF.", file=sys.stderr)
+        return 2
+    out_dir = Path(args.out_dir) if args.out_dir else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    failures = 0
+    total_rows = 0
+    t_all = time.perf_counter()
+    for path in paths:
+        line = _ProgressLine(path.name)
+        t0 = time.perf_counter()
+        try:
+            df, progress, from_cache = extract_file(
+                path, workers=args.workers, backend=args.backend,
+                use_cache=not args.no_cache, on_progress=line,
+            )
+        except Exception as e:
+            line.clear()
+            print(f"ΣΦΑΛΜΑ {path}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        line.clear()
+        elapsed = time.perf_counter() - t0
+        if df.empty:
+            print(f"ΣΦΑΛΜΑ {path}: δεν βρέθηκαν πίνακες ({elapsed:.2f}s)", file=sys.stderr)
+            failures += 1
+            continue
+        target = (out_dir or path.parent) / f"{path.stem}.{args.out}"
+        write_frame(df, target, args.out)
+        total_rows += len(df)
+        detail = "cache" if from_cache else (
+            f"{progress.pages_done} σελίδες"
+            + (f", {len(progress.failed_pages)} χωρίς πίνακα" if progress.failed_pages else "")
+        )
+        print(f"{path.name}: {len(df)} γραμμές ({detail}) σε {elapsed:.2f}s → {target}")
+
+    print(
+        f"Σύνολο: {len(paths) - failures}/{len(paths)} αρχεία, {total_rows} γραμμές "
+        f"σε {time.perf_counter() - t_all:.2f}s"
+    )
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m atlas", description="ΑΤΛΑΣ — εργαλεία χωρίς Streamlit")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_extract = sub.add_parser("extract", help="Εξαγωγή πινάκων από PDF e-EFKA σε αρχεία δεδομένων")
+    p_extract.add_argument("paths", nargs="+", help="Αρχεία PDF ή φάκελοι με PDF")
+    p_extract.add_argument(
+        "--workers", type=int, default=None,
+        help="Διεργασίες ανά αρχείο για τις σελίδες (προεπιλογή: ATLAS_EXTRACT_WORKERS)",
+    )
+    p_extract.add_argument("--out", choices=OUTPUT_FORMATS, default="parquet", help="Μορφή εξόδου")
+    p_extract.add_argument("--out-dir", default=None, help="Φάκελος εξόδου (προεπιλογή: δίπλα στο PDF)")
+    p_extract.add_argument(
+        "--backend", choices=PDF_BACKEND_CHOICES, default=None,
+        help="PDF backend (προεπιλογή: ATLAS_PDF_BACKEND ή auto)",
+    )
+    p_extract.add_argument("--no-cache", action="store_true", help="Χωρίς ανάγνωση/εγγραφή στην extract_cache")
+    p_extract.set_defaults(func=cmd_extract)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
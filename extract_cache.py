@@ -0,0 +1,196 @@
+"""
+extract_cache.py
+~~~~~~~~~~~~~~~~
+Cache στον δίσκο των εξαγμένων DataFrame ΑΤΛΑΣ, με κλειδί το περιεχόμενο του PDF.
+
+Κλειδί: SHA-256(έκδοση εξαγωγής + bytes PDF) — ίδιο αρχείο από άλλον χρήστη ή μετά από
+reset session δίνει hit· αλλαγή στη λογική εξαγωγής (EXTRACTOR_VERSION) ακυρώνει τα παλιά.
+Αποθήκευση σε Arrow IPC (memory-mapped στην ανάγνωση), όριο μεγέθους με LRU και TTL.
+Χωρίς Streamlit (κοινό για app_final.py / app_lite.py).
+
+Ρυθμίσεις (env):
+- ATLAS_EXTRACT_CACHE: "0" απενεργοποιεί την cache
+- ATLAS_EXTRACT_CACHE_DIR: φάκελος (προεπιλογή `.atlas_cache/extract` στη ρίζα repo)
+- ATLAS_EXTRACT_CACHE_MAX_MB: μέγιστο μέγεθος (προεπιλογή 256)
+- ATLAS_EXTRACT_CACHE_TTL_HOURS: διάρκεια ζωής εγγραφής (προεπιλογή 24)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from pdf_extraction import EXTRACTOR_VERSION
+
+_CACHE_SUFFIX = ".arrow"
+_DEFAULT_DIR = Path(__file__).resolve().parent / ".atlas_cache" / "extract"
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def pdf_cache_key(pdf_bytes, version: str = EXTRACTOR_VERSION) -> str:
+    """SHA-256 (hex) της έκδοσης εξαγωγής και των bytes του PDF."""
+    h = hashlib.sha256(version.encode("utf-8"))
+    h.update(b"\0")
+    h.update(pdf_bytes)
+    return h.hexdigest()
+
+
+class ExtractCache:
+    """Cache DataFrame ανά κλειδί περιεχομένου σε αρχεία Arrow IPC.
+
+    LRU με βάση το mtime (ανανεώνεται σε κάθε hit)· εγγραφές πέρα από το TTL
+    αγνοούνται και διαγράφονται. Μετρητές hits/misses/writes/evictions ανά διεργασία.
+    """
+
+    def __init__(self, root, max_bytes: int, ttl_seconds: float):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.ttl_seconds = float(ttl_seconds)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{_CACHE_SUFFIX}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - mtime > self.ttl_seconds
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """DataFrame της εγγραφής ή None (miss / έληξε / αλλοιωμένο αρχείο)."""
+        path = self._path(key)
+        try:
+            st_res = path.stat()
+        except OSError:
+            self._count("misses")
+            return None
+        now = time.time()
+        if self._expired(st_res.st_mtime, now):
+            self._remove(path)
+            self._count("misses")
+            return None
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                df = pa.ipc.open_file(source).read_all().to_pandas()
+            os.utime(path, (now, now))
+        except Exception:
+            self._remove(path)
+            self._count("errors")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """Αποθηκεύει το DataFrame (ατομική εγγραφή)· False αν δεν γίνεται σε Arrow."""
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=str(self.root), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    with pa.ipc.new_file(fh, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_name, self._path(key))
+            except BaseException:
+                self._remove(Path(tmp_name))
+                raise
+        except Exception:
+            self._count("errors")
+            return False
+        self._count("writes")
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Διαγραφή ληγμένων εγγραφών και των λιγότερο πρόσφατων μέχρι το όριο μεγέθους."""
+        now = time.time()
+        entries = []
+        try:
+            paths = list(self.root.glob(f"*{_CACHE_SUFFIX}"))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                st_res = path.stat()
+            except OSError:
+                continue
+            if self._expired(st_res.st_mtime, now):
+                self._remove(path)
+                self._count("evictions")
+                continue
+            entries.append((st_res.st_mtime, st_res.st_size, path))
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            self._count("evictions")
+            total -= size
+
+    def size_bytes(self) -> int:
+        total = 0
+        for path in self.root.glob(f"*{_CACHE_SUFFIX}"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def stats(self) -> dict:
+        """Μετρητές διεργασίας (hits, misses, writes, evictions, errors) + τρέχον μέγεθος."""
+        with self._lock:
+            out = dict(self._stats)
+        out["bytes"] = self.size_bytes()
+        return out
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+_EXTRACT_CACHE: ExtractCache | None = None
+_EXTRACT_CACHE_LOCK = threading.Lock()
+
+
+def get_extract_cache() -> ExtractCache | None:
+    """Κοινή (ανά διεργασία) cache εξαγωγής ή None αν είναι απενεργοποιημένη / λείπει pyarrow."""
+    global _EXTRACT_CACHE
+    if not PYARROW_AVAILABLE or os.getenv("ATLAS_EXTRACT_CACHE", "1").strip() == "0":
+        return None
+    with _EXTRACT_CACHE_LOCK:
+        if _EXTRACT_CACHE is None:
+            root = os.getenv("ATLAS_EXTRACT_CACHE_DIR", "").strip() or _DEFAULT_DIR
+            _EXTRACT_CACHE = ExtractCache(
+                root,
+                max_bytes=int(_env_float("ATLAS_EXTRACT_CACHE_MAX_MB", 256) * 1024 * 1024),
+                ttl_seconds=_env_float("ATLAS_EXTRACT_CACHE_TTL_HOURS", 24) * 3600,
+            )
+        return _EXTRACT_CACHE
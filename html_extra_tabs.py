@@ -22,6 +22,7 @@ import html as html_mod
 import json
 import pandas as pd
 
+from typed_schema import interval_dates, is_typed_column
 from app_final import (
     clean_numeric_value,
     apply_negative_time_sign,
@@ -148,7 +149,7 @@ def build_main_data_tab(df, description_map=None):
     main_cols = [c for c in df.columns if c not in [
         'Φορέας', 'Κωδικός Κλάδων / Πακέτων Κάλυψης', 'Περιγραφή',
         'Κωδικός Τύπου Αποδοχών', 'Σελίδα',
-    ]]
+    ] and not is_typed_column(c)]
     mdf = df[main_cols].copy() if main_cols else df.copy()
     if 'Από' in mdf.columns:
         mdf['_dt'] = pd.to_datetime(mdf['Από'], format='%d/%m/%Y', errors='coerce')
@@ -348,12 +349,11 @@ def build_apozimiosi_tab(df, description_map=None):
 
     # -- Build aggregated rows --
     rows_data = []
-    for _, row in apoz_df.iterrows():
+    start_dates, end_dates = interval_dates(apoz_df)
+    for (_, row), sdt, edt in zip(apoz_df.iterrows(), start_dates, end_dates):
         try:
             if pd.isna(row['Από']) or pd.isna(row['Έως']):
                 continue
-            sdt = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
-            edt = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
             if pd.isna(sdt) or pd.isna(edt):
                 continue
             dv = 0
@@ -498,7 +498,7 @@ def build_apd_tab(df, description_map=None):
 
     skip_cols = {'Φορέας', 'Κωδικός Κλάδων / Πακέτων Κάλυψης', 'Περιγραφή',
                  'Κωδικός Τύπου Αποδοχών', 'Σελίδα'}
-    apd_cols = [c for c in df.columns if c not in skip_cols]
+    apd_cols = [c for c in df.columns if c not in skip_cols and not is_typed_column(c)]
     apd_df = _excl_unused(df[apd_cols].copy())
 
     if 'Τύπος Ασφάλισης' in apd_df.columns:
@@ -27,25 +27,20 @@ import unicodedata
 
 import pandas as pd
 
+from typed_schema import clean_numeric_series, is_typed_column
 from app_final import (
     build_print_section_html,
     build_print_table_html,
     build_yearly_print_html,
-    build_count_report,
     build_count_c_dataframe,
     build_syntaksi_annual_table,
     build_description_map,
-    build_parallel_print_df,
-    build_parallel_2017_print_df,
-    build_multi_employment_print_df,
-    build_summary_grouped_display,
+    analyze_parallel,
+    AtlasCase,
     compute_summary_capped_days_by_group,
     compute_summary_capped_dk,
-    compute_complex_file_metrics,
     find_gaps_in_insurance_data,
     find_negative_entries,
-    find_zero_duration_intervals,
-    generate_audit_report,
     get_print_disclaimer_html,
     should_show_complex_file_warning,
     clean_numeric_value,
@@ -57,9 +52,6 @@ from app_final import (
     format_currency,
     format_maindata_display_df,
     APODOXES_DESCRIPTIONS,
-    compute_parallel_summary_metrics,
-    compute_parallel_2017_summary_metrics,
-    compute_multi_employment_summary_metrics,
     _compute_apd_yearly_for_syntaksi_packages,
     _syntaksi_oga_tekmark_rate_decimal,
     df_has_tsmede_misthoti_insurance,
@@ -68,10 +60,7 @@ from app_final import (
     SYN_TEKMARK_RATE_LABELS,
     SYN_TEKMARK_RATE_DEFAULT,
     SYN_TEKMARK_OGA_LABEL,
-    _parallel_month_groups_until_2016,
-    _parallel_until_2016_month_match,
-    _is_tsay_misthoti_parallel_row,
-    _is_tsay_non_misthoti_parallel_row,
+    _atlas_map_unique,
 )
 
 # ---------------------------------------------------------------------------
@@ -93,6 +82,10 @@ def _load_sheetjs_source() -> str:
 
 SHEETJS_JS = _load_sheetjs_source()
 
+# Έκδοση λογικής της HTML αναφοράς — αλλάζει όταν αλλάζει το αποτέλεσμα
+# (ακυρώνει τις εγγραφές της report_cache)
+REPORT_BUILDER_VERSION = "2026.10-1"
+
 EXCLUDED_PACKAGES = {"Α", "Λ", "Υ", "Ο", "Χ", "026", "899"}
 EXCLUDED_PACKAGES_LABEL = ", ".join(sorted(EXCLUDED_PACKAGES))
 EXCLUSION_NOTE_HTML = (
@@ -197,9 +190,13 @@ def _build_parallel_metrics_html(
     *,
     mode: str,
     parallel_df: pd.DataFrame | None = None,
+    parallel=None,
 ) -> str:
+    """parallel: έτοιμο analyze_parallel(df) (αλλιώς υπολογίζεται εδώ)."""
+    if parallel is None:
+        parallel = analyze_parallel(df)
     if mode == "2017":
-        months, days = compute_parallel_2017_summary_metrics(df)
+        months, days = len(parallel.months_2017), parallel.overlap_days_2017
         info_html = (
             '<div class="atlas-info-box">'
             '<div class="atlas-info-box-title">Παράλληλη ασφάλιση 2017+</div>'
@@ -212,7 +209,7 @@ def _build_parallel_metrics_html(
             _atlas_metric_cell_html(days_label, format_number_greek(days, decimals=0)),
         ]
     else:
-        months, _legacy_days = compute_parallel_summary_metrics(df)
+        months, _legacy_days = len(parallel.months_2016), parallel.overlap_days_2016
         if parallel_df is not None and not parallel_df.empty:
             days = _compute_parallel_days_from_print_df(parallel_df)
         else:
@@ -393,8 +390,10 @@ def _inject_parallel_year_totals(par_html: str, parallel_df: pd.DataFrame) -> st
     return pattern.sub(_repl, par_html)
 
 
-def _build_multi_metrics_html(df: pd.DataFrame, description_map: dict | None = None) -> str:
-    months = compute_multi_employment_summary_metrics(df, description_map)
+def _build_multi_metrics_html(df: pd.DataFrame, description_map: dict | None = None, parallel=None) -> str:
+    if parallel is None:
+        parallel = analyze_parallel(df, description_map)
+    months = len(parallel.multi_months)
     info_html = (
         '<div class="atlas-info-box">'
         '<div class="atlas-info-box-title">Πολλαπλή απασχόληση</div>'
@@ -760,8 +759,10 @@ def filter_count_df(df: pd.DataFrame) -> pd.DataFrame:
 # Timeline
 # ---------------------------------------------------------------------------
 
-def build_timeline_html(source_df):
-    """Ιστορικό ασφάλισης ανά Ταμείο – Τύπο Ασφάλισης (οπτικές μπάρες)."""
+def build_timeline_html(source_df, case=None):
+    """Ιστορικό ασφάλισης ανά Ταμείο – Τύπο Ασφάλισης (οπτικές μπάρες).
+
+    case: AtlasCase του source_df (κενά και περιγραφές πακέτων από εκεί)."""
     if source_df.empty or 'Από' not in source_df.columns or 'Έως' not in source_df.columns:
         return ""
 
@@ -776,7 +777,7 @@ def build_timeline_html(source_df):
     for col in duration_columns:
         if col not in t.columns:
             t[col] = 0
-        t[f'__{col}_n'] = t[col].apply(clean_numeric_value)
+        t[f'__{col}_n'] = clean_numeric_series(t[col])
     t['__duration_sum'] = t['__Έτη_n'] + t['__Μήνες_n'] + t['__Ημέρες_n']
     if not t.empty:
         t['__duration_sum_group'] = t.groupby(['_from', '_to'])['__duration_sum'].transform('sum')
@@ -806,7 +807,7 @@ def build_timeline_html(source_df):
     if total_days <= 0:
         return ""
 
-    gaps_df = find_gaps_in_insurance_data(source_df)
+    gaps_df = case.gaps if case is not None else find_gaps_in_insurance_data(source_df)
 
     fund_colors = [
         '#3b82f6', '#10b981', '#f59e0b', '#8b5cf6', '#ef4444',
@@ -918,7 +919,7 @@ def build_timeline_html(source_df):
 
     # Δεύτερο χρονολόγιο (πακέτα): στατικό HTML ώστε η συνολική εκτύπωση να το περιλαμβάνει
     # (το JS buildPaketoTimeline τρέχει μόνο στο live viewer).
-    _desc_tl = build_description_map(source_df)
+    _desc_tl = case.description_map if case is not None else build_description_map(source_df)
     _recs_tl = _totals_raw_records_for_js(source_df)
     paketo_rows_inner = _build_paketo_timeline_rows_html(_recs_tl, _desc_tl)
 
@@ -1039,9 +1040,9 @@ body { margin: 0; padding: 12px 14px; font-family: -apple-system, BlinkMacSystem
 """
 
 
-def build_timeline_html_for_streamlit(source_df):
+def build_timeline_html_for_streamlit(source_df, case=None):
     """Πλήρες mini-HTML με ενσωματωμένο CSS — το iframe του Streamlit δεν κληρονομεί το stylesheet του viewer."""
-    inner = build_timeline_html(source_df)
+    inner = build_timeline_html(source_df, case)
     if not inner:
         return ""
     return (
@@ -1163,7 +1164,7 @@ def _precompute_date_keys(raw_df, group_keys, desc_map=None, month_days=25, year
 
     for col in ['Ημέρες', 'Μήνες', 'Έτη']:
         if col in rdf.columns:
-            rdf[col] = rdf[col].apply(lambda x: clean_numeric_value(x) or 0)
+            rdf[col] = clean_numeric_series(rdf[col])
     rdf = apply_negative_time_sign(rdf)
     rdf['_d'] = (
         rdf['Ημέρες'].fillna(0)
@@ -1243,7 +1244,7 @@ def _totals_raw_records_for_js(raw_df, month_days=25, year_days=300):
     rdf = rdf.dropna(subset=['_apo'])
     for col in ['Ημέρες', 'Μήνες', 'Έτη']:
         if col in rdf.columns:
-            rdf[col] = rdf[col].apply(lambda x: clean_numeric_value(x) or 0)
+            rdf[col] = clean_numeric_series(rdf[col])
     rdf = apply_negative_time_sign(rdf)
     # Δεν κλιπάρουμε σε >=0: οι διορθωτικές (αρνητικές) εγγραφές πρέπει να ΑΦΑΙΡΟΥΝ ημέρες
     # ανά πακέτο/μήνα, όπως κάνει η Κυρία (compute_summary_capped_days_by_group),
@@ -1532,8 +1533,8 @@ def _klados_eisf_pct_map_from_totals(
     work = source_df.copy()
     work[pkg_col] = work[pkg_col].astype(str).str.strip()
     work = work[work[pkg_col] != '']
-    work[gross_col] = work[gross_col].apply(lambda x: clean_numeric_value(x, exclude_drx=True))
-    work[contrib_col] = work[contrib_col].apply(lambda x: clean_numeric_value(x, exclude_drx=True))
+    work[gross_col] = clean_numeric_series(work[gross_col], exclude_drx=True)
+    work[contrib_col] = clean_numeric_series(work[contrib_col], exclude_drx=True)
 
     for code in by_pkg:
         if code in out:
@@ -1710,7 +1711,7 @@ def build_totals_with_filters(display_summary, raw_df=None, desc_map=None,
             _cap_df = raw_df.copy()
             for _col in ['Ημέρες', 'Μήνες', 'Έτη']:
                 if _col in _cap_df.columns:
-                    _cap_df[_col] = _cap_df[_col].apply(clean_numeric_value)
+                    _cap_df[_col] = clean_numeric_series(_cap_df[_col])
             _cap_df = apply_negative_time_sign(_cap_df)
             _cap_result = compute_summary_capped_days_by_group(
                 _cap_df, cap_group_keys, month_days=25, year_days=300, ika_month_days=31
@@ -2264,7 +2265,7 @@ def _compute_count_kind_summary_from_c_df(c_df: pd.DataFrame, year_days: float =
         sub = c_df[c_df["ΕΤΟΣ"] == year].copy()
         if sub.empty:
             return 0.0
-        sub["_k"] = sub["ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ"].apply(insurance_kind_classify_count)
+        sub["_k"] = _atlas_map_unique(sub["ΤΥΠΟΣ ΑΣΦΑΛΙΣΗΣ"], insurance_kind_classify_count)
         if kind_code is not None:
             sub = sub[sub["_k"] == kind_code]
         if sub.empty:
@@ -2937,10 +2938,11 @@ def _build_count_synoptiko_js():
 def build_count_with_filters(count_display_df, print_style_rows, count_df,
                              description_map=None, disclaimer_html=None,
                              warning_types=None, display_summary=None,
-                             source_df=None):
+                             source_df=None, c_df=None):
     """Ενότητα Καταμέτρηση με client-side φίλτρα και δυναμικά σύνολα ανά έτος.
     Αν δοθεί disclaimer_html, η δομή είναι τριών ζωνών: σταθερό πάνω (κεφαλίδες+φίλτρα),
     ενδιάμεσο με πίνακα (κύληση εδώ), σταθερό κάτω (disclaimer).
+    c_df: έτοιμο build_count_c_dataframe(count_df, description_map) (αλλιώς υπολογίζεται εδώ).
     """
     _col_renames = {
         'ΜΙΚΤΕΣ ΑΠΟΔΟΧΕΣ': 'ΑΠΟΔΟΧΕΣ',
@@ -3089,7 +3091,7 @@ def build_count_with_filters(count_display_df, print_style_rows, count_df,
     # g/c: μικτές/εισφορές για συνοπτικό πίνακα modal.
     cdf_metrics_payload_html = ""
     try:
-        _c_df_exp = build_count_c_dataframe(count_df, desc_map)
+        _c_df_exp = c_df if c_df is not None else build_count_c_dataframe(count_df, desc_map)
         if _c_df_exp is not None and not getattr(_c_df_exp, "empty", True):
             _rows_compact = []
             for _, _r in _c_df_exp.iterrows():
@@ -4494,10 +4496,11 @@ def _special_increase_css(header_cells=None) -> str:
 def build_special_increase_with_filters(count_display_df, print_style_rows, count_df,
                                          description_map=None, disclaimer_html=None,
                                          warning_types=None, display_summary=None,
-                                         source_df=None, default_klados_codes=None):
+                                         source_df=None, default_klados_codes=None,
+                                         c_df=None):
     """Καρτέλα «Ειδική Προσαύξηση» — πιστό αντίγραφο (copy-paste) της Καταμέτρησης με
     ανεξάρτητα IDs (prefix `eipr`), προεπιλεγμένα πακέτα ΕΙΠΡ/ΠΕΙΠ και ενσωματωμένο CSS.
-    Δεν συνδέεται με άλλες καρτέλες."""
+    Δεν συνδέεται με άλλες καρτέλες. c_df: όπως στο build_count_with_filters."""
     renamed_df = _eipr_prepare_display_df(count_display_df)
 
     count_table_html = build_yearly_print_html(
@@ -4595,7 +4598,7 @@ def build_special_increase_with_filters(count_display_df, print_style_rows, coun
 
     cdf_metrics_payload_html = ""
     try:
-        _c_df_exp = build_count_c_dataframe(count_df, desc_map)
+        _c_df_exp = c_df if c_df is not None else build_count_c_dataframe(count_df, desc_map)
         if _c_df_exp is not None and not getattr(_c_df_exp, "empty", True):
             _rows_compact = []
             for _, _r in _c_df_exp.iterrows():
@@ -4809,7 +4812,7 @@ def _build_annex_table_html(dataframe: pd.DataFrame) -> str:
 
 def _build_maindata_df(df):
     """Κύρια Δεδομένα: όλες οι στήλες εκτός παραρτήματος, μόνο γραμμές με έγκυρο «Από», χρονολογικά."""
-    main_cols = [c for c in df.columns if c not in _MAINDATA_DROP_COLUMNS]
+    main_cols = [c for c in df.columns if c not in _MAINDATA_DROP_COLUMNS and not is_typed_column(c)]
     main_df = df[main_cols].copy() if main_cols else df.copy()
     if "Από" in main_df.columns:
         main_df["__dt"] = pd.to_datetime(main_df["Από"], format="%d/%m/%Y", errors="coerce")
@@ -4905,7 +4908,7 @@ def _apd_date_to_int(s) -> int:
 
 def _build_apd_base_df(df):
     """Βάση ΑΠΔ: ίδια λογική με την Κυρία (drop βοηθητικών, εξαίρεση πακέτων, μόνο μισθωτή)."""
-    apd_cols = [c for c in df.columns if c not in _APD_DROP_COLUMNS]
+    apd_cols = [c for c in df.columns if c not in _APD_DROP_COLUMNS and not is_typed_column(c)]
     apd_df = df[apd_cols].copy() if apd_cols else df.copy()
     if "Σελίδα" in apd_df.columns:
         apd_df = apd_df.drop(columns=["Σελίδα"])
@@ -6040,56 +6043,36 @@ def _syntaksi_apd_by_klados(df, klados_codes, plafond_mode=None):
     return out
 
 
-def _syntaksi_parallel_years_by_side(df) -> tuple[list[int], list[int]]:
+def _syntaksi_parallel_years_by_side(df, parallel=None) -> tuple[list[int], list[int]]:
     """Έτη (≤2016) παράλληλης ασφάλισης ανά πλευρά: (μισθωτού, ελ. επαγγελματία).
 
-    Βασίζεται στην ίδια λογική εντοπισμού με τον πίνακα «Παράλληλη Ασφάλιση»."""
+    Βασίζεται στην ίδια λογική εντοπισμού με τον πίνακα «Παράλληλη Ασφάλιση» (analyze_parallel)."""
     misthoti_years: set[int] = set()
     elep_years: set[int] = set()
     try:
-        _, month_groups = _parallel_month_groups_until_2016(df)
-        if month_groups is None:
-            return [], []
-        for (year, _month), group in month_groups:
-            y = int(year)
-            if y > 2016:
-                continue
-            ika_d = float(group.loc[group["is_ika"], "Ημέρες"].sum())
-            oaee_d = min(float(group.loc[group["is_oaee"], "Ημέρες"].sum()), 25)
-            tsm_d = min(float(group.loc[group["is_tsm"], "Ημέρες"].sum()), 25)
-            oga_d = min(float(group.loc[group["is_oga"], "Ημέρες"].sum()), 25)
-            tsay_d = min(float(group.loc[group["is_tsay"], "Ημέρες"].sum()), 25)
-            tsay_mis_d = float(
-                group.loc[group.apply(_is_tsay_misthoti_parallel_row, axis=1), "Ημέρες"].sum()
-            )
-            tsay_elep_d = float(
-                group.loc[group.apply(_is_tsay_non_misthoti_parallel_row, axis=1), "Ημέρες"].sum()
-            )
-
-            has_ika = ika_d > 0
-            has_oaee = oaee_d > 0
-            has_tsm = tsm_d > 0
-            has_oga = oga_d > 0
-            has_tsay = tsay_d > 0
-
-            if not _parallel_until_2016_month_match(
-                has_ika, has_oaee, has_tsm, has_oga, has_tsay
-            ):
-                continue
-            if has_ika or tsay_mis_d > 0:
-                misthoti_years.add(y)
-            if has_oaee or has_tsm or has_oga or tsay_elep_d > 0:
-                elep_years.add(y)
+        if parallel is None:
+            parallel = analyze_parallel(df)
+        sums = parallel.sums_2016
+        has = sums > 0
+        years = sums.index // 12
+        misthoti = has["is_ika"] | has["is_tsay_mis"]
+        elep = has["is_oaee"] | has["is_tsm"] | has["is_oga"] | has["is_tsay_non"]
+        misthoti_years.update(int(y) for y in years[misthoti.to_numpy()])
+        elep_years.update(int(y) for y in years[elep.to_numpy()])
     except Exception:
         return [], []
     return sorted(misthoti_years), sorted(elep_years)
 
 
-def _syntaksi_build_payload(df, description_map):
-    """Δεδομένα για τον client engine της καρτέλας Συντάξιμες (embedded JSON)."""
+def _syntaksi_build_payload(df, description_map, case=None):
+    """Δεδομένα για τον client engine της καρτέλας Συντάξιμες (embedded JSON).
+
+    case: AtlasCase του df (καταμέτρηση και analyze_parallel από εκεί)."""
     desc_map = description_map or {}
-    count_df = filter_count_df(df)
-    c_df = build_count_c_dataframe(count_df, desc_map)
+    if case is None:
+        case = AtlasCase(df, desc_map)
+    count_df = case.count_df
+    c_df = case.c_df
 
     cdf_rows = []
     if c_df is not None and not getattr(c_df, "empty", True):
@@ -6165,10 +6148,15 @@ def _syntaksi_build_payload(df, description_map):
 
     # Έτη (≤2016) με εντοπισμένη παράλληλη ασφάλιση από τον σχετικό πίνακα
     parallel_years = []
-    parallel_years_misthoti, parallel_years_elep = _syntaksi_parallel_years_by_side(df)
     try:
-        _par_res = build_parallel_print_df(df, desc_map, False)
-        _par_df = _par_res[0] if isinstance(_par_res, tuple) else _par_res
+        parallel = case.parallel
+    except Exception:
+        parallel = None
+    parallel_years_misthoti, parallel_years_elep = (
+        _syntaksi_parallel_years_by_side(df, parallel) if parallel is not None else ([], [])
+    )
+    try:
+        _par_df = parallel.print_df("parallel") if parallel is not None else None
         if _par_df is not None and not getattr(_par_df, "empty", True) and "Έτος" in _par_df.columns:
             _yrs = set()
             for _v in _par_df["Έτος"].tolist():
@@ -7341,13 +7329,10 @@ def _build_apd_export_df(df, description_map=None):
     return pd.DataFrame(rows) if rows else pd.DataFrame()
 
 
-def _build_syntaksi_export_df(df, description_map=None):
-    count_df = filter_count_df(df)
-    c_df = build_count_c_dataframe(count_df, description_map or {})
-    if c_df is None or c_df.empty:
-        return pd.DataFrame()
+def _build_syntaksi_export_df(df, description_map=None, case=None):
+    count_df = case.count_df if case is not None else filter_count_df(df)
     try:
-        return build_syntaksi_annual_table(c_df)
+        return build_syntaksi_annual_table(count_df)
     except Exception:
         return pd.DataFrame()
 
@@ -7444,34 +7429,32 @@ def _append_pro_tab_entries(df, description_map, tab_entries, excel_by_tid=None)
         pass
 
 
-def build_report_tab_entries(df, description_map=None, edition="lite"):
+def build_report_tab_entries(df, description_map=None, edition="lite", case=None, basis_label=None):
     """Δημιουργεί τα tab entries (id, label, html) για τον HTML viewer.
 
     edition: "lite" (προεπιλογή) → ίδιες καρτέλες με τη Lite·
              "pro" → προσθήκη επιπλέον καρτελών (Κύρια Δεδομένα, Παράρτημα, κ.λπ.).
+    case: AtlasCase του df (π.χ. από το session της εφαρμογής)· αλλιώς δημιουργείται εδώ.
+    basis_label: συντελεστές υπολογισμού ημερών της Συνοπτικής Αναφοράς (None = επιλογή του session).
 
     Επιστρέφει (audit_df, display_summary, count_display_df, print_style_rows, tab_entries,
               show_complex_warning, complex_modal_body_html, excel_sheets).
     """
-    if description_map is None:
-        description_map = build_description_map(df)
-
-    count_df = filter_count_df(df)
-    audit_df = generate_audit_report(df)
-    display_summary = (
-        build_summary_grouped_display(df, df)
-        if 'Κλάδος/Πακέτο Κάλυψης' in df.columns
-        else pd.DataFrame()
-    )
-    count_display_df, _, _, _, print_style_rows = build_count_report(
-        count_df, description_map=description_map, show_count_totals_only=False,
-        force_insurance_type_subtotals=True,
-    )
+    if case is None:
+        case = AtlasCase(df, description_map)
+    description_map = case.description_map
+
+    count_df = case.count_df
+    # Παράλληλη / 2017+ / πολλαπλή: μία ανάλυση για audit, πίνακες, μετρήσεις και Συντάξιμες
+    parallel = _safe_call(getattr, case, "parallel")
+    audit_df = case.audit
+    display_summary = case.summary_display(basis_label)
+    count_display_df, _, _, _, print_style_rows = case.count_report(force_insurance_type_subtotals=True)
 
     show_complex_warning = False
     complex_modal_body_html = ""
     try:
-        _metrics = compute_complex_file_metrics(df)
+        _metrics = case.complex_metrics
         if len(_metrics) >= 4:
             n_agg, n_limits_25, n_unpaid, n_negative = _metrics[:4]
         else:
@@ -7498,7 +7481,10 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
 
     # -- Detect warning types for totals --
     warning_types = []
-    _par_res = _safe_call(build_parallel_print_df, df, description_map, True)
+    def _parallel_print(kind):
+        return _safe_call(parallel.print_df, kind, True) if parallel is not None else None
+
+    _par_res = _parallel_print("parallel")
     parallel_df, parallel_styles = (None, None)
     if isinstance(_par_res, tuple):
         parallel_df, parallel_styles = _par_res
@@ -7506,7 +7492,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
         parallel_df = _par_res
     if parallel_df is not None and not parallel_df.empty:
         warning_types.append("παράλληλη ασφάλιση")
-    _par17_res = _safe_call(build_parallel_2017_print_df, df, description_map, True)
+    _par17_res = _parallel_print("parallel_2017")
     parallel_2017_df, parallel_2017_styles = (None, None)
     if isinstance(_par17_res, tuple):
         parallel_2017_df, parallel_2017_styles = _par17_res
@@ -7514,7 +7500,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
         parallel_2017_df = _par17_res
     if parallel_2017_df is not None and not parallel_2017_df.empty:
         warning_types.append("παράλληλη απασχόληση 2017+")
-    _multi_res = _safe_call(build_multi_employment_print_df, df, description_map, True)
+    _multi_res = _parallel_print("multi")
     multi_df, multi_styles = (None, None)
     if isinstance(_multi_res, tuple):
         multi_df, multi_styles = _multi_res
@@ -7539,6 +7525,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
             warning_types=warning_types,
             display_summary=display_summary,
             source_df=df,
+            c_df=case.c_df,
         )
         tab_entries.append(("count", "Καταμέτρηση", count_html))
         cnt_x = _count_df_for_excel(count_display_df)
@@ -7563,6 +7550,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
                     display_summary=display_summary,
                     source_df=df,
                     default_klados_codes=_eipr_found_list,
+                    c_df=case.c_df,
                 )
                 tab_entries.append(("eipr", "Ειδική Προσαύξηση", eipr_html))
         except Exception:
@@ -7572,7 +7560,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
     if edition == "pro" and not count_display_df.empty:
         try:
             if not df_has_tsmede_misthoti_insurance(df):
-                syn_payload = _syntaksi_build_payload(df, description_map)
+                syn_payload = case.syntaksi_payload
                 _syn_has_par16 = bool(
                     syn_payload.get("parallelYears")
                     or syn_payload.get("parallelYearsMisthoti")
@@ -7586,7 +7574,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
                 )
                 if syntaksi_html:
                     tab_entries.append(("syntaksi", "Συντάξιμες", syntaksi_html))
-                    syn_x = _build_syntaksi_export_df(df, description_map)
+                    syn_x = _build_syntaksi_export_df(df, description_map, case)
                     if syn_x is not None and not syn_x.empty:
                         excel_by_tid["syntaksi"] = ("Συντάξιμες", syn_x)
                     # Δεύτερη καρτέλα: μόνο έτη με παράλληλη ασφάλιση ≤2016 (ίδιοι υπολογισμοί)
@@ -7606,8 +7594,8 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
 
     # -- Gaps --
     try:
-        gaps_df = find_gaps_in_insurance_data(df)
-        zero_duration_df = find_zero_duration_intervals(df)
+        gaps_df = case.gaps
+        zero_duration_df = case.zero_duration
         gaps_body_parts = []
         gaps_metrics_html = ""
         if gaps_df is not None and not gaps_df.empty:
@@ -7706,7 +7694,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
                 ),
                 metrics_html=_build_parallel_metrics_html(
                     df, "Μήνες Παράλληλης", "Ημέρες Παράλληλης", mode="legacy",
-                    parallel_df=parallel_df,
+                    parallel_df=parallel_df, parallel=parallel,
                 ),
                 body_html=par_html,
             ),
@@ -7747,7 +7735,8 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
                     "& ΕΦΚΑ μη μισθωτή).</p>"
                 ),
                 metrics_html=_build_parallel_metrics_html(
-                    df, "Μήνες Παράλληλης 2017+", "Ημέρες Παράλληλης 2017+", mode="2017"
+                    df, "Μήνες Παράλληλης 2017+", "Ημέρες Παράλληλης 2017+", mode="2017",
+                    parallel=parallel,
                 ),
                 body_html=par2017_html,
             ),
@@ -7772,7 +7761,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
                     "<p class='print-description'>Μήνες με πολλαπλούς εργοδότες ΙΚΑ "
                     "(αποδοχές 01, 16, ή 99).</p>"
                 ),
-                metrics_html=_build_multi_metrics_html(df, description_map),
+                metrics_html=_build_multi_metrics_html(df, description_map, parallel),
                 body_html=multi_html,
             ),
         ))
@@ -7809,7 +7798,7 @@ def build_report_tab_entries(df, description_map=None, edition="lite"):
 
     # -- Timeline --
     try:
-        timeline_html = build_timeline_html(df)
+        timeline_html = build_timeline_html(df, case)
         if timeline_html:
             # Αν υπάρχει, το Ιστορικό μπαίνει δεύτερο, πριν τη Σύνοψη
             tab_entries.insert(1, ("timeline", "Ιστορικό", timeline_html))
@@ -8057,12 +8046,16 @@ var _fullSaveSuffix = {full_save_suffix_js};
 
 def generate_full_html_report(df, client_name="", app_title="ATLAS",
                                app_subtitle="Προεργασία φακέλου",
-                               full_save_suffix=None, edition="lite"):
+                               full_save_suffix=None, edition="lite", case=None, basis_label=None):
     """Παράγει (viewer_html, print_html) από ένα DataFrame.
 
     edition: "lite" (προεπιλογή) ή "pro" (επιπλέον καρτέλες — βλ. build_report_tab_entries).
+    case: AtlasCase του df — ό,τι έχει ήδη υπολογιστεί (audit, κενά, παράλληλη κ.λπ.) δεν ξαναγίνεται.
+    basis_label: συντελεστές υπολογισμού ημερών (25/300 ή 30/360)· None = επιλογή του session.
     """
-    description_map = build_description_map(df)
+    if case is None:
+        case = AtlasCase(df)
+    description_map = case.description_map
     (
         audit_df,
         display_summary,
@@ -8072,7 +8065,9 @@ def generate_full_html_report(df, client_name="", app_title="ATLAS",
         show_complex_warning,
         complex_modal_body_html,
         excel_sheets,
-    ) = build_report_tab_entries(df, description_map=description_map, edition=edition)
+    ) = build_report_tab_entries(
+        df, description_map=description_map, edition=edition, case=case, basis_label=basis_label,
+    )
 
     # Η εξαγωγή Excel γίνεται πλέον ζωντανά (client-side, από το DOM) ώστε να
     # αντικατοπτρίζει φίλτρα/σύνολα «όπως εμφανίζονται». Δεν χρειάζεται το
@@ -0,0 +1,1038 @@
+"""
+pdf_extraction.py
+~~~~~~~~~~~~~~~~~
+Εξαγωγή πινάκων ανά σελίδα από PDF ΑΤΛΑΣ (e-EFKA), χωρίς Streamlit.
+Χρησιμοποιείται από app_final.py / app_lite.py (μηνύματα, progress) και από τις
+διεργασίες της παράλληλης εξαγωγής — εκεί δεν γίνεται import του app_final.
+"""
+
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+# Προσπάθεια εισαγωγής διαφορετικών PDF readers
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+# Έκδοση λογικής εξαγωγής/κανονικοποίησης — αλλάζει όταν αλλάζει το αποτέλεσμα
+# (ακυρώνει τις εγγραφές της extract_cache)
+EXTRACTOR_VERSION = "2026.10-2"
+
+# Ρυθμίσεις pdfplumber ανά «προφίλ» εξαγωγής (None = προεπιλογές pdfplumber)
+TABLE_SETTINGS = {
+    "default": None,
+    "lines_strict": {
+        "vertical_strategy": "lines_strict",
+        "horizontal_strategy": "lines_strict",
+    },
+}
+
+# Παράλληλη εξαγωγή μόνο για μεγάλα αρχεία (κάτω από αυτό το κόστος εκκίνησης διεργασιών δεν αξίζει)
+PARALLEL_MIN_PAGES = 24
+
+
+class PageTables:
+    """Πίνακες/κείμενο μίας σελίδας PDF — ένα table-finding pass ανά προφίλ ρυθμίσεων.
+
+    Το `page.extract_tables()` είναι το ακριβότερο βήμα της εξαγωγής· το header (2x2 grid)
+    και όλες οι στρατηγικές μοιράζονται το ίδιο αποτέλεσμα αντί να το ξανατρέχουν.
+    Σφάλμα της εξαγωγής κρατιέται και ξαναπετιέται σε κάθε κλήση (ίδια συμπεριφορά με πριν).
+    """
+
+    __slots__ = ("page", "_tables", "_text")
+
+    def __init__(self, page):
+        self.page = page
+        self._tables = {}
+        self._text = None
+
+    def tables(self, profile: str = "default") -> list:
+        if profile not in self._tables:
+            try:
+                self._tables[profile] = self._extract_tables(TABLE_SETTINGS[profile])
+            except Exception as e:
+                self._tables[profile] = e
+        result = self._tables[profile]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._extract_text() or ""
+        return self._text
+
+    def _extract_tables(self, settings) -> list:
+        if settings is None:
+            return self.page.extract_tables()
+        return self.page.extract_tables(table_settings=settings)
+
+    def _extract_text(self) -> str:
+        return self.page.extract_text()
+
+
+class PyMuPDFPageTables(PageTables):
+    """Ίδια διεπαφή με `PageTables` για σελίδα PyMuPDF (`find_tables`, ίδια προφίλ ρυθμίσεων).
+
+    `found`: τα αντικείμενα πινάκων του προεπιλεγμένου pass (για εκμάθηση `LayoutTemplate`).
+    """
+
+    __slots__ = ("found",)
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.found = None
+
+    def _extract_tables(self, settings) -> list:
+        found = self.page.find_tables() if settings is None else self.page.find_tables(**settings)
+        if settings is None:
+            self.found = list(found.tables)
+        return [table.extract() for table in found]
+
+    def _extract_text(self) -> str:
+        return self.page.get_text()
+
+
+class PageResult:
+    """Αποτέλεσμα μίας σελίδας: header (αν βρέθηκε) και πίνακες με τη στρατηγική που τους παρήγαγε.
+
+    Οι στήλες Ταμείο / Τύπος Ασφάλισης των πινάκων συμπληρώνονται με `apply_header`,
+    αφού το header μεταφέρεται από προηγούμενες σελίδες (σειριακό βήμα).
+    """
+
+    __slots__ = ("page_no", "taimeio", "typos", "header_error", "frames", "no_table")
+
+    def __init__(self, page_no: int):
+        self.page_no = page_no
+        self.taimeio = None
+        self.typos = None
+        self.header_error = None
+        self.frames: list[tuple[str, pd.DataFrame]] = []
+        self.no_table = False
+
+    @property
+    def has_header(self) -> bool:
+        return bool(self.taimeio and self.typos)
+
+    def apply_header(self, taimeio: str, typos: str) -> None:
+        for _strategy, df in self.frames:
+            df['Ταμείο'] = taimeio
+            df['Τύπος Ασφάλισης'] = typos
+
+
+def extract_header_info(page):
+    """
+    Εξάγει Ταμείο και Τύπος Ασφάλισης από τον πρώτο πίνακα (2x2 grid).
+    Δέχεται σελίδα pdfplumber ή `PageTables`· σφάλματα εξαγωγής περνούν στον καλούντα.
+    """
+    page_tables = page if isinstance(page, PageTables) else PageTables(page)
+    for table in page_tables.tables():
+        if not table or len(table) < 2:
+            continue
+
+        # Ελέγχουμε αν είναι ο πρώτος πίνακας (2x2 grid)
+        if (len(table) == 2 and
+            len(table[0]) >= 2 and
+            len(table[1]) >= 2 and
+            "Φορέας Κοινωνικής Ασφάλισης" in str(table[0][0])):
+
+            # Εξάγουμε Ταμείο και Τύπος από τη δεύτερη γραμμή
+            taimeio = str(table[1][0]).strip() if table[1][0] else ""
+            typos = str(table[1][1]).strip() if table[1][1] else ""
+
+            return taimeio, typos
+
+    return None, None
+
+
+def page_table_df(table, page_no: int, taimeio: str = "", typos: str = "") -> pd.DataFrame:
+    """Πίνακας (λίστα γραμμών, 1η = κεφαλίδα) → DataFrame σελίδας με Ταμείο/Τύπο ως πρώτες στήλες."""
+    df = pd.DataFrame(table[1:], columns=table[0])
+    df['Σελίδα'] = page_no
+    df.insert(0, 'Ταμείο', taimeio)
+    df.insert(1, 'Τύπος Ασφάλισης', typos)
+    return df
+
+
+def parse_text_for_tables(text, page_num):
+    """
+    Αναλύει κείμενο για να βρει πίνακες
+    """
+    lines = text.split('\n')
+
+    # Ψάχνουμε για γραμμές που μοιάζουν με πίνακα
+    table_lines = []
+    in_table = False
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Ψάχνουμε για patterns που υποδεικνύουν πίνακα
+        if (re.search(r'\d{1,2}/\d{1,2}/\d{4}', line) or  # Ημερομηνίες
+            re.search(r'[\d,]+\.\d{2}', line) or  # Ποσά
+            line.count(' ') > 3 or  # Πολλά κενά
+            '\t' in line):  # Tabs
+
+            table_lines.append(line)
+            in_table = True
+        elif in_table and len(table_lines) > 0:
+            # Αν είχαμε βρει πίνακα αλλά τώρα δεν βρίσκουμε δεδομένα
+            if len(table_lines) > 5:  # Αν έχουμε αρκετές γραμμές
+                break
+            else:
+                table_lines = []  # Reset αν δεν έχουμε αρκετές γραμμές
+                in_table = False
+
+    if len(table_lines) < 3:
+        return None
+
+    # Δημιουργούμε headers
+    headers = ['Στήλη_1', 'Στήλη_2', 'Στήλη_3', 'Στήλη_4', 'Στήλη_5', 'Στήλη_6']
+
+    # Μετατρέπουμε τις γραμμές σε δεδομένα
+    data = [headers]
+    for line in table_lines:
+        # Χωρίζουμε τη γραμμή σε στήλες
+        parts = line.split()
+        if len(parts) >= 3:  # Αν έχει αρκετές στήλες
+            # Συμπληρώνουμε με κενά αν χρειάζεται
+            while len(parts) < len(headers):
+                parts.append('')
+            data.append(parts[:len(headers)])
+
+    return data if len(data) > 1 else None
+
+
+def normalize_column_name(name):
+    """
+    Κανονικοποιεί ένα όνομα στήλης για σύγκριση
+    Αφαιρεί \n, πολλαπλά κενά, και μετατρέπει σε πεζά
+    """
+    if pd.isna(name):
+        return ""
+    # Αντικατάσταση \n και tabs με κενό
+    normalized = str(name).replace('\n', ' ').replace('\t', ' ').replace('\r', ' ')
+    # Αφαίρεση πολλαπλών κενών
+    normalized = ' '.join(normalized.split())
+    # Αφαίρεση περιττών κενών στην αρχή/τέλος
+    normalized = normalized.strip()
+    return normalized
+
+
+def _strip_separators(text: str) -> str:
+    """Μορφή «μία λέξη»: χωρίς κενά, /, -, _."""
+    return text.replace(' ', '').replace('/', '').replace('-', '').replace('_', '')
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _column_match_key(name) -> tuple[str, str]:
+    """(κανονικοποιημένο πεζό όνομα, ίδιο χωρίς διαχωριστικά) — memo ανά όνομα στήλης."""
+    normalized = normalize_column_name(name).lower()
+    return normalized, _strip_separators(normalized)
+
+
+def _column_key(name) -> tuple[str, str]:
+    try:
+        return _column_match_key(name)
+    except TypeError:  # μη hashable όνομα στήλης
+        normalized = normalize_column_name(name).lower()
+        return normalized, _strip_separators(normalized)
+
+
+@lru_cache(maxsize=256)
+def _find_column_cached(columns: tuple, patterns: tuple):
+    normalized_patterns = [pattern.lower().strip() for pattern in patterns]
+    for col in columns:
+        col_normalized = _column_key(col)[0]
+        for pattern_normalized in normalized_patterns:
+            if pattern_normalized in col_normalized or col_normalized in pattern_normalized:
+                return col
+    return None
+
+
+def find_column_by_pattern(df, patterns):
+    """
+    Βρίσκει μια στήλη με βάση patterns (υποστηρίζει πολλαπλά patterns)
+    Επιστρέφει το πραγματικό όνομα της στήλης ή None
+    (memo ανά (κεφαλίδα, patterns) — ίδιες κεφαλίδες επαναλαμβάνονται σε όλη την εφαρμογή)
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    try:
+        return _find_column_cached(tuple(df.columns), tuple(patterns))
+    except TypeError:  # μη hashable στήλες/patterns
+        return _find_column_cached.__wrapped__(tuple(df.columns), tuple(patterns))
+
+
+# Mapping από patterns -> standard name (με προτεραιότητα - πιο συγκεκριμένα πρώτα)
+COLUMN_NAME_PATTERNS = {
+    'Συνολικές εισφορές': ['συνολικές εισφορές', 'συνολικες εισφορες', 'συνολικ εισφορ', 'συνολικέςεισφορές', 'συνολικεςεισφορες'],
+    'Μικτές αποδοχές': ['μικτές αποδοχές', 'μικτες αποδοχες', 'μικτ αποδοχ', 'μικτέςαποδοχές', 'μικτεςαποδοχες'],
+    'Τύπος Αποδοχών': ['τύπος αποδοχών', 'τυπος αποδοχων', 'τυπος απο', 'τύποςαποδοχών', 'τυποςαποδοχων'],
+    'Τύπος Ασφάλισης': ['τύπος ασφάλισης', 'τυπος ασφαλισης', 'μημισθωτηασφαλιση', 'μισθωτήασφάλιση', 'μισθωτη ασφαλιση'],
+    'Κλάδος/Πακέτο Κάλυψης': ['κλάδος πακέτο κάλυψης', 'κλαδος πακετο καλυψης', 'κλάδος', 'πακέτο κάλυψης', 'κλάδος/πακέτοκάλυψης', 'κλαδοςπακετοκαλυψης'],
+    'Α-Μ εργοδότη': ['α μ εργοδότη', 'α/μ εργοδ', 'εργοδότη', 'α-μ εργοδότη', 'αμεργοδότη', 'α-μεργοδότη'],
+    'Ημέρες': ['ημέρες', 'ημερες', 'ημερ'],
+    'Έτη': ['έτη', 'ετη'],
+    'Μήνες': ['μήνες', 'μηνες'],
+    'Από': ['από'],
+    'Έως': ['έως', 'εως'],
+}
+
+# Προϋπολογισμένοι πίνακες: (standard, [(pattern, pattern >5 χαρ., pattern χωρίς διαχωριστικά ή None)],
+# standard χωρίς διαχωριστικά ή None) — υπολογίζονται μία φορά αντί για κάθε στήλη κάθε σελίδας
+_COMPILED_COLUMN_PATTERNS = tuple(
+    (
+        standard_name,
+        tuple(
+            (pattern, len(pattern) > 5, _strip_separators(pattern) if len(_strip_separators(pattern)) >= 3 else None)
+            for pattern in patterns
+        ),
+        _strip_separators(standard_name.lower()) if len(_strip_separators(standard_name.lower())) >= 3 else None,
+    )
+    for standard_name, patterns in COLUMN_NAME_PATTERNS.items()
+)
+
+
+def _compute_column_rename(columns) -> dict:
+    """Mapping παλιό -> standard όνομα για μια κεφαλίδα (ίδιοι κανόνες με πριν, προϋπολογισμένα patterns)."""
+    rename_dict = {}
+    used_standards = set()  # Για να μην αντιστοιχίσουμε δύο στήλες στο ίδιο standard name
+
+    for col in columns:
+        col_normalized, col_no_space = _column_key(col)
+        col_long = len(col_normalized) > 5
+
+        # Πρώτα ψάχνουμε για exact matches ή πολύ κοντινά matches (με τη σειρά προτεραιότητας)
+        matched = False
+        for standard_name, patterns, _standard_no_space in _COMPILED_COLUMN_PATTERNS:
+            if standard_name in used_standards:
+                continue
+            for pattern, pattern_long, pattern_no_space in patterns:
+                if (
+                    pattern == col_normalized
+                    or (pattern_long and pattern in col_normalized)
+                    or (col_long and col_normalized in pattern)
+                    # Παραλλαγή «μία λέξη» (π.χ. από Firefox): στήλη χωρίς κενά/παύλες = standard χωρίς κενά/παύλες
+                    or (pattern_no_space is not None and (
+                        col_no_space == pattern_no_space
+                        or pattern_no_space in col_no_space
+                        or col_no_space in pattern_no_space
+                    ))
+                ):
+                    rename_dict[col] = standard_name
+                    used_standards.add(standard_name)
+                    matched = True
+                    break
+            if matched:
+                break
+
+        if matched:
+            continue
+        # Fallback: standard name χωρίς κενά/σύμβολα = στήλη χωρίς κενά/σύμβολα
+        for standard_name, _patterns, standard_no_space in _COMPILED_COLUMN_PATTERNS:
+            if standard_name in used_standards:
+                continue
+            if standard_no_space is not None and (col_no_space == standard_no_space or standard_no_space in col_no_space):
+                rename_dict[col] = standard_name
+                used_standards.add(standard_name)
+                break
+
+    return rename_dict
+
+
+@lru_cache(maxsize=256)
+def _column_rename_cached(columns: tuple) -> tuple:
+    return tuple(_compute_column_rename(columns).items())
+
+
+def normalize_column_names(df):
+    """
+    Κανονικοποίηση ονομάτων στηλών με mapping σε standard names.
+    Υποστηρίζει κεφαλές που εμφανίζονται «σε μια λέξη» (π.χ. PDF από Firefox: ΣυνολικέςΕισφορές, Κλάδος/ΠακέτοΚάλυψης).
+    Το mapping κρατιέται (LRU) ανά κεφαλίδα: σχεδόν όλες οι σελίδες έχουν την ίδια, άρα O(1) μετά την πρώτη.
+    """
+    columns = tuple(df.columns)
+    try:
+        rename_dict = dict(_column_rename_cached(columns))
+    except TypeError:  # μη hashable ονόματα στηλών
+        rename_dict = _compute_column_rename(columns)
+
+    # Εφαρμογή mapping
+    if rename_dict:
+        df = df.rename(columns=rename_dict)
+
+    return df
+
+
+def extract_page(page_tables: PageTables, page_num: int, pymupdf_page=None) -> PageResult:
+    """Εκτελεί τις στρατηγικές 1–6 σε μία σελίδα (page_num: 0-based).
+
+    pymupdf_page: callable χωρίς ορίσματα που δίνει `PyMuPDFPageTables` της ίδιας σελίδας
+    (από ήδη ανοιχτό έγγραφο) για τη στρατηγική 6· None = χωρίς PyMuPDF fallback.
+    """
+    page_no = page_num + 1
+    result = PageResult(page_no)
+
+    # Εξαγωγή header info (Ταμείο & Τύπος)
+    try:
+        result.taimeio, result.typos = extract_header_info(page_tables)
+    except Exception as e:
+        result.header_error = str(e)
+
+    # Στρατηγική 1: Κανονική εξαγωγή πινάκων (ίδιοι πίνακες με το header)
+    tables = page_tables.tables()
+
+    if len(tables) >= 2:
+        second_table = tables[1]
+        if second_table and len(second_table) > 1:
+            result.frames.append(("1: δεύτερος πίνακας", page_table_df(second_table, page_no)))
+            return result
+
+    # Στρατηγική 2: Εξαγωγή με διαφορετικές παραμέτρους
+    try:
+        tables_alt = page_tables.tables("lines_strict")
+
+        if len(tables_alt) >= 2:
+            second_table = tables_alt[1]
+            if second_table and len(second_table) > 1:
+                result.frames.append(("2: lines_strict", page_table_df(second_table, page_no)))
+                return result
+    except Exception:
+        pass
+
+    # Στρατηγική 3: Μεγαλύτερος πίνακας της σελίδας (από το ίδιο pass)
+    try:
+        all_tables_page = page_tables.tables()
+        if all_tables_page:
+            largest_table = max(all_tables_page, key=len)
+            if largest_table and len(largest_table) > 1:
+                result.frames.append(("3: μεγαλύτερος πίνακας", page_table_df(largest_table, page_no)))
+                return result
+    except Exception:
+        pass
+
+    # Στρατηγική 4: Text-based parsing
+    try:
+        text = page_tables.text()
+        if text and len(text) > 100:
+            table_data = parse_text_for_tables(text, page_no)
+            if table_data and len(table_data) > 1:
+                result.frames.append(("4: κείμενο", page_table_df(table_data, page_no)))
+                return result
+    except Exception:
+        pass
+
+    # Στρατηγική 5: Πρώτος μη κενός πίνακας (fallback, από το ίδιο pass)
+    try:
+        all_tables_page = page_tables.tables()
+        if all_tables_page:
+            for table_idx, table in enumerate(all_tables_page):
+                if table and len(table) > 1:
+                    df = page_table_df(table, page_no)
+                    df['Πίνακας'] = table_idx + 1
+                    result.frames.append((f"5: πίνακας {table_idx + 1}", df))
+                    break
+    except Exception:
+        pass
+
+    # Στρατηγική 6: PyMuPDF fallback (έγγραφο ανοιχτό μία φορά ανά εκτέλεση)
+    if pymupdf_page is not None:
+        try:
+            tables_pymupdf = pymupdf_page().tables()
+
+            if len(tables_pymupdf) >= 2:
+                table_data = tables_pymupdf[1]
+                if table_data and len(table_data) > 1:
+                    result.frames.append(("6: PyMuPDF", page_table_df(table_data, page_no)))
+                    return result
+        except Exception:
+            pass
+
+    result.no_table = True
+    return result
+
+
+# Υπογραφές κεφαλίδας (μετά από normalize_column_names) των πινάκων του ΑΤΛΑΣ:
+# πίνακας διαστημάτων ασφάλισης και παράρτημα κωδικών πακέτων κάλυψης
+ATLAS_TABLE_SIGNATURES = (
+    frozenset({'Από', 'Έως', 'Κλάδος/Πακέτο Κάλυψης'}),
+    frozenset({'Κωδικός Κλάδων / Πακέτων Κάλυψης', 'Περιγραφή'}),
+)
+
+# Το 2x2 header (Ταμείο/Τύπος) αναγνωρίζεται από αυτό το κείμενο
+_HEADER_GRID_MARKER = "Φορέας Κοινωνικής Ασφάλισης"
+
+
+def table_header_is_valid(header) -> bool:
+    """True αν η κεφαλίδα πίνακα αντιστοιχεί (μετά το normalize) σε γνωστή υπογραφή ΑΤΛΑΣ."""
+    if not header:
+        return False
+    try:
+        columns = set(normalize_column_names(pd.DataFrame(columns=list(header))).columns)
+    except Exception:
+        return False
+    return any(sig <= columns for sig in ATLAS_TABLE_SIGNATURES)
+
+
+def extract_page_fast(page_tables: PageTables, page_num: int) -> PageResult | None:
+    """Γρήγορη διαδρομή (PyMuPDF): header + στρατηγικές 1/3 από ένα `find_tables` pass.
+
+    Επιστρέφει None όταν το αποτέλεσμα δεν επικυρώνεται (άγνωστη κεφαλίδα στηλών ή
+    σελίδα με 2x2 header που δεν αναγνωρίστηκε) — τότε η σελίδα περνά στο pdfplumber.
+    """
+    page_no = page_num + 1
+    try:
+        tables = page_tables.tables()
+        taimeio, typos = extract_header_info(page_tables)
+        if not (taimeio and typos) and _HEADER_GRID_MARKER in page_tables.text():
+            return None
+    except Exception:
+        return None
+
+    if len(tables) >= 2 and tables[1] and len(tables[1]) > 1:
+        strategy, table = "1: δεύτερος πίνακας (PyMuPDF)", tables[1]
+    elif tables and len(max(tables, key=len)) > 1:
+        strategy, table = "3: μεγαλύτερος πίνακας (PyMuPDF)", max(tables, key=len)
+    else:
+        return None
+    if not table_header_is_valid(table[0]):
+        return None
+
+    result = PageResult(page_no)
+    result.taimeio, result.typos = taimeio, typos
+    try:
+        result.frames.append((strategy, page_table_df(table, page_no)))
+    except Exception:
+        return None
+    return result
+
+
+def is_path_source(source) -> bool:
+    """True αν η πηγή PDF είναι διαδρομή αρχείου (αλλιώς bytes-like / BytesIO στη μνήμη)."""
+    return isinstance(source, (str, os.PathLike))
+
+
+def pdf_buffer(source):
+    """Πηγή στη μνήμη → bytes-like χωρίς αντίγραφο.
+
+    bytes / bytearray / memoryview επιστρέφονται ως έχουν· για `BytesIO` το `getvalue()`
+    επιστρέφει το ίδιο το αρχικό bytes όσο δεν έχει τροποποιηθεί (CPython).
+    """
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    return source
+
+
+@contextmanager
+def pdf_path_for(source):
+    """Διαδρομή αρχείου για backends/διεργασίες που τη χρειάζονται πραγματικά.
+
+    Διαδρομή → ως έχει· πηγή στη μνήμη → προσωρινό αρχείο που διαγράφεται στο τέλος.
+    """
+    if is_path_source(source):
+        yield source
+        return
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(pdf_buffer(source))
+        yield tmp_path
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+_DATE_CELL_RE = re.compile(r'^\d{2}/\d{2}/\d{4}$')
+
+
+class LayoutTemplate:
+    """Πρότυπο διάταξης του πίνακα διαστημάτων ασφάλισης (όρια στηλών x + γραμμή κεφαλίδας).
+
+    Μαθαίνεται από την πρώτη σελίδα δεδομένων που αναλύθηκε επιτυχώς με PyMuPDF· οι επόμενες
+    σελίδες διαβάζονται με «κουβάδες» λέξεων ανά στήλη (`get_text("words")`) και γραμμές από τα
+    ορθογώνια των κελιών (`get_drawings()`), χωρίς γενική ανίχνευση πινάκων.
+    `extract` επιστρέφει None όταν οποιαδήποτε γραμμή δεν επικυρώνεται (→ πλήρης ανίχνευση).
+    """
+
+    __slots__ = ("columns", "header", "date_cols")
+
+    # Ανοχή (pt) για όρια στηλών/γραμμών
+    TOL = 1.5
+
+    def __init__(self, columns: list[tuple[float, float]], header: list[str], date_cols: tuple[int, ...]):
+        self.columns = columns
+        self.header = header
+        self.date_cols = date_cols
+
+    @classmethod
+    def from_page_tables(cls, page_tables: "PyMuPDFPageTables") -> "LayoutTemplate | None":
+        """Πρότυπο από τον πίνακα διαστημάτων της σελίδας (υπογραφή Από/Έως/Κλάδος) ή None."""
+        try:
+            page_tables.tables()
+        except Exception:
+            return None
+        for table in page_tables.found or ():
+            try:
+                rows = table.extract()
+                cells = table.rows[0].cells
+            except Exception:
+                continue
+            if len(rows) < 2 or not cells or any(c is None for c in cells):
+                continue
+            header = rows[0]
+            try:
+                normalized = list(normalize_column_names(pd.DataFrame(columns=list(header))).columns)
+            except Exception:
+                continue
+            if not ATLAS_TABLE_SIGNATURES[0] <= set(normalized):
+                continue
+            date_cols = tuple(normalized.index(name) for name in ('Από', 'Έως'))
+            columns = [(float(c[0]), float(c[2])) for c in cells]
+            return cls(columns, [("" if h is None else h) for h in header], date_cols)
+        return None
+
+    @property
+    def x_left(self) -> float:
+        return self.columns[0][0]
+
+    @property
+    def x_right(self) -> float:
+        return self.columns[-1][1]
+
+    def _column_of(self, x0: float, x1: float) -> int | None:
+        center = (x0 + x1) / 2
+        for idx, (c0, c1) in enumerate(self.columns):
+            if c0 <= center < c1:
+                if x0 < c0 - self.TOL or x1 > c1 + self.TOL:
+                    return None  # λέξη πάνω σε όριο στήλης
+                return idx
+        return None
+
+    def _row_bounds(self, page) -> list[float]:
+        """Οριζόντια όρια γραμμών από τα ορθογώνια/γραμμές μέσα στο πλάτος του πίνακα."""
+        ys = []
+        lo, hi = self.x_left - self.TOL, self.x_right + self.TOL
+        for drawing in page.get_drawings():
+            for item in drawing.get("items", ()):
+                if item[0] == "re":
+                    r = item[1]
+                    if r.x0 >= lo and r.x1 <= hi:
+                        ys.extend((r.y0, r.y1))
+                elif item[0] == "l":
+                    p1, p2 = item[1], item[2]
+                    if abs(p1.y - p2.y) <= self.TOL and min(p1.x, p2.x) >= lo and max(p1.x, p2.x) <= hi:
+                        ys.append(p1.y)
+        merged: list[float] = []
+        for y in sorted(ys):
+            if not merged or y - merged[-1] > self.TOL:
+                merged.append(y)
+        return merged
+
+    def extract(self, page) -> list[list[str]] | None:
+        """Γραμμές πίνακα (1η = κεφαλίδα) σελίδας PyMuPDF ή None αν δεν επικυρώνεται."""
+        bounds = self._row_bounds(page)
+        if len(bounds) < 3:
+            return None
+        words = [
+            w for w in page.get_text("words")
+            if self.x_left - self.TOL <= (w[0] + w[2]) / 2 <= self.x_right + self.TOL
+        ]
+        n_cols = len(self.columns)
+        rows: list[list[str]] = []
+        for top, bottom in zip(bounds, bounds[1:]):
+            in_row = [w for w in words if top <= (w[1] + w[3]) / 2 < bottom]
+            if not in_row:
+                continue
+            cells: list[dict] = [dict() for _ in range(n_cols)]
+            for w in in_row:
+                col = self._column_of(w[0], w[2])
+                if col is None:
+                    return None
+                # Γραμμή κειμένου μέσα στο κελί: (block, line) του PyMuPDF
+                cells[col].setdefault((w[5], w[6]), []).append(w)
+            row = []
+            for lines in cells:
+                ordered = sorted(lines.values(), key=lambda ws: min(x[1] for x in ws))
+                row.append("\n".join(
+                    " ".join(x[4] for x in sorted(ws, key=lambda x: x[0])) for ws in ordered
+                ))
+            rows.append(row)
+        if len(rows) < 2 or rows[0] != self.header:
+            return None
+        for row in rows[1:]:
+            if not all(_DATE_CELL_RE.match(row[i]) for i in self.date_cols):
+                return None
+        return rows
+
+
+def extract_page_template(page_tables: "PyMuPDFPageTables", page_num: int, template: LayoutTemplate) -> PageResult | None:
+    """Σελίδα δεδομένων με το πρότυπο στηλών· None για σελίδες με 2x2 header ή αν η επικύρωση αποτύχει."""
+    try:
+        if _HEADER_GRID_MARKER in page_tables.text():
+            return None
+        table = template.extract(page_tables.page)
+    except Exception:
+        return None
+    if table is None:
+        return None
+    page_no = page_num + 1
+    result = PageResult(page_no)
+    try:
+        result.frames.append(("πρότυπο στηλών (PyMuPDF)", page_table_df(table, page_no)))
+    except Exception:
+        return None
+    return result
+
+
+class PdfplumberBackend:
+    """Backend pdfplumber: πλήρεις στρατηγικές 1–5 (προεπιλογή/αναφορά ορθότητας)."""
+
+    name = "pdfplumber"
+
+    def __init__(self, source):
+        if not is_path_source(source):
+            # BytesIO πάνω σε bytes μοιράζεται το buffer (χωρίς αντίγραφο)
+            source = io.BytesIO(pdf_buffer(source))
+        self._pdf = pdfplumber.open(source)
+
+    def __len__(self) -> int:
+        return len(self._pdf.pages)
+
+    def page_tables(self, page_num: int) -> PageTables:
+        return PageTables(self._pdf.pages[page_num])
+
+    def close(self) -> None:
+        self._pdf.close()
+
+
+class PyMuPDFBackend:
+    """Backend PyMuPDF (`find_tables`): αρκετές φορές ταχύτερο στα PDF με text layer."""
+
+    name = "pymupdf"
+
+    def __init__(self, source):
+        if is_path_source(source):
+            self._doc = fitz.open(source)
+        else:
+            self._doc = fitz.open(stream=pdf_buffer(source), filetype="pdf")
+
+    def __len__(self) -> int:
+        return len(self._doc)
+
+    def page_tables(self, page_num: int) -> PyMuPDFPageTables:
+        return PyMuPDFPageTables(self._doc[page_num])
+
+    def close(self) -> None:
+        self._doc.close()
+
+
+# Επιλογές backend: "auto" = PyMuPDF πρώτα με επικύρωση κεφαλίδας, fallback ανά σελίδα σε pdfplumber
+PDF_BACKEND_CHOICES = ("auto", "pdfplumber", "pymupdf")
+
+
+def resolve_pdf_backend(name: str | None = None) -> str | None:
+    """Ρυθμισμένο backend (όρισμα ή env ATLAS_PDF_BACKEND, προεπιλογή "auto") → διαθέσιμο backend.
+
+    Επιστρέφει None αν δεν υπάρχει κανένας PDF reader.
+    """
+    if not name:
+        name = os.getenv("ATLAS_PDF_BACKEND", "").strip().lower() or "auto"
+    if name not in PDF_BACKEND_CHOICES:
+        name = "auto"
+    if not PYMUPDF_AVAILABLE:
+        return "pdfplumber" if PDFPLUMBER_AVAILABLE else None
+    if not PDFPLUMBER_AVAILABLE:
+        return "pymupdf"
+    return name
+
+
+class PageExtractor:
+    """Ανοιχτά έγγραφα μίας εκτέλεσης εξαγωγής + πολιτική backend.
+
+    Κάθε backend ανοίγει το PDF μία φορά (lazy) και κλείνει στο τέλος (`with`).
+    - "pdfplumber": στρατηγικές 1–5 με pdfplumber, στρατηγική 6 με PyMuPDF.
+    - "pymupdf": στρατηγικές 1–5 με PyMuPDF (χωρίς ξεχωριστό fallback).
+    - "auto": `extract_page_fast` με PyMuPDF· αν δεν επικυρωθεί, η σελίδα ξαναγίνεται
+      με τη διαδρομή "pdfplumber".
+
+    Με PyMuPDF (auto / pymupdf) και template=True (env ATLAS_LAYOUT_TEMPLATE, προεπιλογή ναι),
+    η πρώτη επιτυχής σελίδα δεδομένων δίνει `LayoutTemplate` και οι επόμενες διαβάζονται με
+    αυτό· πλήρης ανίχνευση μόνο όταν η επικύρωση γραμμών μιας σελίδας αποτύχει.
+    """
+
+    def __init__(self, source, backend: str | None = None, template: bool | None = None):
+        # Διαδρομή ή bytes / bytearray / memoryview / BytesIO (χωρίς προσωρινό αρχείο)
+        self.source = source if is_path_source(source) else pdf_buffer(source)
+        self.backend = resolve_pdf_backend(backend)
+        self._backends: dict[str, object] = {}
+        if template is None:
+            template = os.getenv("ATLAS_LAYOUT_TEMPLATE", "1").strip() != "0"
+        self.use_template = bool(template) and self.backend in ("auto", "pymupdf")
+        self.template: LayoutTemplate | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for opened in self._backends.values():
+            opened.close()
+        self._backends.clear()
+
+    def _open(self, name: str):
+        if name not in self._backends:
+            cls = PyMuPDFBackend if name == "pymupdf" else PdfplumberBackend
+            self._backends[name] = cls(self.source)
+        return self._backends[name]
+
+    def __len__(self) -> int:
+        return len(self._open("pymupdf" if self.backend != "pdfplumber" else "pdfplumber"))
+
+    def _pymupdf_page(self, page_num: int):
+        if not PYMUPDF_AVAILABLE:
+            return None
+        return lambda: self._open("pymupdf").page_tables(page_num)
+
+    def _learn_template(self, page_tables: PyMuPDFPageTables, result: PageResult) -> None:
+        if self.use_template and self.template is None and result.frames:
+            self.template = LayoutTemplate.from_page_tables(page_tables)
+
+    def extract(self, page_num: int) -> PageResult:
+        if self.backend in ("auto", "pymupdf"):
+            page_tables = self._open("pymupdf").page_tables(page_num)
+            if self.template is not None:
+                result = extract_page_template(page_tables, page_num, self.template)
+                if result is not None:
+                    return result
+            if self.backend == "pymupdf":
+                result = extract_page(page_tables, page_num)
+                self._learn_template(page_tables, result)
+                return result
+            result = extract_page_fast(page_tables, page_num)
+            if result is not None:
+                self._learn_template(page_tables, result)
+                return result
+        return extract_page(
+            self._open("pdfplumber").page_tables(page_num),
+            page_num,
+            pymupdf_page=self._pymupdf_page(page_num),
+        )
+
+
+def iter_page_results(extractor: PageExtractor, start: int, stop: int):
+    """Generator: `PageResult` για τις σελίδες [start, stop) ενός ανοιχτού `PageExtractor`."""
+    for page_num in range(start, stop):
+        yield extractor.extract(page_num)
+
+
+def extract_page_range(source, start: int, stop: int, backend: str | None = None) -> list[PageResult]:
+    """Worker διεργασίας: ανοίγει ξανά το PDF (διαδρομή) και επεξεργάζεται τις σελίδες [start, stop)."""
+    with PageExtractor(source, backend) as extractor:
+        return list(iter_page_results(extractor, start, stop))
+
+
+def default_extract_workers() -> int:
+    """Πλήθος διεργασιών για παράλληλη εξαγωγή (env ATLAS_EXTRACT_WORKERS, αλλιώς έως 4 πυρήνες)."""
+    raw = os.getenv("ATLAS_EXTRACT_WORKERS", "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def split_page_ranges(start: int, stop: int, n_chunks: int) -> list[tuple[int, int]]:
+    """Χωρίζει [start, stop) σε έως n_chunks συνεχόμενα τμήματα σχεδόν ίσου μεγέθους."""
+    n_pages = max(0, stop - start)
+    n_chunks = max(1, min(n_chunks, n_pages))
+    if n_pages == 0:
+        return []
+    base, extra = divmod(n_pages, n_chunks)
+    ranges = []
+    lo = start
+    for i in range(n_chunks):
+        hi = lo + base + (1 if i < extra else 0)
+        ranges.append((lo, hi))
+        lo = hi
+    return ranges
+
+
+def carry_page_headers(results, taimeio: str = "", typos: str = ""):
+    """Σειριακό βήμα: μεταφέρει Ταμείο/Τύπο από σελίδα σε σελίδα και τα γράφει στους πίνακες.
+
+    Generator: δίνει (PageResult, τρέχον Ταμείο, τρέχων Τύπος) σε σειρά σελίδων.
+    """
+    for result in results:
+        if result.has_header:
+            taimeio = result.taimeio
+            typos = result.typos
+        result.apply_header(taimeio, typos)
+        yield result, taimeio, typos
+
+
+def _iter_parallel_chunks(source, ranges, workers: int, backend: str | None):
+    """Generator: (αρχή εύρους, [PageResult]) με σειρά ολοκλήρωσης από `ProcessPoolExecutor`.
+
+    Κάθε worker ανοίγει ξανά το PDF και επεξεργάζεται ένα συνεχόμενο εύρος σελίδων.
+    Αποτυχία της δεξαμενής (BrokenProcessPool / OSError) περνά στον καλούντα.
+    """
+    # spawn: ασφαλές και μέσα σε πολυνηματική διεργασία (Streamlit server)
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=ctx) as pool:
+        futures = {
+            pool.submit(extract_page_range, source, lo, hi, backend): lo
+            for lo, hi in ranges
+        }
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
+class ExtractionProgress:
+    """Συγκεντρωτικοί μετρητές μίας εκτέλεσης εξαγωγής (για μία ενιαία ένδειξη προόδου)."""
+
+    __slots__ = (
+        "total_pages", "pages_done", "rows", "tables", "strategies",
+        "failed_pages", "header_errors", "headers", "workers",
+    )
+
+    def __init__(self, total_pages: int = 0, workers: int = 1):
+        self.total_pages = total_pages
+        self.pages_done = 0
+        self.rows = 0
+        self.tables = 0
+        self.strategies: dict[str, int] = {}
+        self.failed_pages: list[int] = []
+        self.header_errors: list[tuple[int, str]] = []
+        self.headers: list[tuple[int, str, str]] = []
+        self.workers = workers
+
+    @property
+    def data_pages(self) -> int:
+        return max(self.total_pages - 1, 0)
+
+    @property
+    def fraction(self) -> float:
+        return min(self.pages_done / self.data_pages, 1.0) if self.data_pages else 1.0
+
+    def record(self, result: PageResult) -> None:
+        self.pages_done += 1
+        if result.header_error:
+            self.header_errors.append((result.page_no, result.header_error))
+        if result.has_header:
+            self.headers.append((result.page_no, result.taimeio, result.typos))
+        for strategy, df in result.frames:
+            self.tables += 1
+            self.rows += len(df)
+            self.strategies[strategy] = self.strategies.get(strategy, 0) + 1
+        if result.no_table:
+            self.failed_pages.append(result.page_no)
+
+
+def iter_extraction(source, workers: int | None = None, backend: str | None = None):
+    """Εξαγωγή όλων των σελίδων δεδομένων (εκτός της 1ης) χωρίς UI.
+
+    source: διαδρομή ή PDF στη μνήμη (bytes / bytearray / memoryview / BytesIO).
+
+    Generator: δίνει (PageResult ή None, ExtractionProgress). Το πρώτο γεγονός (None) δίνεται
+    μόλις είναι γνωστό το πλήθος σελίδων· μετά ένα γεγονός ανά σελίδα σε σειρά σελίδων,
+    με τα Ταμείο/Τύπος ήδη συμπληρωμένα, ώστε ο καταναλωτής να επεξεργάζεται τους πίνακες
+    όσο συνεχίζεται η ανάλυση των επόμενων σελίδων.
+
+    Για μεγάλα αρχεία (≥ PARALLEL_MIN_PAGES) οι σελίδες μοιράζονται σε διεργασίες· τα τμήματα
+    δίνονται μόλις ολοκληρωθεί κάθε συνεχόμενο πρόθεμα. Αν η δεξαμενή διεργασιών αποτύχει,
+    τα υπόλοιπα τμήματα γίνονται σειριακά — το αποτέλεσμα είναι πάντα ίδιο με τη σειριακή εκτέλεση.
+    """
+    backend = resolve_pdf_backend(backend)
+    if backend is None:
+        raise RuntimeError("Δεν υπάρχει διαθέσιμος PDF reader (pdfplumber / PyMuPDF)")
+    if workers is None:
+        workers = default_extract_workers()
+    workers = max(1, min(workers, os.cpu_count() or 1))
+
+    with PageExtractor(source, backend) as extractor:
+        total_pages = len(extractor)
+        ranges = []
+        if workers > 1 and total_pages - 1 >= PARALLEL_MIN_PAGES:
+            # Μικρότερα τμήματα από τις διεργασίες ώστε να ισοκατανέμεται το φορτίο
+            ranges = split_page_ranges(1, total_pages, workers * 2)
+        if len(ranges) < 2:
+            ranges, workers = [(1, total_pages)], 1
+        progress = ExtractionProgress(total_pages, workers)
+        yield None, progress
+
+        taimeio, typos = "", ""
+
+        def emit(results):
+            nonlocal taimeio, typos
+            for result, taimeio, typos in carry_page_headers(results, taimeio, typos):
+                progress.record(result)
+                yield result, progress
+
+        done: dict[int, list[PageResult]] = {}
+        if workers > 1:
+            range_stop = dict(ranges)
+            next_lo = ranges[0][0]
+            # Οι διεργασίες ανοίγουν ξανά το PDF: προσωρινό αρχείο μόνο εδώ, αν η πηγή είναι στη μνήμη
+            try:
+                with pdf_path_for(extractor.source) as worker_path:
+                    for lo, results in _iter_parallel_chunks(worker_path, ranges, workers, backend):
+                        done[lo] = results
+                        while next_lo in done:
+                            yield from emit(done.pop(next_lo))
+                            next_lo = range_stop[next_lo]
+            except (BrokenProcessPool, OSError):
+                pass
+            ranges = [(lo, hi) for lo, hi in ranges if lo >= next_lo]
+
+        # Σειριακά (ή ό,τι απέμεινε μετά από αποτυχία της δεξαμενής), με σειρά σελίδων
+        for lo, hi in ranges:
+            if lo in done:
+                yield from emit(done.pop(lo))
+            else:
+                yield from emit(iter_page_results(extractor, lo, hi))
+
+
+def extract_frames(source, workers: int | None = None, backend: str | None = None, on_progress=None):
+    """Πλήρης εξαγωγή χωρίς UI: πίνακες με κανονικοποιημένα ονόματα στηλών, σε σειρά σελίδων.
+
+    on_progress(result, progress): καλείται σε κάθε γεγονός του iter_extraction (result None
+    στο πρώτο, όταν είναι γνωστό μόνο το πλήθος σελίδων) — ο ίδιος μηχανισμός για Streamlit και CLI.
+    Επιστρέφει (λίστα DataFrame, ExtractionProgress).
+    """
+    frames: list[pd.DataFrame] = []
+    progress = None
+    for result, progress in iter_extraction(source, workers=workers, backend=backend):
+        if result is not None:
+            for _strategy, df in result.frames:
+                frames.append(normalize_column_names(df))
+        if on_progress is not None:
+            on_progress(result, progress)
+    return frames, progress
@@ -0,0 +1,133 @@
+"""
+report_cache.py
+~~~~~~~~~~~~~~~
+Cache στη μνήμη (κοινή ανά διεργασία) των πλήρων HTML αναφορών ΑΤΛΑΣ: (viewer_html, print_html).
+
+Κλειδί: SHA-256(αποτύπωμα δεδομένων + έκδοση + πελάτης + τίτλοι + συντελεστές ημερών + έκδοση builder
++ ημερομηνία) —
+δεύτερο άνοιγμα ή ίδιο αρχείο από άλλον χρήστη δίνει hit· αλλαγή στη λογική της αναφοράς
+(REPORT_BUILDER_VERSION) ή νέα ημέρα (τρέχον έτος/ημερομηνία μέσα στην αναφορά) δίνει νέο κλειδί.
+LRU με όριο μεγέθους σε bytes μνήμης των HTML.
+Χωρίς Streamlit (κοινό για app_final.py / app_lite.py).
+
+Ρυθμίσεις (env):
+- ATLAS_REPORT_CACHE: "0" απενεργοποιεί την cache
+- ATLAS_REPORT_CACHE_MAX_MB: μέγιστο μέγεθος (προεπιλογή 128)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def report_cache_key(
+    fingerprint: str,
+    edition: str,
+    client_name: str,
+    app_title: str,
+    app_subtitle: str,
+    basis_label: str,
+    builder_version: str,
+    day: str,
+) -> str:
+    """SHA-256 (hex) των παραμέτρων που καθορίζουν το αποτέλεσμα του generate_full_html_report.
+
+    basis_label: συντελεστές υπολογισμού ημερών (25/300 ή 30/360) της Συνοπτικής Αναφοράς.
+    """
+    h = hashlib.sha256()
+    for part in (fingerprint, edition, client_name, app_title, app_subtitle, basis_label, builder_version, day):
+        h.update(str(part or "").encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _entry_bytes(value: tuple[str, str]) -> int:
+    return sum(sys.getsizeof(part) for part in value)
+
+
+class ReportCache:
+    """LRU (viewer_html, print_html) ανά κλειδί με όριο συνολικών bytes.
+
+    Μετρητές hits/misses/writes/evictions ανά διεργασία· εγγραφή μεγαλύτερη από το όριο δεν κρατιέται.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._entries: OrderedDict[str, tuple[tuple[str, str], int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        """(viewer_html, print_html) της εγγραφής ή None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key: str, value: tuple[str, str]) -> bool:
+        """Αποθηκεύει την αναφορά και αφαιρεί τις λιγότερο πρόσφατες μέχρι το όριο· False αν δεν χωρά."""
+        size = _entry_bytes(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._stats["writes"] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                _key, (_value, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self._stats["evictions"] += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Μετρητές διεργασίας (hits, misses, writes, evictions) + εγγραφές, μέγεθος και όριο σε bytes."""
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._entries)
+            out["bytes"] = self._bytes
+        out["max_bytes"] = self.max_bytes
+        return out
+
+
+_REPORT_CACHE: ReportCache | None = None
+_REPORT_CACHE_LOCK = threading.Lock()
+
+
+def get_report_cache() -> ReportCache | None:
+    """Κοινή (ανά διεργασία) cache αναφορών ή None αν είναι απενεργοποιημένη."""
+    global _REPORT_CACHE
+    if os.getenv("ATLAS_REPORT_CACHE", "1").strip() == "0":
+        return None
+    with _REPORT_CACHE_LOCK:
+        if _REPORT_CACHE is None:
+            _REPORT_CACHE = ReportCache(
+                max_bytes=int(_env_float("ATLAS_REPORT_CACHE_MAX_MB", 128) * 1024 * 1024),
+            )
+        return _REPORT_CACHE
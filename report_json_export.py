@@ -20,16 +20,9 @@ from typing import Any
 
 import pandas as pd
 
+from typed_schema import is_typed_column
 from app_final import (
-    build_description_map,
-    build_count_report,
-    build_parallel_2017_print_df,
-    build_parallel_print_df,
-    build_multi_employment_print_df,
-    build_summary_grouped_display,
-    compute_complex_file_metrics,
-    find_gaps_in_insurance_data,
-    find_zero_duration_intervals,
+    AtlasCase,
     generate_audit_report,
     should_show_complex_file_warning,
 )
@@ -37,7 +30,6 @@ from html_viewer_builder import (
     EXCLUDED_PACKAGES,
     EXCLUDED_PACKAGES_LABEL,
     build_timeline_data,
-    filter_count_df,
     _precompute_date_keys,
     _totals_raw_records_for_js,
 )
@@ -127,23 +119,22 @@ def build_report_payload(
     if df is None or df.empty:
         return {"meta": {"client_name": client_name, "error": "Δεν υπάρχουν δεδομένα"}, "audit": []}
 
-    description_map = build_description_map(df)
-    count_df = filter_count_df(df)
-    audit_df = generate_audit_report(df, extra_df)
-    display_summary = (
-        build_summary_grouped_display(df, df)
-        if "Κλάδος/Πακέτο Κάλυψης" in df.columns
-        else pd.DataFrame()
-    )
+    case = AtlasCase(df)
+    description_map = case.description_map
+    count_df = case.count_df
+    try:
+        parallel = case.parallel
+    except Exception:
+        parallel = None
+    audit_df = generate_audit_report(df, extra_df, case) if extra_df is not None else case.audit
+    display_summary = case.summary_display()
 
-    count_display_df, _, _, _, print_style_rows = build_count_report(
-        count_df, description_map=description_map, show_count_totals_only=False
-    )
+    count_display_df, _, _, _, print_style_rows = case.count_report()
 
     show_complex_warning = False
     try:
-        n_agg, n_limits_25, n_unpaid = compute_complex_file_metrics(df)
-        show_complex_warning = should_show_complex_file_warning(n_agg, n_limits_25, n_unpaid)
+        n_agg, n_limits_25, n_unpaid, n_negative = case.complex_metrics
+        show_complex_warning = should_show_complex_file_warning(n_agg, n_limits_25, n_unpaid, n_negative)
     except Exception:
         pass
 
@@ -224,8 +215,8 @@ def build_report_payload(
     gaps_df = None
     zero_duration_df = None
     try:
-        gaps_df = find_gaps_in_insurance_data(df)
-        zero_duration_df = find_zero_duration_intervals(df)
+        gaps_df = case.gaps
+        zero_duration_df = case.zero_duration
     except Exception:
         pass
     payload["gaps"] = {
@@ -234,15 +225,15 @@ def build_report_payload(
     }
 
     # --- parallel, parallel_2017, multi ---
-    def _safe_parallel(fn, *args):
+    def _safe_parallel(kind):
         try:
-            return fn(*args)
+            return parallel.print_df(kind) if parallel is not None else None
         except Exception:
             return None
 
-    parallel_df = _safe_parallel(build_parallel_print_df, df, description_map)
-    parallel_2017_df = _safe_parallel(build_parallel_2017_print_df, df, description_map)
-    multi_df = _safe_parallel(build_multi_employment_print_df, df, description_map)
+    parallel_df = _safe_parallel("parallel")
+    parallel_2017_df = _safe_parallel("parallel_2017")
+    multi_df = _safe_parallel("multi")
 
     payload["parallel"] = _safe_df_to_records(parallel_df) if parallel_df is not None else []
     payload["parallel_2017"] = _safe_df_to_records(parallel_2017_df) if parallel_2017_df is not None else []
@@ -259,6 +250,7 @@ def build_report_payload(
     apd_columns = [
         col for col in df.columns
         if col not in ["Φορέας", "Κωδικός Κλάδων / Πακέτων Κάλυψης", "Περιγραφή", "Κωδικός Τύπου Αποδοχών", "Σελίδα"]
+        and not is_typed_column(col)
     ]
     apd_df = df[apd_columns].copy() if apd_columns else df.copy()
     if "Σελίδα" in apd_df.columns:
@@ -0,0 +1,8 @@
+"""Κοινές ρυθμίσεις pytest: τα modules ΑΤΛΑΣ είναι στη ρίζα του repo (χωρίς πακέτο)."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,62 @@
+"""AtlasCase: τα παράγωγα που εξαρτώνται από επιλογές του χρήστη κρατιούνται ανά επιλογή."""
+
+import logging
+
+import pandas as pd
+import streamlit as st
+
+logging.disable(logging.CRITICAL)
+
+import app_final as A  # noqa: E402
+
+BASIS_25 = 'Μήνας = 25, Έτος = 300'
+BASIS_30 = 'Μήνας = 30, Έτος = 360'
+
+
+def _case():
+    df = pd.DataFrame({
+        'Ταμείο': ['ΙΚΑ-ΕΤΑΜ', 'ΟΑΕΕ'],
+        'Τύπος Ασφάλισης': ['ΜΙΣΘΩΤΗ', 'ΜΗ ΜΙΣΘΩΤΗ'],
+        'Κλάδος/Πακέτο Κάλυψης': ['K', 'K'],
+        'Από': ['01/01/2000', '01/01/2005'],
+        'Έως': ['31/12/2003', '31/12/2006'],
+        'Έτη': ['1', ''],
+        'Μήνες': ['2', '3'],
+        'Ημέρες': ['100,5', '40'],
+    })
+    return A.AtlasCase(A.add_typed_columns(df))
+
+
+def test_summary_display_follows_basis():
+    case = _case()
+    by_25 = case.summary_display(BASIS_25)
+    by_30 = case.summary_display(BASIS_30)
+    pd.testing.assert_frame_equal(by_25, A.build_summary_grouped_display(case.df, case.df, BASIS_25))
+    pd.testing.assert_frame_equal(by_30, A.build_summary_grouped_display(case.df, case.df, BASIS_30))
+    assert by_25['Συνολικές ημέρες'].tolist() != by_30['Συνολικές ημέρες'].tolist()
+    # Ένας υπολογισμός ανά επιλογή· χωρίς session ισχύει η προεπιλογή 25/300
+    assert case.summary_display(BASIS_30) is by_30
+    assert case.summary_display() is by_25
+
+
+def test_count_report_follows_package_selection():
+    df = pd.DataFrame({
+        'Ταμείο': ['ΙΚΑ-ΕΤΑΜ'], 'Τύπος Ασφάλισης': ['ΜΙΣΘΩΤΗ'], 'Κλάδος/Πακέτο Κάλυψης': ['K'],
+        'Α-Μ εργοδότη': ['1'], 'Από': ['01/01/2005'], 'Έως': ['31/12/2005'], 'Έτη': [''], 'Μήνες': [''],
+        'Ημέρες': ['300'], 'Τύπος Αποδοχών': ['01'], 'Μικτές αποδοχές': ['1.000,00 €'],
+        'Συνολικές εισφορές': ['100,00 €'],
+    })
+    case = A.AtlasCase(A.add_typed_columns(df))
+    try:
+        # Χωρίς επιλεγμένα πακέτα: χωρίς γραμμή «Σύνολο τύπου ασφάλισης»
+        st.session_state['cnt_filter_klados'] = []
+        without = case.count_report()[0]
+        st.session_state['cnt_filter_klados'] = ['K']
+        with_subtotals = case.count_report()[0]
+        assert len(with_subtotals) == len(without) + 1
+        st.session_state['cnt_filter_klados'] = []
+        assert case.count_report()[0] is without
+        # HTML (force): πάντα με υποσύνολα — ίδιο αποτέλεσμα με την επιλογή πακέτων
+        assert case.count_report(force_insurance_type_subtotals=True)[0] is with_subtotals
+    finally:
+        st.session_state.pop('cnt_filter_klados', None)
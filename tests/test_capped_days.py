@@ -0,0 +1,114 @@
+"""Ημέρες με πλαφόν μήνα ανά ομάδα (MonthLedger) ≡ βρόχος ανά διάστημα/μήνα με groupby, και με μισές ημέρες."""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+logging.disable(logging.CRITICAL)
+
+import app_final as A  # noqa: E402
+
+GROUP_KEYS = ['Κλάδος/Πακέτο Κάλυψης', 'Ταμείο', 'Τύπος Ασφάλισης']
+BASIS_25 = 'Μήνας = 25, Έτος = 300'
+
+
+def _reference_capped(df, month_days=25, year_days=300, ika_month_days=31, from_dt=None, to_dt=None):
+    """Ο αρχικός υπολογισμός: μήνες ανά διάστημα, distribute_days_to_months, groupby (ομάδα, μήνας), πλαφόν."""
+    rows = []
+    for _, row in df.iterrows():
+        start = pd.to_datetime(row['Από'], format='%d/%m/%Y', errors='coerce')
+        end = pd.to_datetime(row['Έως'], format='%d/%m/%Y', errors='coerce')
+        if pd.isna(start) or pd.isna(end):
+            continue
+        total = (
+            A.clean_numeric_value(row['Έτη']) * year_days
+            + A.clean_numeric_value(row['Μήνες']) * month_days
+            + A.clean_numeric_value(row['Ημέρες'])
+        )
+        months = list(pd.date_range(start.replace(day=1), end.replace(day=1), freq='MS'))
+        if not months:
+            continue
+        n_all = len(months)
+        if from_dt is not None:
+            months = [m for m in months if m >= from_dt.replace(day=1)]
+        if to_dt is not None:
+            months = [m for m in months if m <= to_dt.replace(day=1)]
+        if not months:
+            continue
+        share = total if len(months) == n_all else total * len(months) / n_all
+        for m, days in zip(months, A.distribute_days_to_months(share, len(months))):
+            rows.append({**{k: row[k] for k in GROUP_KEYS}, 'Έτος': m.year, 'Μήνας': m.month, 'Ημέρες': days})
+    per_month = pd.DataFrame(rows).groupby(GROUP_KEYS + ['Έτος', 'Μήνας'], as_index=False)['Ημέρες'].sum()
+    is_ika = per_month['Ταμείο'].str.contains('ΙΚΑ')
+    limit = np.where(is_ika, ika_month_days, month_days)
+    notice = np.where(per_month['Ταμείο'].str.contains('ΕΤΑΑ-ΤΑΝ'), 30, limit)
+    per_month['cap'] = np.minimum(per_month['Ημέρες'], limit)
+    exceeded = per_month[per_month['Ημέρες'] > notice]
+    capped = per_month.groupby(GROUP_KEYS, as_index=False)['cap'].sum()
+    return capped, exceeded
+
+
+def _synthetic(seed, n=250):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('1985-01-01') + pd.to_timedelta(rng.integers(0, 13000, n), unit='D')
+    end = start + pd.to_timedelta(rng.integers(0, 2500, n), unit='D')
+    days = rng.integers(1, 800, n) + np.where(rng.random(n) < 0.5, 0.5, 0.0)
+    return pd.DataFrame({
+        'Ταμείο': rng.choice(['ΙΚΑ-ΕΤΑΜ', 'ΟΑΕΕ', 'ΕΤΑΑ-ΤΑΝ', 'ΤΕΒΕ'], n),
+        'Τύπος Ασφάλισης': rng.choice(['ΜΙΣΘΩΤΗ', 'ΜΗ ΜΙΣΘΩΤΗ'], n),
+        'Κλάδος/Πακέτο Κάλυψης': rng.choice(['K', 'Α', 'Β'], n),
+        'Από': start.strftime('%d/%m/%Y'),
+        'Έως': end.strftime('%d/%m/%Y'),
+        'Έτη': np.where(rng.random(n) < 0.1, '1', ''),
+        'Μήνες': np.where(rng.random(n) < 0.1, '2', ''),
+        'Ημέρες': [f'{d:g}'.replace('.', ',') for d in days],
+    })
+
+
+def _half_day_funds():
+    rows = []
+    for fund in ('ΙΚΑ-ΕΤΑΜ', 'ΟΑΕΕ'):
+        for i in range(60):
+            year, month = 1980 + i // 2, 1 + 6 * (i % 2)
+            rows.append({
+                'Ταμείο': fund, 'Τύπος Ασφάλισης': 'ΜΙΣΘΩΤΗ', 'Κλάδος/Πακέτο Κάλυψης': 'K',
+                'Από': f'01/{month:02d}/{year}', 'Έως': f'28/{month + 5:02d}/{year}', 'Έτη': '', 'Μήνες': '',
+                'Ημέρες': ['100,5', '140,5', '80,5', '155,5'][i % 4],
+            })
+    return A.add_typed_columns(pd.DataFrame(rows))
+
+
+def test_half_day_totals_are_exact():
+    df = _half_day_funds()
+    capped, _ = A.compute_summary_capped_days_by_group(df, GROUP_KEYS)
+    assert capped['Συνολικές_Ημέρες_cap'].tolist() == [7155.0, 7072.5]
+
+    display = A.build_summary_grouped_display(df, df, BASIS_25)
+    assert display['Συνολικές ημέρες'].tolist() == ['7.155', '7.072']
+    assert display['Ημέρες'].astype(str).tolist() == ['5', '22']
+
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('window', [None, ('1990-03-15', '2005-08-01')])
+def test_capped_totals_match_month_loop(seed, window):
+    df = _synthetic(seed)
+    from_dt, to_dt = (None, None) if window is None else map(pd.Timestamp, window)
+    expected, expected_exceeded = _reference_capped(df, from_dt=from_dt, to_dt=to_dt)
+
+    capped, exceeded = A.compute_summary_capped_days_by_group(
+        A.add_typed_columns(df), GROUP_KEYS, from_dt=from_dt, to_dt=to_dt
+    )
+    assert capped[GROUP_KEYS].values.tolist() == expected[GROUP_KEYS].values.tolist()
+    got = capped['Συνολικές_Ημέρες_cap'].to_numpy(dtype=float)
+    want = expected['cap'].to_numpy(dtype=float)
+    np.testing.assert_allclose(got, want, rtol=0, atol=1e-6)
+    # Ό,τι βλέπει ο χρήστης: ακέραιες ημέρες μετά το round(0) της Συνοπτικής Αναφοράς
+    assert np.round(got, 0).tolist() == np.round(np.round(want, 6), 0).tolist()
+
+    key = GROUP_KEYS + ['Έτος', 'Μήνας']
+    got_exceeded = exceeded.sort_values(key).reset_index(drop=True)
+    want_exceeded = expected_exceeded.sort_values(key).reset_index(drop=True)
+    assert got_exceeded[key].values.tolist() == want_exceeded[key].values.tolist()
+    np.testing.assert_allclose(got_exceeded['Ημέρες'].astype(float), want_exceeded['Ημέρες'], rtol=0, atol=1e-9)
@@ -0,0 +1,77 @@
+"""clean_numeric_series ≡ clean_numeric_value κελί-κελί (σταθερό seeded σώμα τιμών τύπου ΕΦΚΑ)."""
+
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from typed_schema import clean_numeric_series, clean_numeric_value
+
+# Τιμές όπως βγαίνουν από τα PDF ΑΤΛΑΣ (ποσά, ημέρες, ΔΡΧ/€, αρνητικά, κενά)
+EFKA_VALUES = [
+    '1.234,56', '1.234,56 €', '0,00 €', '12,5', '25', '300', '1,234', '1,234.56', '1.234.567',
+    '100.000 ΔΡΧ', '-500 ΔΡΧ', 'ΔΡΧ', '(12,00)', '12-', '-3,00 €', '−5', '- 7,5', '15%',
+    '', '-', '  ', '1,2,3', '12,3456', '.5', '5.', '1_000', 'inf', 'nan', '1e5', 'ΗΜΕΡΕΣ',
+]
+_ALPHABET = list('0123456789,.-−() €%ΔΡΧabcxyzαβγάέΑΩς \t+_e٣²')
+_NON_STRINGS = [None, float('nan'), pd.NA, np.nan, 1, 2.5, -0.0, 1.234, 1e-5, 10 ** 20, True]
+
+
+def _random_value(rng: random.Random):
+    r = rng.random()
+    if r < 0.3:
+        return ''.join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 10)))
+    if r < 0.6:
+        return ''.join(rng.choice(EFKA_VALUES) for _ in range(rng.randint(1, 3)))
+    if r < 0.7:
+        return rng.choice(_NON_STRINGS)
+    text = f"{rng.uniform(-1e6, 1e6):,.{rng.randint(0, 3)}f}"
+    return text.replace(',', rng.choice([',', '.', ' ']))
+
+
+def _corpus(seed: int, n_series: int = 120):
+    rng = random.Random(seed)
+    for _ in range(n_series):
+        values = [_random_value(rng) for _ in range(rng.randint(1, 30))]
+        kind = rng.random()
+        if kind < 0.5:
+            values = [v for v in values if isinstance(v, str)] or ['']
+        if kind < 0.25:
+            yield pd.Series(values, dtype='str')
+        elif rng.random() < 0.1:
+            yield pd.Series([rng.uniform(-1e4, 1e4) for _ in range(10)] + [np.nan, None])
+        else:
+            # Ανάμικτοι τύποι σε object: str / None / NaN / αριθμοί
+            yield pd.Series(values, dtype=object)
+
+
+def _assert_cellwise(series: pd.Series, exclude_drx: bool):
+    expected = [clean_numeric_value(x, exclude_drx=exclude_drx) for x in series]
+    got = clean_numeric_series(series, exclude_drx=exclude_drx)
+    assert got.index.equals(series.index)
+    for value, exp, out in zip(series, expected, got):
+        same = exp == out or (math.isnan(exp) and math.isnan(out))
+        assert same, (value, exp, out)
+
+
+@pytest.mark.parametrize('exclude_drx', [False, True])
+def test_efka_values(exclude_drx):
+    _assert_cellwise(pd.Series(EFKA_VALUES + EFKA_VALUES[::-1]), exclude_drx)
+    _assert_cellwise(pd.Series(EFKA_VALUES + _NON_STRINGS, dtype=object), exclude_drx)
+
+
+@pytest.mark.parametrize('exclude_drx', [False, True])
+@pytest.mark.parametrize('seed', range(5))
+def test_seeded_corpus(seed, exclude_drx):
+    for series in _corpus(seed):
+        _assert_cellwise(series, exclude_drx)
+
+
+def test_missing_and_empty():
+    series = pd.Series([None, np.nan, pd.NA, '', '-'], dtype=object, index=[5, 3, 9, 1, 2])
+    got = clean_numeric_series(series, exclude_drx=True)
+    assert got.tolist() == [0.0] * 5
+    assert got.index.tolist() == [5, 3, 9, 1, 2]
+    assert clean_numeric_series(pd.Series([], dtype=object)).empty
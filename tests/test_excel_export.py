@@ -0,0 +1,53 @@
+"""Εξαγωγές Excel: οι typed στήλες του ingest (πρόθεμα «__») δεν γράφονται ποτέ σε φύλλο."""
+
+import io
+import logging
+
+import pandas as pd
+from openpyxl import load_workbook
+
+logging.disable(logging.CRITICAL)
+
+import app_final as A  # noqa: E402
+from typed_schema import TYPED_PREFIX  # noqa: E402
+
+
+def _typed_frame():
+    df = pd.DataFrame({
+        'Ταμείο': ['ΙΚΑ-ΕΤΑΜ', 'ΟΑΕΕ', 'ΙΚΑ-ΕΤΑΜ'],
+        'Από': ['01/01/2005', 'xx', '01/01/2000'],
+        'Έως': ['31/12/2005', '31/12/2001', '31/12/2000'],
+        'Έτη': ['', '', '1'],
+        'Μήνες': ['2', '', ''],
+        'Ημέρες': ['100', '40,5', ''],
+        'Μικτές αποδοχές': ['1.234,50 €', '100.000 ΔΡΧ', '10,00 €'],
+        'Συνολικές εισφορές': ['300 ΔΡΧ', '20,00 €', '-1,00 €'],
+    })
+    typed = A.add_typed_columns(df)
+    assert any(str(c).startswith(TYPED_PREFIX) for c in typed.columns)
+    return df, typed
+
+
+def _sheet_header(frame, sheet_name):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        A._atlas_write_df_to_excel(writer, frame, sheet_name)
+    ws = load_workbook(io.BytesIO(buffer.getvalue()))[sheet_name]
+    return [cell.value for cell in ws[1]]
+
+
+def test_all_data_export_has_no_typed_columns():
+    df, typed = _typed_frame()
+    all_data = A._atlas_all_data_export_df(typed)
+    assert list(all_data.columns) == list(df.columns)
+    assert all_data['Από'].tolist() == ['01/01/2000', '01/01/2005']
+
+    header = _sheet_header(all_data, 'Όλα_Δεδομένα')
+    assert header == list(df.columns)
+
+
+def test_excel_writer_strips_typed_columns():
+    df, typed = _typed_frame()
+    header = _sheet_header(typed, 'Προβολή')
+    assert not any(str(h).startswith(TYPED_PREFIX) for h in header)
+    assert header == list(df.columns)
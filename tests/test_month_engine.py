@@ -0,0 +1,205 @@
+"""month_engine ≡ ο αρχικός βρόχος ανά διάστημα/μήνα (distribute_days_to_months), με κλασματικές ημέρες."""
+
+import logging
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+logging.disable(logging.CRITICAL)
+
+from app_final import distribute_days_to_months  # noqa: E402
+from month_engine import (  # noqa: E402
+    build_month_ledger,
+    distribute_days_parts,
+    explode_months,
+    explode_months_window,
+    explode_year_months,
+    explode_years,
+    month_category_sums,
+)
+
+
+def _intervals(seed, n=300):
+    """Διαστήματα με NaT, Έως < Από, ένα μήνα, μισές/κλασματικές/αρνητικές/μη πεπερασμένες ημέρες."""
+    rng = np.random.default_rng(seed)
+    start = pd.Series(pd.Timestamp('1980-01-01') + pd.to_timedelta(rng.integers(0, 15000, n), unit='D'))
+    end = start + pd.to_timedelta(rng.integers(-60, 3000, n), unit='D')
+    start[rng.random(n) < 0.03] = pd.NaT
+    end[rng.random(n) < 0.03] = pd.NaT
+    days = rng.integers(-30, 900, n).astype(float)
+    days += rng.choice([0.0, 0.5, 1 / 3, 0.25], n)
+    special = rng.random(n)
+    days[special < 0.03] = np.nan
+    days[(special >= 0.03) & (special < 0.04)] = np.inf
+    gross = rng.uniform(-1000, 50000, n).round(2)
+    contrib = rng.uniform(0, 9000, n).round(2)
+    return start, end, days, gross, contrib
+
+
+def _month_loop(start, end, total, first=None, last=None):
+    """[(δείκτης μήνα, ημέρες)] όπως ο αρχικός βρόχος curr = Από.replace(day=1) ... Έως· None όταν απορρίπτεται."""
+    if pd.isna(start) or pd.isna(end):
+        return None
+    months = []
+    curr = start.year * 12 + start.month - 1
+    while curr <= end.year * 12 + end.month - 1:
+        months.append(curr)
+        curr += 1
+    if not months:
+        return None
+    n_all = len(months)
+    months = [m for m in months if (first is None or m >= first) and (last is None or m <= last)]
+    if not months:
+        return None
+    share = total if len(months) == n_all else total * len(months) / n_all
+    try:
+        parts = distribute_days_to_months(share, len(months))
+    except (ValueError, OverflowError):
+        return None
+    return list(zip(months, parts))
+
+
+def _same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def test_distribute_days_parts_matches_distribute_days_to_months():
+    rng = random.Random(14)
+    pool = [0.0, -0.0, 1.0, -1.0, 0.5, 2.5, -2.5, 1e-7, 25.0000001, 24.9999999, 300.0, 7.3, -13.7, 1 / 3, 12345.678]
+    totals, counts, offsets, expected = [], [], [], []
+    for _ in range(5000):
+        if rng.random() < 0.5:
+            total = rng.choice(pool)
+        else:
+            total = round(rng.uniform(-900, 900)) + rng.choice([0.0, 0.5, rng.uniform(-1, 1)])
+        n = rng.randint(1, 40)
+        for k, value in enumerate(distribute_days_to_months(total, n)):
+            totals.append(total)
+            counts.append(n)
+            offsets.append(k)
+            expected.append(value)
+    got = distribute_days_parts(totals, counts, offsets)
+    expected = np.array(expected)
+    assert np.array_equal(got, expected)
+    assert np.array_equal(np.signbit(got), np.signbit(expected))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_explode_months_matches_month_loop(seed):
+    start, end, days, gross, contrib = _intervals(seed)
+    parts = explode_months(start, end, days=days, gross=gross, contrib=contrib)
+
+    expected = []
+    for i, (s, e, d) in enumerate(zip(start, end, days)):
+        for month, value in _month_loop(s, e, d) or []:
+            expected.append((i, month, value))
+    assert parts.row_id.tolist() == [r for r, _, _ in expected]
+    assert parts.month_index.tolist() == [m for _, m, _ in expected]
+    assert all(_same(a, b) for a, b in zip(parts.days.tolist(), [v for _, _, v in expected]))
+    n_months = parts.num_months
+    assert np.array_equal(parts.gross, gross[parts.row_id] / n_months)
+    assert np.array_equal(parts.contrib, contrib[parts.row_id] / n_months)
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('bounds', [(None, None), (1990 * 12 + 2, None), (None, 2004 * 12 + 7), (1995 * 12, 1999 * 12 + 11)])
+def test_explode_months_window_matches_filtered_loop(seed, bounds):
+    start, end, days, _gross, _contrib = _intervals(seed)
+    first, last = bounds
+    parts = explode_months_window(start, end, days, first=first, last=last)
+
+    expected = []
+    for i, (s, e, d) in enumerate(zip(start, end, days)):
+        for month, value in _month_loop(s, e, d, first, last) or []:
+            expected.append((i, month, value))
+    assert parts.row_id.tolist() == [r for r, _, _ in expected]
+    assert parts.month_index.tolist() == [m for _, m, _ in expected]
+    assert all(_same(a, b) for a, b in zip(parts.days.tolist(), [v for _, _, v in expected]))
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('bounds', [(None, None), (1992 * 12 + 5, 2006 * 12 + 2)])
+def test_explode_years_matches_monthly_sums(seed, bounds):
+    start, end, days, gross, contrib = _intervals(seed)
+    first, last = bounds
+    finite = np.isfinite(days)
+    if first is None and last is None:
+        monthly = explode_months(start, end, days=days, gross=gross, contrib=contrib, keep=finite)
+    else:
+        monthly = explode_months_window(start, end, days, first=first, last=last, keep=finite)
+    years = explode_years(start, end, days=days, first=first, last=last, keep=finite)
+
+    frame = pd.DataFrame({'row': monthly.row_id, 'year': monthly.year, 'days': monthly.days})
+    grouped = frame.groupby(['row', 'year'], sort=False)['days']
+    expected = grouped.agg(['sum', 'max', 'size']).reset_index()
+    assert years.row_id.tolist() == expected['row'].tolist()
+    assert years.year.tolist() == expected['year'].tolist()
+    assert years.months.tolist() == expected['size'].tolist()
+    np.testing.assert_allclose(years.days, expected['sum'], rtol=0, atol=1e-9)
+    # peak: άνω φράγμα του μηνιαίου μεριδίου μέσα στο έτος
+    assert (years.peak >= expected['max'].to_numpy() - 1e-9).all()
+
+    # explode_year_months: οι μηνιαίες γραμμές ακριβώς των επιλεγμένων (διάστημα, έτος)
+    mask = np.arange(len(years)) % 3 == 0
+    picked = explode_year_months(start, end, days, years, mask, first=first, last=last)
+    selected = set(zip(years.row_id[mask].tolist(), years.year[mask].tolist()))
+    keep = np.array([(r, y) in selected for r, y in zip(monthly.row_id.tolist(), monthly.year.tolist())], dtype=bool)
+    assert picked.row_id.tolist() == monthly.row_id[keep].tolist()
+    assert picked.month_index.tolist() == monthly.month_index[keep].tolist()
+    assert np.array_equal(picked.days, monthly.days[keep])
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_month_ledger_matches_naive_month_loop(seed):
+    start, end, days, _gross, _contrib = _intervals(seed)
+    rng = np.random.default_rng(seed)
+    n_groups = 5
+    groups = rng.integers(0, n_groups, len(days))
+    limits = np.array([25.0, 31.0, 25.0, 30.0, 1e9])
+    first = None if seed % 2 else 1988 * 12 + 4
+    last = None if seed % 3 else 2008 * 12 + 9
+    ledger = build_month_ledger(start, end, days, groups, n_groups, limits, first=first, last=last)
+
+    cells = {}
+    for g, s, e, d in zip(groups, start, end, days):
+        for month, value in _month_loop(s, e, d, first, last) or []:
+            cells.setdefault((g, month), []).append(0.0 if math.isnan(value) else value)
+    raw = {key: math.fsum(values) for key, values in cells.items()}
+    present = np.zeros(n_groups, dtype=bool)
+    present[[g for g, _ in raw]] = True
+    assert ledger.present.tolist() == present.tolist()
+    for (g, month), value in raw.items():
+        assert ledger.raw[g, month - ledger.start] == pytest.approx(value, abs=1e-9)
+
+    windows = [(None, None), (1990 * 12, None), (None, 2001 * 12 + 5), (1994 * 12 + 3, 1999 * 12 + 8)]
+    for lo, hi in windows:
+        for capped in (True, False):
+            expected = np.zeros(n_groups)
+            for g in range(n_groups):
+                values = [
+                    min(value, limits[g]) if capped else value
+                    for (gg, month), value in raw.items()
+                    if gg == g and (lo is None or month >= lo) and (hi is None or month <= hi)
+                ]
+                expected[g] = math.fsum(values)
+            got = ledger.window(lo, hi, capped=capped)
+            np.testing.assert_allclose(got, expected, rtol=0, atol=1e-6)
+            # Τα σύνολα βγαίνουν στρογγυλοποιημένα στο 6ο δεκαδικό (χωρίς ουρές τύπου 1954.5000000000064)
+            assert np.array_equal(got, np.round(got, 6))
+
+
+def test_month_category_sums_matches_groupby():
+    rng = np.random.default_rng(19)
+    month_index = rng.integers(1990 * 12, 2000 * 12, 2000)
+    values = rng.integers(0, 40, 2000) + rng.choice([0.0, 0.5], 2000)
+    values[rng.random(2000) < 0.05] = np.nan
+    flags = rng.random((2000, 3)) < 0.5
+    months, sums = month_category_sums(month_index, values, flags)
+    assert months.tolist() == list(range(month_index.min(), month_index.max() + 1))
+    for j in range(3):
+        expected = pd.Series(values[flags[:, j]]).groupby(month_index[flags[:, j]]).sum()
+        expected = expected.reindex(months, fill_value=0.0)
+        np.testing.assert_allclose(sums[:, j], expected.to_numpy(), rtol=0, atol=1e-9)
@@ -0,0 +1,34 @@
+"""report_cache: κλειδί ανά παράμετρο που αλλάζει την αναφορά και LRU με όριο bytes."""
+
+from report_cache import ReportCache, report_cache_key
+
+BASE = dict(
+    fingerprint='f' * 32, edition='lite', client_name='Πελάτης', app_title='ATLAS',
+    app_subtitle='Ασφαλιστικό Βιογραφικό', basis_label='Μήνας = 25, Έτος = 300',
+    builder_version='1', day='2026-10-17',
+)
+
+
+def test_key_changes_with_every_parameter():
+    key = report_cache_key(**BASE)
+    assert report_cache_key(**BASE) == key
+    for name, value in (
+        ('fingerprint', 'e' * 32), ('edition', 'pro'), ('client_name', 'Άλλος'), ('app_title', 'ATLAS Pro'),
+        ('app_subtitle', ''), ('basis_label', 'Μήνας = 30, Έτος = 360'), ('builder_version', '2'),
+        ('day', '2026-10-18'),
+    ):
+        assert report_cache_key(**{**BASE, name: value}) != key, name
+
+
+def test_lru_evicts_least_recent_within_byte_limit():
+    one = ('a' * 1000, 'b' * 1000)
+    cache = ReportCache(max_bytes=5000)
+    cache.put('k1', one)
+    cache.put('k2', one)
+    assert cache.get('k1') == one
+    cache.put('k3', one)
+    assert cache.get('k2') is None
+    assert cache.get('k1') == one and cache.get('k3') == one
+    assert not cache.put('big', ('x' * 10000, ''))
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['entries'] == 2 and stats['bytes'] <= 5000
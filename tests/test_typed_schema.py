@@ -0,0 +1,46 @@
+"""typed στήλες ingest: ίδιο αποτέλεσμα με clean_numeric_value ανά κελί."""
+
+import random
+
+import pandas as pd
+
+from typed_schema import (
+    SIGN_COLUMN,
+    add_typed_columns,
+    clean_numeric_value,
+    drop_typed_columns,
+    get_negative_amount_sign,
+    typed_numeric,
+)
+
+AMOUNTS = ('Μικτές αποδοχές', 'Συνολικές εισφορές')
+
+
+def test_drx_zeroes_only_its_own_cell():
+    df = pd.DataFrame({
+        'Μικτές αποδοχές': ['1.234,50 €', '100.000 ΔΡΧ'],
+        'Συνολικές εισφορές': ['300 ΔΡΧ', '20,00 €'],
+    })
+    typed = add_typed_columns(df)
+    assert typed_numeric(typed, 'Μικτές αποδοχές', exclude_drx=True).tolist() == [1234.5, 0.0]
+    assert typed_numeric(typed, 'Συνολικές εισφορές', exclude_drx=True).tolist() == [0.0, 20.0]
+    assert typed_numeric(typed, 'Μικτές αποδοχές').tolist() == [1234.5, 100000.0]
+    assert list(drop_typed_columns(typed).columns) == list(df.columns)
+
+
+def test_typed_amounts_match_clean_numeric_value():
+    rng = random.Random(9)
+    pool = ['1.000 ΔΡΧ', '-500 ΔΡΧ', 'ΔΡΧ', '12,50', '-3,00 €', '(4,00)', '7-', '', '-', None]
+    for _ in range(200):
+        n = rng.randint(1, 20)
+        df = pd.DataFrame({c: [rng.choice(pool) for _ in range(n)] for c in AMOUNTS})
+        typed = add_typed_columns(df)
+        for col in AMOUNTS:
+            for exclude_drx in (False, True):
+                expected = [clean_numeric_value(x, exclude_drx=exclude_drx) for x in df[col]]
+                assert typed_numeric(typed, col, exclude_drx=exclude_drx).tolist() == expected
+        expected_sign = [
+            get_negative_amount_sign(clean_numeric_value(g, True), clean_numeric_value(c, True))
+            for g, c in zip(df[AMOUNTS[0]], df[AMOUNTS[1]])
+        ]
+        assert typed[SIGN_COLUMN].tolist() == expected_sign
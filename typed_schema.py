@@ -0,0 +1,381 @@
+"""
+typed_schema.py
+~~~~~~~~~~~~~~~
+Τυποποιημένες (typed) στήλες ΑΤΛΑΣ που παράγονται μία φορά στο ingest, αμέσως μετά την
+εξαγωγή: ημερομηνίες Από/Έως (datetime64), ημέρες/μήνες/έτη και ποσά (float), σημαία ΔΡΧ
+και πρόσημο εγγραφής (διαγραφή χρόνου). Οι αρχικές στήλες κειμένου μένουν ως έχουν για εμφάνιση.
+Χωρίς Streamlit (κοινό για app_final.py / app_lite.py και τα HTML/JSON builders).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%d/%m/%Y'
+
+# Πρόθεμα των typed στηλών: «__Από» δίπλα στο «Από» κ.ο.κ. (βοηθητικές, ποτέ σε προβολή/εξαγωγή)
+TYPED_PREFIX = '__'
+DATE_COLUMNS = ('Από', 'Έως')
+COUNT_COLUMNS = ('Ημέρες', 'Μήνες', 'Έτη')
+AMOUNT_COLUMNS = ('Μικτές αποδοχές', 'Συνολικές εισφορές')
+# Σημαία ΔΡΧ ανά στήλη ποσού: «__ΔΡΧ_Μικτές αποδοχές» κ.ο.κ. (το exclude_drx μηδενίζει μόνο το κελί)
+DRX_FLAG_PREFIX = TYPED_PREFIX + 'ΔΡΧ_'
+SIGN_COLUMN = TYPED_PREFIX + 'Πρόσημο'
+TYPED_COLUMNS = frozenset(
+    [TYPED_PREFIX + c for c in DATE_COLUMNS + COUNT_COLUMNS + AMOUNT_COLUMNS]
+    + [DRX_FLAG_PREFIX + c for c in AMOUNT_COLUMNS]
+    + [SIGN_COLUMN]
+)
+
+# Ημερομηνία → ημέρες από 1970-01-01 / δείκτης μήνα (έτος*12 + μήνας-1)· NaT → NAT_ORDINAL
+NAT_ORDINAL = np.iinfo(np.int64).min
+_EPOCH_MONTH_INDEX = 1970 * 12
+
+# Κοινό (ανά διεργασία) memo κείμενο → ημερομηνία του parse_dates, με όριο εγγραφών
+_DATE_DTYPE = pd.to_datetime(pd.Series(['01/01/2000'], dtype=object), format=DATE_FORMAT).dtype
+_DATE_MEMO: dict = {}
+_DATE_MEMO_MAX = 65536
+_DATE_MEMO_LOCK = threading.Lock()
+
+# Προμεταγλωττισμένα regex του clean_numeric_value / clean_numeric_series
+_LETTERS_RE = re.compile(r'[a-zA-Zα-ωΑ-Ω]')
+_DOT_THOUSANDS_RE = re.compile(r'\d{1,3}(?:\.\d{3})+')
+
+
+def clean_numeric_value(value, exclude_drx=False):
+    """Καθαρισμός και μετατροπή αριθμητικών τιμών σε float
+    
+    Args:
+        value: Η τιμή προς καθαρισμό
+        exclude_drx: Αν True, επιστρέφει 0.0 για ποσά σε ΔΡΧ
+    """
+    try:
+        if pd.isna(value) or value == '' or value == '-':
+            return 0.0
+        
+        # Μετατροπή σε string και καθαρισμός
+        clean_value = str(value).strip()
+        is_negative = False
+
+        # Υποστήριξη unicode minus και αρνητικού σε παρένθεση/τέλος
+        clean_value = clean_value.replace('\u2212', '-')
+        if clean_value.startswith('(') and clean_value.endswith(')'):
+            is_negative = True
+            clean_value = clean_value[1:-1].strip()
+        if clean_value.endswith('-'):
+            is_negative = True
+            clean_value = clean_value[:-1].strip()
+        if clean_value.startswith('-'):
+            is_negative = True
+            clean_value = clean_value[1:].strip()
+        
+        # Έλεγχος για ΔΡΧ αν exclude_drx=True
+        if exclude_drx and 'ΔΡΧ' in clean_value:
+            return 0.0
+        
+        # Αφαίρεση κειμένου όπως "ΔΡΧ", "€", κλπ
+        clean_value = clean_value.replace('ΔΡΧ', '').replace('€', '').replace('%', '').replace(' ', '')
+        
+        # Αφαίρεση όλων των γραμμάτων
+        clean_value = _LETTERS_RE.sub('', clean_value)
+        
+        # Αφαίρεση κενών
+        clean_value = clean_value.strip()
+        
+        if not clean_value or clean_value == '-':
+            return 0.0
+        
+        # Έλεγχος για ελληνικό format (κόμμα ως διαχωριστικός χιλιάδων, τελεία ως δεκαδικός)
+        # π.χ. "1,234.56" ή "1234.56" ή "1,234"
+        if ',' in clean_value and '.' in clean_value:
+            if clean_value.rfind(',') > clean_value.rfind('.'):
+                # Ελληνικό: 1.234,56 (τελεία χιλιάδες, κόμμα δεκαδικά)
+                clean_value = clean_value.replace('.', '').replace(',', '.')
+            else:
+                # US: 1,234.56
+                clean_value = clean_value.replace(',', '')
+            result = float(clean_value)
+            return -result if is_negative else result
+        elif ',' in clean_value:
+            parts = clean_value.split(',')
+            if len(parts) == 2:
+                if len(parts[1]) == 3 and parts[1].isdigit():
+                    clean_value = clean_value.replace(',', '')
+                elif len(parts[1]) <= 2:
+                    clean_value = clean_value.replace(',', '.')
+                else:
+                    clean_value = clean_value.replace(',', '')
+            else:
+                clean_value = clean_value.replace(',', '')
+        elif _DOT_THOUSANDS_RE.fullmatch(clean_value):
+            clean_value = clean_value.replace('.', '')
+        
+        # Μετατροπή σε float
+        result = float(clean_value)
+        return -result if is_negative else result
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _float_or_zero(text: str) -> float:
+    try:
+        return float(text)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _clean_numeric_strings(texts: list, exclude_drx: bool) -> np.ndarray:
+    """Τα βήματα του clean_numeric_value σε όλες τις τιμές μαζί (str accessors, ίδια σειρά)."""
+    v = pd.Series(texts, dtype=object).str.strip().str.replace('\u2212', '-', regex=False)
+    paren = v.str.startswith('(') & v.str.endswith(')')
+    v = v.where(~paren, v.str.slice(1, -1).str.strip())
+    trailing = v.str.endswith('-')
+    v = v.where(~trailing, v.str.slice(0, -1).str.strip())
+    leading = v.str.startswith('-')
+    v = v.where(~leading, v.str.slice(1).str.strip())
+    negative = (paren | trailing | leading).to_numpy(dtype=bool)
+    zero = v.str.contains('ΔΡΧ', regex=False).to_numpy(dtype=bool, copy=True) if exclude_drx else np.zeros(len(v), dtype=bool)
+
+    for token in ('ΔΡΧ', '€', '%', ' '):
+        v = v.str.replace(token, '', regex=False)
+    v = v.str.replace(_LETTERS_RE, '', regex=True).str.strip()
+    zero = zero | ((v == '') | (v == '-')).to_numpy(dtype=bool)
+
+    # Διαχωριστικά: ελληνικό 1.234,56 / US 1,234.56 / μόνο κόμμα / μόνο τελείες χιλιάδων
+    has_comma = v.str.contains(',', regex=False)
+    has_dot = v.str.contains('.', regex=False)
+    both = has_comma & has_dot
+    greek = both & (v.str.rfind(',') > v.str.rfind('.'))
+    comma_only = has_comma & ~has_dot
+    after_comma = v.str.rsplit(',', n=1).str[-1]
+    one_comma = comma_only & (v.str.count(',') == 1)
+    comma_thousands = one_comma & (after_comma.str.len() == 3) & after_comma.str.isdigit()
+    comma_decimal = one_comma & ~comma_thousands & (after_comma.str.len() <= 2)
+    dot_thousands = ~has_comma & v.str.fullmatch(_DOT_THOUSANDS_RE)
+
+    v = v.where(~greek, v.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    v = v.where(~comma_decimal, v.str.replace(',', '.', regex=False))
+    v = v.where(~((both & ~greek) | (comma_only & ~comma_decimal)), v.str.replace(',', '', regex=False))
+    v = v.where(~dot_thousands, v.str.replace('.', '', regex=False))
+
+    out = np.zeros(len(v), dtype=float)
+    for i, (text, skip, neg) in enumerate(zip(v.tolist(), zero, negative)):
+        if skip:
+            continue
+        try:
+            value = float(text)
+        except (ValueError, TypeError):
+            continue
+        out[i] = -value if neg else value
+    return out
+
+
+# Τύποι στηλών όπου το factorize δεν ενώνει τιμές με διαφορετικό str() (π.χ. 1 / 1.0 / True)
+_FACTORIZE_SAFE_INFERRED = {'string', 'empty', 'floating', 'integer', 'boolean'}
+
+
+def clean_numeric_series(values, exclude_drx: bool = False) -> pd.Series:
+    """clean_numeric_value για ολόκληρη στήλη, με ίδιο αποτέλεσμα ανά κελί.
+
+    Οι μοναδικές τιμές καθαρίζονται μία φορά (str accessors, προμεταγλωττισμένα regex) και
+    επιστρέφονται στις γραμμές μέσω κωδικών· κενά/NaN → 0.0. Στήλες με ανάμικτους τύπους
+    περνούν κελί-κελί από το clean_numeric_value.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    if s.empty:
+        return pd.Series([], index=s.index, name=s.name, dtype=float)
+    if s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) not in _FACTORIZE_SAFE_INFERRED:
+        return pd.Series(
+            [clean_numeric_value(x, exclude_drx=exclude_drx) for x in s],
+            index=s.index, name=s.name, dtype=float,
+        )
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    uniques = list(uniques)
+    texts = []
+    blank = np.zeros(len(uniques), dtype=bool)
+    for i, u in enumerate(uniques):
+        if isinstance(u, str) and (u == '' or u == '-'):
+            blank[i] = True
+            texts.append('')
+        else:
+            texts.append(str(u))
+    cleaned = _clean_numeric_strings(texts, exclude_drx) if texts else np.zeros(0, dtype=float)
+    cleaned[blank] = 0.0
+    result = np.where(codes >= 0, cleaned[np.maximum(codes, 0)] if len(cleaned) else 0.0, 0.0)
+    return pd.Series(result, index=s.index, name=s.name, dtype=float)
+
+
+def parse_dates(values) -> pd.Series:
+    """pd.to_datetime(values, format=dd/mm/yyyy, errors='coerce') με parse μόνο των μοναδικών κειμένων.
+
+    Κάθε διαφορετικό κείμενο μετατρέπεται μία φορά ανά διεργασία (κοινό memo για όλες τις
+    αναλύσεις) και επιστρέφεται στις γραμμές μέσω κωδικών. Στήλες που δεν είναι κείμενο
+    περνούν απευθείας από το pd.to_datetime.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    if s.empty or pd.api.types.infer_dtype(s, skipna=True) != 'string':
+        return pd.to_datetime(s, format=DATE_FORMAT, errors='coerce')
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    uniques = uniques.tolist()
+    known = {}
+    missing = []
+    for u in uniques:
+        hit = _DATE_MEMO.get(u)
+        if hit is None:
+            missing.append(u)
+        else:
+            known[u] = hit
+    if missing:
+        parsed = pd.to_datetime(pd.Series(missing, dtype=object), format=DATE_FORMAT, errors='coerce')
+        fresh = dict(zip(missing, parsed.to_numpy(dtype=_DATE_DTYPE)))
+        known.update(fresh)
+        with _DATE_MEMO_LOCK:
+            if len(_DATE_MEMO) + len(fresh) > _DATE_MEMO_MAX:
+                _DATE_MEMO.clear()
+            _DATE_MEMO.update(fresh)
+    table = np.array([known[u] for u in uniques], dtype=_DATE_DTYPE)
+    out = table.take(np.maximum(codes, 0))
+    out[codes < 0] = np.datetime64('NaT')
+    return pd.Series(out, index=s.index, name=s.name)
+
+
+def date_ordinals(dates) -> np.ndarray:
+    """int64 ημέρες από 1970-01-01 ανά γραμμή (NaT → NAT_ORDINAL)."""
+    return pd.DatetimeIndex(dates).to_numpy().astype('datetime64[D]').view(np.int64)
+
+
+def month_indices(dates) -> np.ndarray:
+    """int64 δείκτης μήνα έτος*12 + (μήνας-1) ανά γραμμή (NaT → NAT_ORDINAL)."""
+    months = pd.DatetimeIndex(dates).to_numpy().astype('datetime64[M]').view(np.int64)
+    return np.where(months == NAT_ORDINAL, NAT_ORDINAL, months + _EPOCH_MONTH_INDEX)
+
+
+def get_negative_amount_sign(gross_val, contrib_val) -> int:
+    """Επιστρέφει -1 όταν υπάρχουν αρνητικά ποσά (διαγραφή εγγραφής)."""
+    try:
+        if (gross_val is not None and gross_val < 0) or (contrib_val is not None and contrib_val < 0):
+            return -1
+    except Exception:
+        pass
+    return 1
+
+
+def typed_column_name(col: str) -> str:
+    return TYPED_PREFIX + col
+
+
+def drx_flag_column(col: str) -> str:
+    return DRX_FLAG_PREFIX + col
+
+
+def is_typed_column(col) -> bool:
+    """True για τις βοηθητικές typed στήλες (εκτός προβολής/εξαγωγής)."""
+    return isinstance(col, str) and col in TYPED_COLUMNS
+
+
+def drop_typed_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Το DataFrame χωρίς τις typed στήλες (ίδιο αντικείμενο αν δεν υπάρχουν)."""
+    if not isinstance(df, pd.DataFrame):
+        return df
+    typed = [c for c in df.columns if is_typed_column(c)]
+    return df.drop(columns=typed) if typed else df
+
+
+def content_fingerprint(df: pd.DataFrame) -> str:
+    """Αποτύπωμα περιεχομένου (ονόματα και τιμές των αρχικών στηλών, με τη σειρά γραμμών, χωρίς index).
+
+    Ίδιο για αντίγραφα των ίδιων δεδομένων, διαφορετικό μόλις αλλάξει μία τιμή· οι typed στήλες
+    παράγονται από τις αρχικές και δεν μετρούν. Κλειδί για τις cache αποτελεσμάτων ανά φάκελο.
+    """
+    if not isinstance(df, pd.DataFrame):
+        return ''
+    base = drop_typed_columns(df)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update('\x1f'.join(map(str, base.columns)).encode('utf-8'))
+    try:
+        row_hashes = pd.util.hash_pandas_object(base, index=False)
+    except TypeError:
+        # Μη hashable τιμές (π.χ. λίστες) σε στήλη object: ως κείμενο
+        row_hashes = pd.util.hash_pandas_object(base.astype(str), index=False)
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def add_typed_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Ingest: προσθέτει τις typed στήλες δίπλα στις αρχικές (μία φορά ανά εξαγωγή).
+
+    - `__Από` / `__Έως`: datetime64 (dd/mm/yyyy, NaT όταν δεν είναι ημερομηνία)
+    - `__Ημέρες` / `__Μήνες` / `__Έτη`: float (clean_numeric_value)
+    - `__Μικτές αποδοχές` / `__Συνολικές εισφορές`: float ποσό (και τα ΔΡΧ, χωρίς αποκλεισμό)
+    - `__ΔΡΧ_Μικτές αποδοχές` / `__ΔΡΧ_Συνολικές εισφορές`: True όταν το κελί του ποσού είναι σε δραχμές
+    - `__Πρόσημο`: -1 για εγγραφές με αρνητικά ποσά (get_negative_amount_sign), αλλιώς 1
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+    out = drop_typed_columns(df).copy()
+    for col in DATE_COLUMNS:
+        if col in out.columns:
+            out[typed_column_name(col)] = parse_dates(out[col])
+    for col in COUNT_COLUMNS:
+        if col in out.columns:
+            out[typed_column_name(col)] = clean_numeric_series(out[col])
+
+    negative = None
+    for col in AMOUNT_COLUMNS:
+        if col not in out.columns:
+            continue
+        values = clean_numeric_series(out[col])
+        drx = out[col].astype(str).str.contains('ΔΡΧ', regex=False, na=False)
+        out[typed_column_name(col)] = values
+        out[drx_flag_column(col)] = drx
+        below = (values < 0) & ~drx
+        negative = below if negative is None else negative | below
+    if negative is not None:
+        out[SIGN_COLUMN] = 1 - 2 * negative.astype(int)
+    return out
+
+
+def _has_fresh_typed(df: pd.DataFrame, col: str) -> bool:
+    """Η typed στήλη ισχύει μόνο όσο η αρχική είναι ακόμα κείμενο (όχι ήδη μετατραπείσα)."""
+    return (
+        typed_column_name(col) in df.columns
+        and col in df.columns
+        and not pd.api.types.is_numeric_dtype(df[col])
+        and not pd.api.types.is_datetime64_any_dtype(df[col])
+    )
+
+
+def typed_dates(df: pd.DataFrame, col: str) -> pd.Series:
+    """datetime64 της στήλης ημερομηνίας — από τη typed στήλη αν υπάρχει, αλλιώς parse dd/mm/yyyy."""
+    if _has_fresh_typed(df, col):
+        return df[typed_column_name(col)].rename(col)
+    return parse_dates(df[col])
+
+
+def interval_dates(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """(Από, Έως) ως datetime64 για τους βρόχους ανά διάστημα· στήλη που λείπει → όλα NaT."""
+    out = []
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            out.append(typed_dates(df, col))
+        else:
+            out.append(pd.Series(pd.NaT, index=df.index, name=col, dtype=_DATE_DTYPE))
+    return out[0], out[1]
+
+
+def typed_numeric(df: pd.DataFrame, col: str, exclude_drx: bool = False) -> pd.Series:
+    """float της αριθμητικής στήλης (ίδιο αποτέλεσμα με clean_numeric_value ανά κελί)."""
+    if _has_fresh_typed(df, col):
+        values = df[typed_column_name(col)].rename(col)
+        if not exclude_drx:
+            return values
+        flag = drx_flag_column(col)
+        if flag in df.columns:
+            # Μόνο το κελί σε ΔΡΧ γίνεται 0 (όπως clean_numeric_value), όχι η υπόλοιπη γραμμή
+            return values.where(~df[flag].astype(bool), 0.0)
+    return clean_numeric_series(df[col], exclude_drx=exclude_drx)